@@ -0,0 +1,64 @@
+"""Benchmarks the complex ufunc loops against numpy and cmath. For each
+function, the time per element of the complex128 and complex64 loops is
+reported next to that of numpy and of a cmath loop, together with the
+largest relative error of both loops measured against cmath."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import cmath
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+
+from raining.core import ufunc
+
+names = ['exp', 'log', 'sin', 'cos', 'sinh', 'cosh']
+
+
+def _bestTime(func: Callable, z: np.ndarray, repeats: int = 5) -> float:
+  """Returns the best of 'repeats' timings of func(z) per element."""
+  func(z[:16])
+  best = float('inf')
+  for _ in range(repeats):
+    tic = time.perf_counter()
+    func(z)
+    best = min(best, time.perf_counter() - tic)
+  return best / z.size
+
+
+def _relativeError(func: Callable, ref: Callable, z: np.ndarray) -> float:
+  """Returns the largest relative error of func at z."""
+  out = func(z).astype(np.complex128)
+  exact = np.array([ref(complex(v)) for v in z])
+  return float(np.max(np.abs(out - exact) / np.abs(exact)))
+
+
+def main() -> int:
+  """Prints the timings in nanoseconds per element and the errors."""
+  size = 1 << 20
+  rng = np.random.default_rng(0)
+  z128 = rng.uniform(-10, 10, size) + 1j * rng.uniform(-10, 10, size)
+  z64 = z128.astype(np.complex64)
+  header = '%-6s %9s %9s %9s %9s %11s %11s'
+  print(header % ('name', 'c128', 'c64', 'numpy', 'cmath', 'err c128',
+                  'err c64'))
+  for name in names:
+    func, ref = getattr(ufunc, name), getattr(cmath, name)
+    t128, t64 = _bestTime(func, z128), _bestTime(func, z64)
+    tNumpy = _bestTime(getattr(np, name), z128)
+    loop = np.vectorize(ref, otypes=[complex])
+    tCmath = _bestTime(loop, z128[:size >> 4], 1)
+    check = z64[::size >> 12]
+    err128 = _relativeError(func, ref, check.astype(np.complex128))
+    err64 = _relativeError(func, ref, check)
+    row = '%-6s %9.1f %9.1f %9.1f %9.1f %11.2e %11.2e'
+    print(row % (name, t128 * 1e9, t64 * 1e9, tNumpy * 1e9, tCmath * 1e9,
+                 err128, err64))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,84 @@
+"""Benchmarks the float32 kernels against the float64 kernels. For each
+function, the speedup of the float32 ufunc loop over the float64 loop is
+reported together with the ULP error of the float32 results measured
+against the correctly rounded float32 value of the 'math' function."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+import sys
+import time
+from statistics import NormalDist
+from typing import Callable
+
+import numpy as np
+
+from raining.core import ufunc
+
+
+def _erfinv(x: float) -> float:
+  """Reference inverse error function"""
+  return NormalDist().inv_cdf((x + 1) / 2) / 2 ** 0.5
+
+
+cases = [
+  ('exp', math.exp, -80, 80),
+  ('log', math.log, 1e-30, 1e30),
+  ('sin', math.sin, -100, 100),
+  ('cos', math.cos, -100, 100),
+  ('tan', math.tan, -1.5, 1.5),
+  ('sinh', math.sinh, -10, 10),
+  ('cosh', math.cosh, -10, 10),
+  ('tanh', math.tanh, -10, 10),
+  ('arcsinh', math.asinh, -100, 100),
+  ('arccosh', math.acosh, 1, 100),
+  ('arctanh', math.atanh, -0.999, 0.999),
+  ('erf', math.erf, -5, 5),
+  ('erfinv', _erfinv, -0.9999, 0.9999),
+]
+
+
+def _bestTime(func: Callable, x: np.ndarray, repeats: int = 5) -> float:
+  """Returns the best of 'repeats' timings of func(x)."""
+  func(x[:16])
+  best = float('inf')
+  for _ in range(repeats):
+    tic = time.perf_counter()
+    func(x)
+    best = min(best, time.perf_counter() - tic)
+  return best
+
+
+def _ulpError(func: Callable, ref: Callable, x: np.ndarray) -> tuple:
+  """Returns the maximum and mean ULP error of func at x."""
+  out = func(x).astype(np.float64)
+  exact = np.array([ref(float(v)) for v in x])
+  finite = np.isfinite(exact) & np.isfinite(out)
+  spacing = np.spacing(np.abs(exact[finite]).astype(np.float32))
+  ulps = np.abs(out[finite] - exact[finite]) / spacing.astype(np.float64)
+  return float(ulps.max()), float(ulps.mean())
+
+
+def main() -> int:
+  """Prints the speedup and the float32 ULP error of each function."""
+  size = 1 << 22
+  header = '%-8s %10s %10s %9s %10s %10s'
+  print(header % ('name', 'f64 [ms]', 'f32 [ms]', 'speedup', 'max ulp',
+                  'mean ulp'))
+  for (name, ref, a, b) in cases:
+    func = getattr(ufunc, name)
+    if a > 0:
+      x64 = np.geomspace(a, b, size)
+    else:
+      x64 = np.linspace(a, b, size)
+    x32 = x64.astype(np.float32)
+    t64, t32 = _bestTime(func, x64), _bestTime(func, x32)
+    maxUlp, meanUlp = _ulpError(func, ref, x32[::size >> 16])
+    row = '%-8s %10.2f %10.2f %9.2f %10.2f %10.3f'
+    print(row % (name, t64 * 1e3, t32 * 1e3, t64 / t32, maxUlp, meanUlp))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -3,3 +3,13 @@ functionalities enhanced with Numba JIT compilation."""
 #  AGPL-3.0 license
 #  Copyright (c) 2024 Asger Jon Vistisen
 from __future__ import annotations
+
+from ._jit_real_number import JitRealNumber, toJit, fromJit
+from ._interval import Interval, IntervalArray
+from ._aggregate import fsum, mean, weightedMean, dot, prod
+from ._power import power
+from ._cache import EvaluationCache, memoize
+
+__all__ = ['JitRealNumber', 'toJit', 'fromJit', 'Interval', 'IntervalArray',
+           'fsum', 'mean', 'weightedMean', 'dot', 'prod', 'power',
+           'EvaluationCache', 'memoize', ]
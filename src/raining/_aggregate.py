@@ -0,0 +1,219 @@
+"""The aggregate functions reduce sequences of RealNumbers to the expected
+value and standard deviation of a single result in one compiled pass with
+compensated arithmetic."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from numba import njit
+from worktoy.text import monoSpace
+
+#  Veltkamp splitting constant 2 ** 27 + 1 for float64
+splitter = 134217729.
+
+
+@njit
+def _twoSum(a: float, b: float) -> tuple[float, float]:
+  """Returns the rounded sum and its exact rounding error."""
+  s = a + b
+  if abs(a) >= abs(b):
+    return s, (a - s) + b
+  return s, (b - s) + a
+
+
+@njit
+def _split(a: float) -> tuple[float, float]:
+  """Splits a into two halves of 26 bits each."""
+  c = splitter * a
+  high = c - (c - a)
+  return high, a - high
+
+
+@njit
+def _twoProduct(a: float, b: float) -> tuple[float, float]:
+  """Returns the rounded product and its exact rounding error by the
+  algorithm of Dekker."""
+  p = a * b
+  ah, al = _split(a)
+  bh, bl = _split(b)
+  return p, al * bl - (((p - ah * bh) - al * bh) - ah * bl)
+
+
+@njit
+def _fsumKernel(expVal: np.ndarray,
+                stdDev: np.ndarray) -> tuple[float, float]:
+  """Returns the sum of independent values. Both the values and the
+  variances are summed with the compensation of Neumaier, whose error
+  does not grow with the number of values."""
+  total, compensation = 0., 0.
+  variance, varianceCompensation = 0., 0.
+  for i in range(expVal.size):
+    total, error = _twoSum(total, expVal[i])
+    compensation += error
+    variance, error = _twoSum(variance, stdDev[i] * stdDev[i])
+    varianceCompensation += error
+  return total + compensation, (variance + varianceCompensation) ** 0.5
+
+
+@njit
+def _weightedMeanKernel(expVal: np.ndarray,
+                        stdDev: np.ndarray) -> tuple[float, float]:
+  """Returns the inverse variance weighted mean of independent values."""
+  total, compensation = 0., 0.
+  weights, weightCompensation = 0., 0.
+  for i in range(expVal.size):
+    weight = 1 / (stdDev[i] * stdDev[i])
+    total, error = _twoSum(total, weight * expVal[i])
+    compensation += error
+    weights, error = _twoSum(weights, weight)
+    weightCompensation += error
+  weights += weightCompensation
+  return (total + compensation) / weights, weights ** -0.5
+
+
+@njit
+def _dotKernel(a: np.ndarray, sa: np.ndarray,
+               b: np.ndarray, sb: np.ndarray) -> tuple[float, float]:
+  """Returns the dot product of independent values. The products are
+  summed with their exact rounding errors, as in the Dot2 algorithm of
+  Ogita, Rump and Oishi, and the variances propagate to first order."""
+  total, compensation = 0., 0.
+  variance, varianceCompensation = 0., 0.
+  for i in range(a.size):
+    p, productError = _twoProduct(a[i], b[i])
+    total, error = _twoSum(total, p)
+    compensation += error + productError
+    term = (sa[i] * b[i]) ** 2 + (sb[i] * a[i]) ** 2
+    variance, error = _twoSum(variance, term)
+    varianceCompensation += error
+  return total + compensation, (variance + varianceCompensation) ** 0.5
+
+
+@njit
+def _prodKernel(expVal: np.ndarray,
+                stdDev: np.ndarray) -> tuple[float, float]:
+  """Returns the product of independent values. The product carries its
+  accumulated rounding error as in the compensated product of Graillat.
+  To first order, the variance is the squared product times the sum of
+  the squared relative errors. A single zero factor contributes its
+  standard deviation times the product of the other factors, while two
+  or more zeros leave no first order variance."""
+  product, error = 1., 0.
+  relative, relativeCompensation = 0., 0.
+  zeros, zeroStdDev = 0, 0.
+  for i in range(expVal.size):
+    if expVal[i] == 0:
+      zeros += 1
+      zeroStdDev = stdDev[i]
+      continue
+    product, roundoff = _twoProduct(product, expVal[i])
+    error = error * expVal[i] + roundoff
+    relative, roundoff = _twoSum(relative, (stdDev[i] / expVal[i]) ** 2)
+    relativeCompensation += roundoff
+  product += error
+  if zeros == 1:
+    return 0., abs(product) * zeroStdDev
+  if zeros:
+    return 0., 0.
+  return product, abs(product) * (relative + relativeCompensation) ** 0.5
+
+
+def _pair(value: Any) -> tuple[float, float]:
+  """Returns the expected value and standard deviation of a RealNumber,
+  an (expVal, stdDev) pair or an exact number."""
+  if hasattr(value, 'expVal'):
+    return value.expVal, value.stdDev
+  if np.ndim(value) == 0:
+    return value, 0.
+  if np.shape(value) == (2,):
+    return value[0], value[1]
+  e = """Expected a RealNumber, a number or an (expVal, stdDev) pair, but
+  received '%s'!""" % (value,)
+  raise ValueError(monoSpace(e))
+
+
+def _columns(values: Any, stdDev: Any = None) -> tuple:
+  """Returns contiguous float64 arrays of the expected values and the
+  standard deviations. With 'stdDev' given, 'values' holds the expected
+  values. Otherwise, 'values' is a 1-D array of exact numbers, an array
+  of shape (n, 2) of (expVal, stdDev) pairs or an iterable of
+  RealNumbers, pairs and exact numbers."""
+  if stdDev is not None:
+    expVal = np.ascontiguousarray(values, dtype=float).ravel()
+    stdDev = np.broadcast_to(np.asarray(stdDev, dtype=float), expVal.shape)
+    return expVal, np.ascontiguousarray(stdDev)
+  if isinstance(values, np.ndarray):
+    if values.ndim < 2:
+      expVal = np.ascontiguousarray(values, dtype=float).ravel()
+      return expVal, np.zeros_like(expVal)
+    if values.ndim > 2 or values.shape[1] != 2:
+      e = """Expected a 1-D array of exact numbers or an array of shape
+      (n, 2) of (expVal, stdDev) pairs, but received shape %s!"""
+      raise ValueError(monoSpace(e) % (values.shape,))
+    return (np.ascontiguousarray(values[:, 0], dtype=float),
+            np.ascontiguousarray(values[:, 1], dtype=float))
+  pairs = np.array([_pair(value) for value in values], dtype=float)
+  pairs = pairs.reshape(-1, 2)
+  return np.ascontiguousarray(pairs[:, 0]), np.ascontiguousarray(pairs[:, 1])
+
+
+def _pairOf(expVal: float, stdDev: float) -> tuple[float, float]:
+  """Returns the parts as a pair of Python floats."""
+  return float(expVal), float(stdDev)
+
+
+def fsum(values: Any, stdDev: Any = None) -> tuple[float, float]:
+  """fsum returns the expected value and standard deviation of the sum of
+  the values. The values are an iterable of RealNumbers or (expVal,
+  stdDev) pairs, an array of shape (n, 2) of such pairs or, with 'stdDev'
+  given, an array of expected values."""
+  return _pairOf(*_fsumKernel(*_columns(values, stdDev)))
+
+
+def mean(values: Any, stdDev: Any = None) -> tuple[float, float]:
+  """mean returns the expected value and standard deviation of the
+  arithmetic mean of the values."""
+  expVal, stdDev = _columns(values, stdDev)
+  if not expVal.size:
+    e = """Cannot take the mean of no values!"""
+    raise ValueError(e)
+  total, totalStdDev = _fsumKernel(expVal, stdDev)
+  return _pairOf(total / expVal.size, totalStdDev / expVal.size)
+
+
+def weightedMean(values: Any, stdDev: Any = None) -> tuple[float, float]:
+  """weightedMean returns the expected value and standard deviation of the
+  mean of the values weighted by their inverse variances, which is the best estimate of a quantity measured
+  several times. Its standard deviation is the inverse square root of
+  the total weight."""
+  expVal, stdDev = _columns(values, stdDev)
+  if not expVal.size or not np.all(stdDev > 0):
+    e = """The weighted mean requires at least one value and positive
+    standard deviations!"""
+    raise ValueError(monoSpace(e))
+  return _pairOf(*_weightedMeanKernel(expVal, stdDev))
+
+
+def dot(left: Any,
+        right: Any,
+        leftStdDev: Any = None,
+        rightStdDev: Any = None) -> tuple[float, float]:
+  """dot returns the expected value and standard deviation of the sum of
+  the products of the values in 'left' and 'right'. Each takes the forms accepted by 'fsum', with
+  'leftStdDev' and 'rightStdDev' as the standard deviations of arrays of
+  expected values."""
+  a, sa = _columns(left, leftStdDev)
+  b, sb = _columns(right, rightStdDev)
+  if a.size != b.size:
+    e = """Received %d and %d values!""" % (a.size, b.size)
+    raise ValueError(e)
+  return _pairOf(*_dotKernel(a, sa, b, sb))
+
+
+def prod(values: Any, stdDev: Any = None) -> tuple[float, float]:
+  """prod returns the expected value and standard deviation of the product
+  of the values."""
+  return _pairOf(*_prodKernel(*_columns(values, stdDev)))
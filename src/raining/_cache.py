@@ -0,0 +1,168 @@
+"""EvaluationCache memoizes the values of expensive functions, such as the
+'raining.core' special functions and the 'raining.stat' CDFs, on
+arguments that repeat between calls, for example grid points and
+quantile levels."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import numpy as np
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+from worktoy.text import monoSpace
+
+from raining.core import ufunc
+
+
+def _resolve(function: Any) -> Callable:
+  """Returns the function, looking up names in 'raining.core.ufunc'."""
+  if isinstance(function, str):
+    if function not in ufunc.__all__:
+      e = """No ufunc named '%s' in 'raining.core.ufunc'!""" % function
+      raise ValueError(monoSpace(e))
+    return getattr(ufunc, function)
+  if not callable(function):
+    e = """Expected a callable or the name of a ufunc, but received
+    '%s'!""" % type(function).__name__
+    raise TypeError(monoSpace(e))
+  return function
+
+
+def _bits(values: Any) -> np.ndarray:
+  """Returns the bit patterns of the values as float64, with every nan
+  mapped to the same pattern. These are the keys of the cache, since nan
+  never equals itself as a float, while -0.0 equals 0.0."""
+  values = np.array(values, dtype=float)
+  values[np.isnan(values)] = np.nan
+  return values.view(np.int64)
+
+
+class EvaluationCache(FastObject):
+  """EvaluationCache holds the values of functions keyed on the function
+  and its arguments. Once 'maxSize' values are held, the least recently
+  used value is evicted. Arguments are keyed by their bit patterns, so
+  -0.0 and 0.0 are distinct and all nans are the same. Single values go
+  through 'get', while 'lookup' takes arrays, finds the distinct
+  arguments and computes only the missing ones in a single vectorized
+  call. The hits and misses count
+  distinct arguments per call, so repeated entries within one array do
+  not inflate the hit rate.
+
+  The cache is opt-in: the functions themselves are unchanged, and
+  'memoize' wraps a function in a cache."""
+
+  maxSize = AttriBox[int](65536)
+  entries = AttriBox[dict]()
+  hits = AttriBox[int](0)
+  misses = AttriBox[int](0)
+  evictions = AttriBox[int](0)
+
+  def __init__(self, maxSize: int = None) -> None:
+    FastObject.__init__(self)
+    if maxSize is not None:
+      if maxSize < 1:
+        e = """The cache must hold at least one value, but received
+        maxSize=%d!""" % maxSize
+        raise ValueError(monoSpace(e))
+      self.maxSize = int(maxSize)
+
+  def __len__(self) -> int:
+    """Returns the number of values held."""
+    return len(self.entries)
+
+  def hitRate(self) -> float:
+    """hitRate returns the fraction of lookups found in the cache."""
+    total = self.hits + self.misses
+    return self.hits / total if total else 0.
+
+  def clear(self) -> None:
+    """clear removes every value and resets the counters."""
+    self.entries.clear()
+    self.hits, self.misses, self.evictions = 0, 0, 0
+
+  def _find(self, key: tuple) -> Any:
+    """Returns the value at the key and marks it as most recently used,
+    or returns None if absent. Dictionaries keep their insertion order,
+    so reinserting the value moves it to the end of the eviction
+    order."""
+    value = self.entries.pop(key, None)
+    if value is not None:
+      self.entries[key] = value
+    return value
+
+  def _store(self, key: tuple, value: float) -> None:
+    """Stores the value, evicting the least recently used values."""
+    self.entries[key] = value
+    while len(self.entries) > self.maxSize:
+      del self.entries[next(iter(self.entries))]
+      self.evictions += 1
+
+  def get(self, function: Any, *args) -> float:
+    """get returns the function at the numbers given, computing it only if
+    the arguments are not in the cache."""
+    function = _resolve(function)
+    key = (function, *_bits(args).tolist())
+    value = self._find(key)
+    if value is not None:
+      self.hits += 1
+      return value
+    self.misses += 1
+    value = float(function(*args))
+    self._store(key, value)
+    return value
+
+  def lookup(self, function: Any, *args) -> np.ndarray:
+    """lookup returns the vectorized function at the arrays given, which
+    are broadcast against each other. Each distinct argument is looked up
+    once, and the missing ones are computed together in one call."""
+    function = _resolve(function)
+    columns = np.broadcast_arrays(*[np.asarray(arg, dtype=float)
+                                    for arg in args])
+    shape = columns[0].shape
+    rows = np.stack([_bits(column.ravel()) for column in columns], axis=1)
+    unique, inverse = np.unique(rows, axis=0, return_inverse=True)
+    keys = [(function, *row) for row in unique.tolist()]
+    unique = list(np.ascontiguousarray(unique).view(np.float64).T)
+    values = np.empty(len(keys))
+    missing = []
+    for (i, key) in enumerate(keys):
+      value = self._find(key)
+      if value is None:
+        missing.append(i)
+      else:
+        values[i] = value
+    self.hits += len(keys) - len(missing)
+    self.misses += len(missing)
+    if missing:
+      index = np.array(missing)
+      out = function(*[column[index] for column in unique])
+      out = np.broadcast_to(np.asarray(out, dtype=float), index.shape)
+      values[index] = out
+      for (i, value) in zip(missing, out.tolist()):
+        self._store(keys[i], value)
+    return values[inverse.ravel()].reshape(shape)
+
+
+def memoize(function: Any, cache: EvaluationCache = None) -> Callable:
+  """memoize returns a function evaluating 'function' through 'cache',
+  which defaults to a new EvaluationCache. Calls on numbers return a
+  float and calls on arrays go through the bulk lookup, so 'function'
+  must accept arrays, as the ufuncs of 'raining.core.ufunc' and the
+  'raining.stat' CDFs do. Functions may be given by the name of their
+  ufunc. The cache is available as the 'cache' attribute of the
+  returned function."""
+  function = _resolve(function)
+  cache = EvaluationCache() if cache is None else cache
+
+  def wrapped(*args) -> Any:
+    """Evaluates the function through the cache."""
+    if all(np.ndim(arg) == 0 for arg in args):
+      return cache.get(function, *args)
+    return cache.lookup(function, *args)
+
+  wrapped.cache = cache
+  wrapped.__name__ = getattr(function, '__name__', 'memoized')
+  wrapped.__doc__ = getattr(function, '__doc__', None)
+  return wrapped
@@ -0,0 +1,454 @@
+"""Interval and IntervalArray implement closed intervals of real numbers
+with outward rounding, such that every result encloses all values the
+operation can take on the operands. This gives guaranteed bounds where
+RealNumber gives a mean and a standard deviation."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+import sys
+from typing import Any, Callable, Self
+
+import numpy as np
+from numba import njit
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+from worktoy.text import monoSpace
+
+from raining.core import pi
+
+eps = sys.float_info.epsilon
+inf = float('inf')
+twoPi = 2 * pi
+halfPi = pi / 2
+#  The libm functions used for the endpoints are accurate to within one or
+#  two ulps, so endpoints are widened by this many ulps. The series
+#  kernels of 'raining.core' stop at looser tolerances and would need
+#  bounds derived from their truncation errors instead.
+ulps = 4
+
+
+@njit
+def _down(x: float, n: int) -> float:
+  """Returns x moved n floats towards negative infinity."""
+  for _ in range(n):
+    x = np.nextafter(x, -inf)
+  return x
+
+
+@njit
+def _up(x: float, n: int) -> float:
+  """Returns x moved n floats towards positive infinity."""
+  for _ in range(n):
+    x = np.nextafter(x, inf)
+  return x
+
+
+@njit
+def _product(a: float, b: float) -> float:
+  """Returns a * b taking 0 * inf to be 0, as the bounds are limits."""
+  if a == 0 or b == 0:
+    return 0.
+  return a * b
+
+
+@njit
+def _addBounds(alo: float, ahi: float,
+               blo: float, bhi: float) -> tuple[float, float]:
+  """Encloses the sum of two intervals"""
+  return _down(alo + blo, 1), _up(ahi + bhi, 1)
+
+
+@njit
+def _subBounds(alo: float, ahi: float,
+               blo: float, bhi: float) -> tuple[float, float]:
+  """Encloses the difference of two intervals"""
+  return _down(alo - bhi, 1), _up(ahi - blo, 1)
+
+
+@njit
+def _mulBounds(alo: float, ahi: float,
+               blo: float, bhi: float) -> tuple[float, float]:
+  """Encloses the product of two intervals"""
+  p1, p2 = _product(alo, blo), _product(alo, bhi)
+  p3, p4 = _product(ahi, blo), _product(ahi, bhi)
+  lo = min(min(p1, p2), min(p3, p4))
+  hi = max(max(p1, p2), max(p3, p4))
+  return _down(lo, 1), _up(hi, 1)
+
+
+@njit
+def _divBounds(alo: float, ahi: float,
+               blo: float, bhi: float) -> tuple[float, float]:
+  """Encloses the quotient of two intervals. A divisor containing zero
+  leaves the quotient unbounded."""
+  if blo <= 0 <= bhi:
+    return -inf, inf
+  q1, q2, q3, q4 = alo / blo, alo / bhi, ahi / blo, ahi / bhi
+  lo = min(min(q1, q2), min(q3, q4))
+  hi = max(max(q1, q2), max(q3, q4))
+  return _down(lo, 1), _up(hi, 1)
+
+
+@njit
+def _expBounds(lo: float, hi: float) -> tuple[float, float]:
+  """Encloses exp on the interval"""
+  return max(_down(math.exp(lo), ulps), 0.), _up(math.exp(hi), ulps)
+
+
+@njit
+def _logBounds(lo: float, hi: float) -> tuple[float, float]:
+  """Encloses log on the part of the interval where log is defined. An
+  interval entirely below zero has no enclosure and returns nan."""
+  if hi < 0:
+    return np.nan, np.nan
+  if hi == 0:
+    return -inf, -inf
+  outLo = -inf if lo <= 0 else _down(math.log(lo), ulps)
+  return outLo, _up(math.log(hi), ulps)
+
+
+@njit
+def _erfBounds(lo: float, hi: float) -> tuple[float, float]:
+  """Encloses erf on the interval"""
+  return max(_down(math.erf(lo), ulps), -1.), min(_up(math.erf(hi), ulps), 1.)
+
+
+@njit
+def _hitsPhase(lo: float, hi: float, phase: float) -> bool:
+  """Returns True if phase + 2 * pi * k lies in [lo, hi] for an integer
+  k. As pi is rounded, points within a few ulps of the interval count as
+  inside, which can only widen the enclosure."""
+  k = math.floor((lo - phase) / twoPi)
+  for j in range(k, k + 2):
+    point = phase + j * twoPi
+    slack = 8 * eps * (abs(point) + 1)
+    if lo - slack <= point <= hi + slack:
+      return True
+  return False
+
+
+@njit
+def _periodicBounds(lo: float, hi: float,
+                    a: float, b: float,
+                    maxPhase: float, minPhase: float) -> tuple[float, float]:
+  """Encloses sin or cos on [lo, hi] from their values a and b at the
+  ends. The enclosure reaches 1 or -1 when the interval contains a point
+  where the function attains it, and is [-1, 1] on a whole period."""
+  if not hi - lo < twoPi:
+    return -1., 1.
+  outLo = max(_down(min(a, b), ulps), -1.)
+  outHi = min(_up(max(a, b), ulps), 1.)
+  if _hitsPhase(lo, hi, maxPhase):
+    outHi = 1.
+  if _hitsPhase(lo, hi, minPhase):
+    outLo = -1.
+  return outLo, outHi
+
+
+@njit
+def _sinBounds(lo: float, hi: float) -> tuple[float, float]:
+  """Encloses sin on the interval"""
+  return _periodicBounds(lo, hi, math.sin(lo), math.sin(hi), halfPi, -halfPi)
+
+
+@njit
+def _cosBounds(lo: float, hi: float) -> tuple[float, float]:
+  """Encloses cos on the interval"""
+  return _periodicBounds(lo, hi, math.cos(lo), math.cos(hi), 0., pi)
+
+
+@njit
+def _mapBinary(kernel: Callable,
+               alo: np.ndarray, ahi: np.ndarray,
+               blo: np.ndarray, bhi: np.ndarray) -> tuple:
+  """Applies the binary bounds kernel to every pair of intervals."""
+  lo, hi = np.empty(alo.size), np.empty(alo.size)
+  for i in range(alo.size):
+    lo[i], hi[i] = kernel(alo[i], ahi[i], blo[i], bhi[i])
+  return lo, hi
+
+
+@njit
+def _mapUnary(kernel: Callable, lo: np.ndarray, hi: np.ndarray) -> tuple:
+  """Applies the unary bounds kernel to every interval."""
+  outLo, outHi = np.empty(lo.size), np.empty(lo.size)
+  for i in range(lo.size):
+    outLo[i], outHi[i] = kernel(lo[i], hi[i])
+  return outLo, outHi
+
+
+def _validate(lo: Any, hi: Any) -> None:
+  """Raises an error if any lower bound exceeds its upper bound."""
+  if np.any(np.asarray(lo) > np.asarray(hi)):
+    e = """The lower bound of an interval must not exceed the upper
+    bound!"""
+    raise ValueError(monoSpace(e))
+
+
+class Interval(FastObject):
+  """Interval implements the closed interval [lo, hi] with outward
+  rounding. The operators accept intervals and real numbers, and division
+  by an interval containing zero returns the whole real line."""
+
+  lo = AttriBox[float](0.)
+  hi = AttriBox[float](0.)
+
+  def __init__(self, lo: float, hi: float = None) -> None:
+    FastObject.__init__(self)
+    hi = lo if hi is None else hi
+    _validate(lo, hi)
+    self.lo, self.hi = float(lo), float(hi)
+
+  @staticmethod
+  def fromRealNumber(number: Any, sigmas: float = None) -> Interval:
+    """Returns the interval of 'sigmas' standard deviations around the
+    expected value of the RealNumber. This is a statement about
+    probability rather than a bound, chosen by the caller."""
+    sigmas = 3. if sigmas is None else sigmas
+    radius = float(sigmas * number.stdDev)
+    expVal = float(number.expVal)
+    lo, _ = _subBounds(expVal, expVal, radius, radius)
+    _, hi = _addBounds(expVal, expVal, radius, radius)
+    return Interval(lo, hi)
+
+  def _bounds(self, other: Any) -> tuple[float, float]:
+    """Returns the bounds of the other operand or None."""
+    if isinstance(other, Interval):
+      return other.lo, other.hi
+    if isinstance(other, (int, float)):
+      return float(other), float(other)
+    return None
+
+  def _apply(self, kernel: Callable, other: Any, swap: bool) -> Any:
+    """Applies the binary bounds kernel with the other operand."""
+    bounds = self._bounds(other)
+    if bounds is None:
+      return NotImplemented
+    if swap:
+      return Interval(*kernel(*bounds, self.lo, self.hi))
+    return Interval(*kernel(self.lo, self.hi, *bounds))
+
+  def __add__(self, other: Any) -> Self:
+    """Adds the given value to the interval."""
+    return self._apply(_addBounds, other, False)
+
+  def __radd__(self, other: Any) -> Self:
+    """Adds the interval to the given value."""
+    return self._apply(_addBounds, other, True)
+
+  def __sub__(self, other: Any) -> Self:
+    """Subtracts the given value from the interval."""
+    return self._apply(_subBounds, other, False)
+
+  def __rsub__(self, other: Any) -> Self:
+    """Subtracts the interval from the given value."""
+    return self._apply(_subBounds, other, True)
+
+  def __mul__(self, other: Any) -> Self:
+    """Multiplies the interval by the given value."""
+    return self._apply(_mulBounds, other, False)
+
+  def __rmul__(self, other: Any) -> Self:
+    """Multiplies the given value by the interval."""
+    return self._apply(_mulBounds, other, True)
+
+  def __truediv__(self, other: Any) -> Self:
+    """Divides the interval by the given value."""
+    return self._apply(_divBounds, other, False)
+
+  def __rtruediv__(self, other: Any) -> Self:
+    """Divides the given value by the interval."""
+    return self._apply(_divBounds, other, True)
+
+  def __neg__(self) -> Self:
+    """Returns the negated interval."""
+    return Interval(-self.hi, -self.lo)
+
+  def __contains__(self, x: float) -> bool:
+    """Returns True if x lies inside the interval."""
+    return self.lo <= x <= self.hi
+
+  def __eq__(self, other: Any) -> bool:
+    """Returns True if the intervals have the same bounds."""
+    if isinstance(other, Interval):
+      return self.lo == other.lo and self.hi == other.hi
+    return NotImplemented
+
+  def __str__(self) -> str:
+    """String representation"""
+    return '[%s, %s]' % (self.lo, self.hi)
+
+  def __repr__(self) -> str:
+    """Code representation"""
+    return 'Interval(%r, %r)' % (self.lo, self.hi)
+
+  def width(self) -> float:
+    """width returns the upper bound minus the lower bound."""
+    return self.hi - self.lo
+
+  def mid(self) -> float:
+    """mid returns the midpoint of the interval."""
+    return self.lo + (self.hi - self.lo) / 2
+
+  def exp(self) -> Interval:
+    """exp returns the enclosure of exp on the interval."""
+    return Interval(*_expBounds(self.lo, self.hi))
+
+  def log(self) -> Interval:
+    """log returns the enclosure of log on the interval."""
+    return Interval(*_logBounds(self.lo, self.hi))
+
+  def sin(self) -> Interval:
+    """sin returns the enclosure of sin on the interval."""
+    return Interval(*_sinBounds(self.lo, self.hi))
+
+  def cos(self) -> Interval:
+    """cos returns the enclosure of cos on the interval."""
+    return Interval(*_cosBounds(self.lo, self.hi))
+
+  def erf(self) -> Interval:
+    """erf returns the enclosure of erf on the interval."""
+    return Interval(*_erfBounds(self.lo, self.hi))
+
+
+class IntervalArray(FastObject):
+  """IntervalArray implements arrays of closed intervals stored as arrays
+  of lower and upper bounds. Operations broadcast like numpy arrays and
+  run in a single jitted pass over all intervals."""
+
+  lo = AttriBox[np.ndarray](0)
+  hi = AttriBox[np.ndarray](0)
+
+  def __init__(self, lo: Any, hi: Any = None) -> None:
+    FastObject.__init__(self)
+    lo = np.asarray(lo, dtype=float)
+    hi = lo if hi is None else np.asarray(hi, dtype=float)
+    _validate(lo, hi)
+    self.lo, self.hi = np.broadcast_arrays(lo, hi)
+
+  @staticmethod
+  def fromRealNumbers(expVal: Any,
+                      stdDev: Any,
+                      sigmas: float = None) -> IntervalArray:
+    """Returns the intervals of 'sigmas' standard deviations around each
+    expected value."""
+    sigmas = 3. if sigmas is None else sigmas
+    expVal = IntervalArray(expVal)
+    return expVal + IntervalArray(-sigmas * np.asarray(stdDev, dtype=float),
+                                  sigmas * np.asarray(stdDev, dtype=float))
+
+  def _bounds(self, other: Any) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the bounds of the other operand or None."""
+    if isinstance(other, (IntervalArray, Interval)):
+      return np.asarray(other.lo), np.asarray(other.hi)
+    if isinstance(other, (int, float, np.ndarray)):
+      return np.asarray(other, dtype=float), np.asarray(other, dtype=float)
+    return None
+
+  def _apply(self, kernel: Callable, other: Any, swap: bool) -> Any:
+    """Applies the binary bounds kernel with the other operand."""
+    bounds = self._bounds(other)
+    if bounds is None:
+      return NotImplemented
+    arrays = np.broadcast_arrays(self.lo, self.hi, *bounds)
+    shape = arrays[0].shape
+    alo, ahi, blo, bhi = [np.ascontiguousarray(a).ravel() for a in arrays]
+    if swap:
+      alo, ahi, blo, bhi = blo, bhi, alo, ahi
+    lo, hi = _mapBinary(kernel, alo, ahi, blo, bhi)
+    return IntervalArray(lo.reshape(shape), hi.reshape(shape))
+
+  def _map(self, kernel: Callable) -> IntervalArray:
+    """Applies the unary bounds kernel to every interval."""
+    lo = np.ascontiguousarray(self.lo).ravel()
+    hi = np.ascontiguousarray(self.hi).ravel()
+    outLo, outHi = _mapUnary(kernel, lo, hi)
+    shape = self.lo.shape
+    return IntervalArray(outLo.reshape(shape), outHi.reshape(shape))
+
+  def __add__(self, other: Any) -> Self:
+    """Adds the given value to the intervals."""
+    return self._apply(_addBounds, other, False)
+
+  def __radd__(self, other: Any) -> Self:
+    """Adds the intervals to the given value."""
+    return self._apply(_addBounds, other, True)
+
+  def __sub__(self, other: Any) -> Self:
+    """Subtracts the given value from the intervals."""
+    return self._apply(_subBounds, other, False)
+
+  def __rsub__(self, other: Any) -> Self:
+    """Subtracts the intervals from the given value."""
+    return self._apply(_subBounds, other, True)
+
+  def __mul__(self, other: Any) -> Self:
+    """Multiplies the intervals by the given value."""
+    return self._apply(_mulBounds, other, False)
+
+  def __rmul__(self, other: Any) -> Self:
+    """Multiplies the given value by the intervals."""
+    return self._apply(_mulBounds, other, True)
+
+  def __truediv__(self, other: Any) -> Self:
+    """Divides the intervals by the given value."""
+    return self._apply(_divBounds, other, False)
+
+  def __rtruediv__(self, other: Any) -> Self:
+    """Divides the given value by the intervals."""
+    return self._apply(_divBounds, other, True)
+
+  def __neg__(self) -> Self:
+    """Returns the negated intervals."""
+    return IntervalArray(-self.hi, -self.lo)
+
+  def __len__(self) -> int:
+    """Returns the length of the first axis."""
+    return len(self.lo)
+
+  def __getitem__(self, index: Any) -> Any:
+    """Returns the indexed Interval or IntervalArray."""
+    lo, hi = self.lo[index], self.hi[index]
+    if np.ndim(lo):
+      return IntervalArray(lo, hi)
+    return Interval(float(lo), float(hi))
+
+  def __str__(self) -> str:
+    """String representation"""
+    return 'IntervalArray(%s)' % ', '.join(
+      ['[%s, %s]' % (a, b) for (a, b) in zip(self.lo.ravel(),
+                                              self.hi.ravel())])
+
+  def contains(self, x: Any) -> np.ndarray:
+    """contains returns where x lies inside the intervals."""
+    return (self.lo <= x) & (x <= self.hi)
+
+  def width(self) -> np.ndarray:
+    """width returns the widths of the intervals."""
+    return self.hi - self.lo
+
+  def mid(self) -> np.ndarray:
+    """mid returns the midpoints of the intervals."""
+    return self.lo + (self.hi - self.lo) / 2
+
+  def exp(self) -> IntervalArray:
+    """exp returns the enclosures of exp on the intervals."""
+    return self._map(_expBounds)
+
+  def log(self) -> IntervalArray:
+    """log returns the enclosures of log on the intervals."""
+    return self._map(_logBounds)
+
+  def sin(self) -> IntervalArray:
+    """sin returns the enclosures of sin on the intervals."""
+    return self._map(_sinBounds)
+
+  def cos(self) -> IntervalArray:
+    """cos returns the enclosures of cos on the intervals."""
+    return self._map(_cosBounds)
+
+  def erf(self) -> IntervalArray:
+    """erf returns the enclosures of erf on the intervals."""
+    return self._map(_erfBounds)
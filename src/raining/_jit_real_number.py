@@ -0,0 +1,200 @@
+"""JitRealNumber is the numba counterpart of RealNumber. It can be passed
+into, created in and returned from functions compiled in nopython mode,
+where it propagates the standard deviation through arithmetic and the
+'raining.core' functions."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import operator
+from typing import Any, Callable
+
+import numpy as np
+from numba import njit, types, float64
+from numba.experimental import jitclass
+from numba.extending import overload
+
+from raining.core import expReduced, log, sin, cos, tanh, erf, pi, pow
+
+twoOverSqrtPi = 2 / pi ** 0.5
+
+
+@jitclass([('expVal', float64), ('stdDev', float64)])
+class JitRealNumber:
+  """JitRealNumber holds an expected value and a standard deviation like
+  RealNumber. The operators +, -, *, / and ** are available between two
+  instances and between an instance and a number inside compiled code.
+  The functions propagate the standard deviation to first order."""
+
+  def __init__(self, expVal: float, stdDev: float) -> None:
+    self.expVal = expVal
+    self.stdDev = stdDev
+
+  def roll(self) -> float:
+    """Returns a random number from the normal distribution."""
+    return np.random.normal(self.expVal, self.stdDev)
+
+  def sample(self, n: int) -> np.ndarray:
+    """Returns n random numbers from the normal distribution."""
+    return self.expVal + self.stdDev * np.random.standard_normal(n)
+
+  def _propagate(self, value: float, derivative: float) -> JitRealNumber:
+    """Returns the value with the standard deviation scaled by the
+    absolute derivative at the expected value."""
+    return JitRealNumber(value, abs(derivative) * self.stdDev)
+
+  def exp(self) -> JitRealNumber:
+    """Exponential function"""
+    value = expReduced(self.expVal)
+    return self._propagate(value, value)
+
+  def log(self) -> JitRealNumber:
+    """Natural logarithm"""
+    return self._propagate(log(self.expVal), 1 / self.expVal)
+
+  def sin(self) -> JitRealNumber:
+    """Sine function"""
+    return self._propagate(sin(self.expVal), cos(self.expVal))
+
+  def cos(self) -> JitRealNumber:
+    """Cosine function"""
+    return self._propagate(cos(self.expVal), sin(self.expVal))
+
+  def tanh(self) -> JitRealNumber:
+    """Hyperbolic tangent"""
+    value = tanh(self.expVal)
+    return self._propagate(value, 1 - value * value)
+
+  def erf(self) -> JitRealNumber:
+    """Error function"""
+    derivative = twoOverSqrtPi * expReduced(-self.expVal * self.expVal)
+    return self._propagate(erf(self.expVal), derivative)
+
+
+jitRealType = JitRealNumber.class_type.instance_type
+
+
+def _expVal(x: Any) -> float:
+  """Placeholder resolved by the overload below."""
+
+
+def _stdDev(x: Any) -> float:
+  """Placeholder resolved by the overload below."""
+
+
+#  The overload implementations receive numba types rather than values
+#  and must name their parameters as the overloaded function does.
+@overload(_expVal)
+def _expValImpl(x):
+  """Returns the expected value of a JitRealNumber or a number."""
+  if x == jitRealType:
+    return lambda x: x.expVal
+  return lambda x: float(x)
+
+
+@overload(_stdDev)
+def _stdDevImpl(x):
+  """Returns the standard deviation of a JitRealNumber or zero."""
+  if x == jitRealType:
+    return lambda x: x.stdDev
+  return lambda x: 0.
+
+
+def _operands(a: types.Type, b: types.Type) -> bool:
+  """Returns True if at least one operand is a JitRealNumber and the
+  other is a JitRealNumber or a real number."""
+  if a != jitRealType and b != jitRealType:
+    return False
+  for item in [a, b]:
+    if item != jitRealType and not isinstance(item, (types.Integer,
+                                                     types.Float)):
+      return False
+  return True
+
+
+def _operator(op: Callable) -> Callable:
+  """Registers the implementation in the decorated function for the
+  operator when applied to JitRealNumbers."""
+
+  def decorator(kernel: Callable) -> Callable:
+    """Registers the kernel on (expVal, stdDev) pairs."""
+    kernel = njit(kernel)
+
+    @overload(op)
+    def _operatorImpl(a, b):
+      """Implements the operator on JitRealNumbers."""
+      if _operands(a, b):
+        def impl(a, b):
+          """Applies the kernel to the expected values and standard
+          deviations of the operands."""
+          expVal, stdDev = kernel(_expVal(a), _stdDev(a),
+                                  _expVal(b), _stdDev(b))
+          return JitRealNumber(expVal, stdDev)
+
+        return impl
+
+    return kernel
+
+  return decorator
+
+
+@_operator(operator.add)
+def _add(a: float, sa: float, b: float, sb: float) -> tuple:
+  """Sum of independent values"""
+  return a + b, (sa * sa + sb * sb) ** 0.5
+
+
+@_operator(operator.sub)
+def _sub(a: float, sa: float, b: float, sb: float) -> tuple:
+  """Difference of independent values"""
+  return a - b, (sa * sa + sb * sb) ** 0.5
+
+
+@_operator(operator.mul)
+def _mul(a: float, sa: float, b: float, sb: float) -> tuple:
+  """Product of independent values. The relative errors of RealNumber
+  are multiplied out, which keeps the result defined at zero."""
+  return a * b, ((sa * b) ** 2 + (sb * a) ** 2) ** 0.5
+
+
+@_operator(operator.truediv)
+def _div(a: float, sa: float, b: float, sb: float) -> tuple:
+  """Quotient of independent values"""
+  if b == 0:
+    raise ZeroDivisionError('Division by zero.')
+  return a / b, ((sa / b) ** 2 + (sb * a / (b * b)) ** 2) ** 0.5
+
+
+@_operator(operator.pow)
+def powerKernel(a: float, sa: float, b: float, sb: float) -> tuple:
+  """Power of independent values. The base contributes b * a ** (b - 1)
+  times its standard deviation and the exponent a ** b * log(a) times its
+  own. Terms with no uncertainty are skipped, so exact exponents apply to
+  bases of any sign."""
+  value = pow(a, b)
+  variance = 0.
+  if sa:
+    variance += (b * pow(a, b - 1) * sa) ** 2
+  if sb:
+    variance += (value * log(a) * sb) ** 2
+  return value, variance ** 0.5
+
+
+@overload(operator.neg)
+def _negImpl(a):
+  """Implements negation of JitRealNumbers."""
+  if a == jitRealType:
+    return lambda a: JitRealNumber(-a.expVal, a.stdDev)
+
+
+def toJit(number: Any) -> JitRealNumber:
+  """Returns the JitRealNumber with the expVal and stdDev of the given
+  RealNumber. Both are single floats, so the conversion copies no
+  arrays and costs the same in both directions."""
+  return JitRealNumber(float(number.expVal), float(number.stdDev))
+
+
+def fromJit(number: JitRealNumber) -> tuple[float, float]:
+  """Returns the expVal and stdDev of the given JitRealNumber as a pair of
+  floats, the form returned by the aggregate functions and 'power'."""
+  return float(number.expVal), float(number.stdDev)
@@ -0,0 +1,73 @@
+"""The 'power' function raises many uncertain bases to uncertain
+exponents in one compiled loop. Propagating the standard deviation through
+the power itself, rather than through repeated products, keeps x ** 2 at
+2 |x| sigma instead of the sqrt(2) |x| sigma of two independent
+factors."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from numba import njit
+from worktoy.text import monoSpace
+
+from raining._aggregate import _columns
+from raining._jit_real_number import powerKernel
+
+
+@njit
+def _powerKernel(a: np.ndarray, sa: np.ndarray,
+                 b: np.ndarray, sb: np.ndarray) -> tuple:
+  """Applies the power kernel to each pair. Arrays of a single element
+  are broadcast against the other operand."""
+  n = max(a.size, b.size)
+  expVal, stdDev = np.empty(n), np.empty(n)
+  for i in range(n):
+    j = i if a.size > 1 else 0
+    k = i if b.size > 1 else 0
+    expVal[i], stdDev[i] = powerKernel(a[j], sa[j], b[k], sb[k])
+  return expVal, stdDev
+
+
+def _operand(value: Any, stdDev: Any) -> tuple:
+  """Returns the columns of an operand, which may also be a single
+  number or RealNumber. The standard deviations given apply to operands
+  of exact numbers only."""
+  if hasattr(value, 'expVal'):
+    expVal = np.array([float(value.expVal)])
+    ownStdDev = np.array([float(value.stdDev)])
+  elif np.ndim(value) == 0:
+    expVal, ownStdDev = np.array([float(value)]), np.zeros(1)
+  else:
+    expVal, ownStdDev = _columns(value)
+  if not np.any(stdDev):
+    return expVal, ownStdDev
+  if np.any(ownStdDev):
+    e = """Received standard deviations for an operand which carries its
+    own!"""
+    raise ValueError(monoSpace(e))
+  stdDev = np.broadcast_to(np.asarray(stdDev, dtype=float), expVal.shape)
+  return expVal, np.ascontiguousarray(stdDev)
+
+
+def power(base: Any,
+          exponent: Any,
+          *,
+          baseStdDev: Any = 0.0,
+          exponentStdDev: Any = 0.0) -> tuple:
+  """power returns the expected values and standard deviations of base
+  raised to exponent as two float64 arrays. Each operand is a number, a
+  RealNumber, an iterable of RealNumbers or (expVal, stdDev) pairs or an
+  array of exact numbers. The keyword-only arguments 'baseStdDev' and
+  'exponentStdDev' give the standard deviations of operands of exact
+  numbers. Single values are broadcast against the other operand."""
+  a, sa = _operand(base, baseStdDev)
+  b, sb = _operand(exponent, exponentStdDev)
+  if a.size != b.size and 1 not in (a.size, b.size):
+    e = """Received %d bases and %d exponents!""" % (a.size, b.size)
+    raise ValueError(monoSpace(e))
+  if not (a.size and b.size):
+    return np.empty(0), np.empty(0)
+  return _powerKernel(a, sa, b, sb)
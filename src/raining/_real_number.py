@@ -11,6 +11,8 @@ from worktoy.base import FastObject, overload
 from worktoy.desc import CoreDescriptor, AttriBox, Field
 from worktoy.meta import CallMeMaybe
 
+from raining._jit_real_number import JitRealNumber, toJit, powerKernel
+
 
 class RealNumber(FastObject):
   """RealNumber implements the descriptor to realize values for class owning
@@ -98,3 +100,27 @@ class RealNumber(FastObject):
         raise ZeroDivisionError("Division by zero.")
       return RealNumber(self.expVal / other, self.stdDev / abs(other))
     return NotImplemented
+
+  def __pow__(self, other: object) -> Self:
+    """Raises the value of the descriptor to the given power. The
+    uncertainty propagates through the power itself, so x ** 2 is not
+    treated as the product of two independent values. For many values,
+    use 'raining.power'."""
+    if isinstance(other, RealNumber):
+      return RealNumber(*powerKernel(self.expVal, self.stdDev,
+                                     other.expVal, other.stdDev))
+    if isinstance(other, (int, float)):
+      return RealNumber(*powerKernel(self.expVal, self.stdDev,
+                                     float(other), 0.))
+    return NotImplemented
+
+  def __rpow__(self, other: object) -> Self:
+    """Raises the given value to the power of the descriptor."""
+    if isinstance(other, (int, float)):
+      return RealNumber(*powerKernel(float(other), 0.,
+                                     self.expVal, self.stdDev))
+    return NotImplemented
+
+  def toJit(self) -> JitRealNumber:
+    """Returns the JitRealNumber counterpart for use in compiled code."""
+    return toJit(self)
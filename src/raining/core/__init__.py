@@ -7,3 +7,17 @@ from ._exp import exp, log, sinh, cosh, tanh, coth, sech, csch
 from ._exp import arccosh, arccoth, arccsch, arcsech, arcsinh, arctanh
 from ._trig import pi, sin, cos, tan, cot, sec, csc
 from ._erf import erf, erfc, erfinv, erfcinv
+from ._exp32 import exp32, log32, sinh32, cosh32, tanh32, coth32, sech32
+from ._exp32 import csch32, arccosh32, arccoth32, arccsch32, arcsech32
+from ._exp32 import arcsinh32, arctanh32
+from ._trig32 import sin32, cos32, tan32, cot32, sec32, csc32
+from ._erf32 import erf32, erfc32, erfinv32, erfcinv32
+from ._gamma import gamma, lgamma, digamma, beta, gammainc, gammaincc
+from ._gamma import betainc
+from ._trig import sincos
+from ._trig32 import sincos32
+from ._exp import sinhcosh, expReduced
+from ._exp32 import sinhcosh32
+from ._complex import cexp, clog, csin, ccos, csinh, ccosh
+from ._complex import cexp32, clog32, csin32, ccos32, csinh32, ccosh32
+from ._pow import pow, ipow
@@ -0,0 +1,31 @@
+"""The 'arrayFunction' wrapper evaluates functions written for floats on
+arrays. It is shared by the numerical fallbacks of 'raining.stat' and the
+polynomial fitting of 'raining.core.approx'."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+
+def arrayFunction(func: Callable) -> Callable:
+  """Wraps a function written for floats such that it accepts arrays.
+  Functions already accepting arrays are called directly, while others
+  fall back to elementwise evaluation. Only the TypeError and ValueError
+  raised by a function rejecting arrays cause the fallback, so other
+  errors from the function propagate."""
+
+  def wrapped(x: np.ndarray) -> np.ndarray:
+    """Evaluates the wrapped function on every entry of 'x'."""
+    x = np.asarray(x, dtype=float)
+    try:
+      out = np.asarray(func(x), dtype=float)
+    except (TypeError, ValueError):
+      out = None
+    if out is not None and out.shape == x.shape:
+      return out
+    return np.vectorize(func, otypes=[float])(x)
+
+  return wrapped
@@ -0,0 +1,135 @@
+"""The complex variants of exp, log, sin, cos, sinh and cosh. Each is
+composed from the real kernels of 'raining.core' applied to the real and
+imaginary parts, with the sine and cosine of the same argument taken
+together from 'sincos' and likewise for 'sinhcosh'. The exponentials use
+'expReduced', which covers the whole float64 range. The functions ending
+in 32 use the float32 kernels and suit complex64 arrays."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numba import njit
+
+from raining.core._exp import expReduced, log, sinhcosh
+from raining.core._exp32 import exp32, sinhcosh32
+from raining.core._trig import sincos
+from raining.core._trig32 import sincos32
+
+
+@njit
+def _times(a: float, b: float) -> float:
+  """Returns a * b, except that a zero a gives a signed zero even where b
+  is infinite. A zero sine then keeps the imaginary part of exp(800 + 0j)
+  at zero rather than inf * 0 = nan, as in C99 and numpy. Only the factor
+  is selected, so no inf * 0 is computed on either branch."""
+  return a * (b if a else math.copysign(1., b))
+
+
+@njit
+def cexp(z: complex) -> complex:
+  """cexp returns the exponential function at z."""
+  s, c = sincos(z.imag)
+  r = expReduced(z.real)
+  return complex(r * c, _times(s, r))
+
+
+@njit
+def _logModulus(x: float, y: float) -> float:
+  """Returns the logarithm of the modulus of x + iy. Near the unit circle,
+  it is half of log1p of |z|^2 - 1, which is computed from the larger
+  part a and the smaller part b as (a - 1)(a + 1) + b^2 without the
+  cancellation of taking the log of a modulus close to 1."""
+  a, b = max(abs(x), abs(y)), min(abs(x), abs(y))
+  if 0.5 < a < 2 and b < 1:
+    return 0.5 * math.log1p((a - 1) * (a + 1) + b * b)
+  return log(math.hypot(a, b))
+
+
+@njit
+def clog(z: complex) -> complex:
+  """clog returns the principal branch of the natural logarithm at z."""
+  return complex(_logModulus(z.real, z.imag), math.atan2(z.imag, z.real))
+
+
+@njit
+def csin(z: complex) -> complex:
+  """csin returns the sine function at z."""
+  s, c = sincos(z.real)
+  sh, ch = sinhcosh(z.imag)
+  return complex(_times(s, ch), c * sh)
+
+
+@njit
+def ccos(z: complex) -> complex:
+  """ccos returns the cosine function at z."""
+  s, c = sincos(z.real)
+  sh, ch = sinhcosh(z.imag)
+  return complex(c * ch, _times(-s, sh))
+
+
+@njit
+def csinh(z: complex) -> complex:
+  """csinh returns the hyperbolic sine function at z."""
+  s, c = sincos(z.imag)
+  sh, ch = sinhcosh(z.real)
+  return complex(sh * c, _times(s, ch))
+
+
+@njit
+def ccosh(z: complex) -> complex:
+  """ccosh returns the hyperbolic cosine function at z."""
+  s, c = sincos(z.imag)
+  sh, ch = sinhcosh(z.real)
+  return complex(ch * c, _times(s, sh))
+
+
+@njit
+def cexp32(z: complex) -> complex:
+  """cexp32 returns the exponential function at z in float32."""
+  s, c = sincos32(np.float32(z.imag))
+  r = exp32(np.float32(z.real))
+  return complex(r * c, _times(s, r))
+
+
+@njit
+def clog32(z: complex) -> complex:
+  """clog32 returns the principal branch of the natural logarithm at z in
+  float32. The real part is computed in float64, as rounding the modulus
+  to float32 loses the logarithm of moduli close to 1."""
+  real = np.float32(_logModulus(float(z.real), float(z.imag)))
+  return complex(real, math.atan2(z.imag, z.real))
+
+
+@njit
+def csin32(z: complex) -> complex:
+  """csin32 returns the sine function at z in float32."""
+  s, c = sincos32(np.float32(z.real))
+  sh, ch = sinhcosh32(np.float32(z.imag))
+  return complex(_times(s, ch), c * sh)
+
+
+@njit
+def ccos32(z: complex) -> complex:
+  """ccos32 returns the cosine function at z in float32."""
+  s, c = sincos32(np.float32(z.real))
+  sh, ch = sinhcosh32(np.float32(z.imag))
+  return complex(c * ch, _times(-s, sh))
+
+
+@njit
+def csinh32(z: complex) -> complex:
+  """csinh32 returns the hyperbolic sine function at z in float32."""
+  s, c = sincos32(np.float32(z.imag))
+  sh, ch = sinhcosh32(np.float32(z.real))
+  return complex(sh * c, _times(s, ch))
+
+
+@njit
+def ccosh32(z: complex) -> complex:
+  """ccosh32 returns the hyperbolic cosine function at z in float32."""
+  s, c = sincos32(np.float32(z.imag))
+  sh, ch = sinhcosh32(np.float32(z.real))
+  return complex(ch * c, _times(s, sh))
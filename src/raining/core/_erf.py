@@ -28,7 +28,6 @@ def erf(x: float) -> float:
       out += term
     if term < eps:
       break
-    print(x, i, term)
   return out * 2 / pi ** 0.5
 
 
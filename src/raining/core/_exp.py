@@ -4,11 +4,13 @@
 from __future__ import annotations
 
 import sys
-from math import floor
+from math import floor, frexp, ldexp
 
 from numba import njit
 
 eps = sys.float_info.epsilon
+log2 = 0.6931471805599453
+sqrtHalf = 0.7071067811865476
 
 
 @njit
@@ -36,29 +38,49 @@ def exp(x: float) -> float:
   return out
 
 
+@njit
+def expReduced(x: float) -> float:
+  """expReduced returns the exponential function of x over the whole
+  float64 range. x is split into k * log(2) + r with r in [0, log(2)),
+  so that 'exp' only sees small arguments and the power of two is
+  applied exactly by ldexp."""
+  if x != x:
+    return x
+  if x > 710:
+    return float('inf')
+  if x < -746:
+    return 0.
+  k = floor(x / log2)
+  return ldexp(exp(x - k * log2), int(k))
+
+
 @njit
 def log(x: float) -> float:
-  """Log function"""
+  """log returns the natural logarithm of x. The mantissa is scaled into
+  [1/sqrt(2), sqrt(2)) by frexp and its logarithm is summed as
+  2 * arctanh((m - 1) / (m + 1)), which converges quickly there and keeps
+  its relative accuracy near 1. Subnormal arguments need no special
+  case, as frexp returns their full exponent."""
+  if x != x or x < 0:
+    return float('nan')
   if not x:
     return float('-inf')
-  if (x - 1) ** 2 < eps ** 0.5:
-    return 0
-  log2 = 0.693147180559945
-  log3 = 1.0986122886681091
-  if x < 0:
-    return float('nan')
-  if x < 1:
-    return -log(1 / x)
-  if x >= 3 / 2:
-    return log(x * 2 / 3) - log2 + log3
-  out = 0
-  term = 1
-  for i in range(1, 63):
-    term = (x - 1) ** i / i
-    out += (term if i % 2 != 0 else -term)
-    if abs(term) < eps * abs(out) and i:
+  if x == float('inf'):
+    return x
+  m, e = frexp(x)
+  if m < sqrtHalf:
+    m *= 2
+    e -= 1
+  z = (m - 1) / (m + 1)
+  z2 = z * z
+  out = 0.
+  term = z
+  for i in range(32):
+    out += term / (2 * i + 1)
+    term *= z2
+    if abs(term) < eps * abs(out):
       break
-  return out
+  return 2 * out + e * log2
 
 
 @njit
@@ -179,3 +201,23 @@ def arccsch(x: float) -> float:
   if x:
     return log(1 / x + (1 + 1 / x ** 2) ** 0.5)
   return float('nan')
+
+
+@njit
+def sinhcosh(x: float) -> tuple[float, float]:
+  """sinhcosh returns the hyperbolic sine and cosine of x together from a
+  single exponential. Small arguments sum the sinh series instead, as the
+  difference of exponentials cancels there."""
+  e = expReduced(abs(x))
+  c = (e + 1 / e) / 2
+  if abs(x) < 0.5:
+    x2 = x * x
+    s, term = x, x
+    for i in range(1, 16):
+      term *= x2 / ((2 * i) * (2 * i + 1))
+      s += term
+      if abs(term) < eps * abs(s):
+        break
+    return s, c
+  s = (e - 1 / e) / 2
+  return (-s if x < 0 else s), c
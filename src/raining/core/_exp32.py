@@ -0,0 +1,216 @@
+"""The float32 variants of the exponential, logarithmic and hyperbolic
+functions. They target about 1e-06 relative accuracy and use only float32
+arithmetic, so numba can fit twice as many lanes in each SIMD register."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from math import floor, frexp
+
+import numpy as np
+from numba import njit
+
+sig = 'float32(float32)'
+eps32 = np.float32(np.finfo(np.float32).eps)
+zero, half, one, two = [np.float32(i) for i in [0, 0.5, 1, 2]]
+third, fifth = np.float32(1 / 3), np.float32(1 / 5)
+seventh, ninth = np.float32(1 / 7), np.float32(1 / 9)
+inf32, nan32 = np.float32('inf'), np.float32('nan')
+log2 = np.float32(0.6931471805599453)
+sqrtHalf = np.float32(0.7071067811865476)
+maxArg32 = np.float32(88.72283)
+expTable32 = np.exp(np.arange(89)).astype(np.float32)
+
+
+@njit(sig)
+def exp32(x: float) -> float:
+  """exp32 returns the exponential function of x in float32."""
+  if x != x:
+    return nan32
+  if x > maxArg32:
+    return inf32
+  if x < -maxArg32:
+    return zero
+  r = abs(x)
+  n = floor(r)
+  r -= np.float32(n)
+  out = one
+  term = one
+  for i in range(1, 12):
+    term = term * r / np.float32(i)
+    out += term
+    if term < eps32 * out:
+      break
+  out *= expTable32[n]
+  if x < zero:
+    return one / out
+  return out
+
+
+@njit(sig)
+def log32(x: float) -> float:
+  """log32 returns the natural logarithm of x in float32. The mantissa is
+  scaled into [1/sqrt(2), sqrt(2)) and its logarithm is summed as
+  2 * arctanh((m - 1) / (m + 1)), which needs only a few terms there."""
+  if x != x or x < zero:
+    return nan32
+  if not x:
+    return -inf32
+  if x == inf32:
+    return inf32
+  m, e = frexp(x)
+  m = np.float32(m)
+  if m < sqrtHalf:
+    m *= two
+    e -= 1
+  z = (m - one) / (m + one)
+  z2 = z * z
+  out = zero
+  term = z
+  for i in range(8):
+    out += term / np.float32(2 * i + 1)
+    term *= z2
+    if abs(term) < eps32 * abs(out):
+      break
+  return two * out + np.float32(e) * log2
+
+
+@njit(sig)
+def cosh32(x: float) -> float:
+  """Cosh function in float32"""
+  return (exp32(x) + exp32(-x)) * half
+
+
+@njit(sig)
+def sinh32(x: float) -> float:
+  """Sinh function in float32. Small arguments use the series, as the
+  difference of exponentials cancels there."""
+  if abs(x) < half:
+    x2 = x * x
+    return x * (one + x2 / np.float32(6) * (
+      one + x2 / np.float32(20) * (one + x2 / np.float32(42))))
+  return (exp32(x) - exp32(-x)) * half
+
+
+@njit(sig)
+def tanh32(x: float) -> float:
+  """Tanh function in float32"""
+  if x > np.float32(9):
+    return one
+  if x < np.float32(-9):
+    return -one
+  return sinh32(x) / cosh32(x)
+
+
+@njit(sig)
+def coth32(x: float) -> float:
+  """Coth function in float32"""
+  if not x:
+    return nan32
+  return one / tanh32(x)
+
+
+@njit(sig)
+def sech32(x: float) -> float:
+  """Sech function in float32"""
+  return one / cosh32(x)
+
+
+@njit(sig)
+def csch32(x: float) -> float:
+  """Csch function in float32"""
+  if not x:
+    return inf32
+  return one / sinh32(x)
+
+
+@njit(sig)
+def _log1p32(y: float) -> float:
+  """Returns log(1 + y) as log(u) * y / (u - 1) for u = 1 + y, which
+  cancels the rounding of u, so that the result keeps its relative
+  accuracy for small y."""
+  u = one + y
+  if u == one or u == inf32:
+    return y
+  return log32(u) * y / (u - one)
+
+
+@njit(sig)
+def arcsinh32(x: float) -> float:
+  """Arcsinh function in float32. Below 2, this is log(1 + y) for
+  y = a + a^2 / (1 + sqrt(1 + a^2)) by '_log1p32'."""
+  a = abs(x)
+  if a < np.float32(0.125):
+    a2 = a * a
+    out = a * (one - a2 * (np.float32(1 / 6) - a2 * (
+      np.float32(3 / 40) - a2 * np.float32(15 / 336))))
+  elif a < two:
+    out = _log1p32(a + a * a / (one + (a * a + one) ** half))
+  else:
+    out = log32(a + (a * a + one) ** half)
+  return -out if x < zero else out
+
+
+@njit(sig)
+def arccosh32(x: float) -> float:
+  """Arccosh function in float32. With t = x - 1, this is log(1 + y) for
+  y = t + sqrt(t * (t + 2)) by '_log1p32'."""
+  if x < one:
+    return nan32
+  t = x - one
+  return _log1p32(t + (t * (t + two)) ** half)
+
+
+@njit(sig)
+def arctanh32(x: float) -> float:
+  """Arctanh function in float32"""
+  if abs(x) >= one:
+    return nan32
+  if abs(x) < np.float32(0.125):
+    x2 = x * x
+    return x * (one + x2 * (third + x2 * (fifth + x2 * (
+      seventh + x2 * ninth))))
+  return half * log32((one + x) / (one - x))
+
+
+@njit(sig)
+def arccoth32(x: float) -> float:
+  """Arccoth function in float32. This is log(1 + y) / 2 for
+  y = 2 / (x - 1) by '_log1p32', as (x + 1) / (x - 1) rounds to 1 for
+  large x."""
+  if x == one or x == -one:
+    return x * inf32
+  if x:
+    return half * _log1p32(two / (x - one))
+  return nan32
+
+
+@njit(sig)
+def arcsech32(x: float) -> float:
+  """Arcsech function in float32. This is log(1 + y) for
+  y = (1 - x + sqrt((1 - x) * (1 + x))) / x by '_log1p32', where 1 - x is
+  exact near 1."""
+  if x <= zero or x >= one:
+    return nan32
+  t = one - x
+  return _log1p32((t + (t * (one + x)) ** half) / x)
+
+
+@njit(sig)
+def arccsch32(x: float) -> float:
+  """Arccsch function in float32"""
+  if x:
+    return arcsinh32(one / x)
+  return nan32
+
+
+@njit
+def sinhcosh32(x: float) -> tuple[float, float]:
+  """sinhcosh32 returns the hyperbolic sine and cosine of x in float32
+  from a single exponential."""
+  e = exp32(abs(x))
+  c = (e + one / e) * half
+  if abs(x) < half:
+    return sinh32(x), c
+  s = (e - one / e) * half
+  return (-s if x < zero else s), c
@@ -0,0 +1,253 @@
+"""The gamma function and the special functions derived from it: the
+logarithm of the gamma function, the digamma function, the beta function
+and the regularized incomplete gamma and beta functions."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+import sys
+
+import numpy as np
+from numba import njit
+
+from raining.core import pi
+
+eps = sys.float_info.epsilon
+tiny = sys.float_info.min / eps
+nan = float('nan')
+inf = float('inf')
+lanczosG = 7.
+lanczosCoefficients = np.array([
+  0.99999999999980993, 676.5203681218851, -1259.1392167224028,
+  771.32342877765313, -176.61502916214059, 12.507343278686905,
+  -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7, ])
+logSqrtTwoPi = 0.9189385332046728
+sqrtTwoPi = 2.5066282746310002
+#  B_2k / 2k for the asymptotic series of the digamma function
+digammaCoefficients = np.array([
+  1 / 12, -1 / 120, 1 / 252, -1 / 240, 1 / 132, -691 / 32760, 1 / 12, ])
+maxIter = 4096
+
+
+@njit
+def _lanczosSum(x: float) -> float:
+  """Returns the Lanczos series at x, such that gamma(x) is the series
+  times sqrt(2 * pi) * t ** (x - 1 / 2) * exp(-t) for t = x + g - 1 / 2.
+  Valid for x >= 1 / 2."""
+  out = lanczosCoefficients[0]
+  for i in range(1, 9):
+    out += lanczosCoefficients[i] / (x - 1 + i)
+  return out
+
+
+@njit
+def _isPole(x: float) -> bool:
+  """Returns True at the non-positive integers."""
+  return x <= 0 and x == math.floor(x)
+
+
+@njit
+def _gammaPositive(x: float) -> float:
+  """Gamma function for x >= 1 / 2. The power is split in two halves to
+  postpone overflow to where gamma itself overflows."""
+  t = x + lanczosG - 0.5
+  h = t ** ((x - 0.5) / 2)
+  return sqrtTwoPi * h * math.exp(-t) * h * _lanczosSum(x)
+
+
+@njit
+def _lgammaPositive(x: float) -> float:
+  """Logarithm of the gamma function for x >= 1 / 2"""
+  t = x + lanczosG - 0.5
+  return logSqrtTwoPi + (x - 0.5) * math.log(t) - t + math.log(
+    _lanczosSum(x))
+
+
+@njit
+def gamma(x: float) -> float:
+  """gamma returns the gamma function at x, using the Lanczos
+  approximation with g = 7 and the reflection formula below 1/2."""
+  if x != x or _isPole(x):
+    return nan
+  if x > 171.7:
+    return inf
+  if x < 0.5:
+    return pi / (math.sin(pi * x) * _gammaPositive(1 - x))
+  return _gammaPositive(x)
+
+
+@njit
+def lgamma(x: float) -> float:
+  """lgamma returns the logarithm of the absolute value of the gamma
+  function at x."""
+  if x != x:
+    return nan
+  if _isPole(x) or x == inf:
+    return inf
+  if x < 0.5:
+    return math.log(pi / abs(math.sin(pi * x))) - _lgammaPositive(1 - x)
+  if x == 1 or x == 2:
+    return 0.
+  return _lgammaPositive(x)
+
+
+@njit
+def _digammaPositive(x: float) -> float:
+  """Digamma function for x > 0. The recurrence moves x above 10, where
+  the asymptotic series is summed."""
+  out = 0.
+  while x < 10:
+    out -= 1 / x
+    x += 1
+  x2 = 1 / (x * x)
+  series = 0.
+  for i in range(6, -1, -1):
+    series = series * x2 + digammaCoefficients[i]
+  return out + math.log(x) - 0.5 / x - series * x2
+
+
+@njit
+def digamma(x: float) -> float:
+  """digamma returns the logarithmic derivative of the gamma function at
+  x."""
+  if x != x or _isPole(x):
+    return nan
+  if x == inf:
+    return inf
+  if x < 0:
+    return _digammaPositive(1 - x) - pi / math.tan(pi * x)
+  return _digammaPositive(x)
+
+
+@njit
+def beta(a: float, b: float) -> float:
+  """beta returns the beta function at positive a and b."""
+  if not (a > 0 and b > 0):
+    return nan
+  if a + b < 171:
+    return gamma(a) * gamma(b) / gamma(a + b)
+  return math.exp(lgamma(a) + lgamma(b) - lgamma(a + b))
+
+
+@njit
+def _gammaFront(a: float, x: float) -> float:
+  """Returns x ** a * exp(-x) / gamma(a)."""
+  return math.exp(a * math.log(x) - x - lgamma(a))
+
+
+@njit
+def _gammaSeries(a: float, x: float) -> float:
+  """Regularized lower incomplete gamma function by its power series,
+  which converges quickly for x < a + 1."""
+  term = 1 / a
+  out = term
+  for i in range(1, maxIter):
+    term *= x / (a + i)
+    out += term
+    if abs(term) < eps * abs(out):
+      break
+  return out * _gammaFront(a, x)
+
+
+@njit
+def _gammaFraction(a: float, x: float) -> float:
+  """Regularized upper incomplete gamma function by its continued
+  fraction, evaluated by the modified Lentz method, which converges
+  quickly for x >= a + 1."""
+  b = x + 1 - a
+  c = 1 / tiny
+  d = 1 / b
+  out = d
+  for i in range(1, maxIter):
+    an = -i * (i - a)
+    b += 2
+    d = an * d + b
+    d = tiny if abs(d) < tiny else d
+    c = b + an / c
+    c = tiny if abs(c) < tiny else c
+    d = 1 / d
+    delta = d * c
+    out *= delta
+    if abs(delta - 1) < eps:
+      break
+  return out * _gammaFront(a, x)
+
+
+@njit
+def gammainc(a: float, x: float) -> float:
+  """gammainc returns the regularized lower incomplete gamma function
+  P(a, x) for a > 0 and x >= 0."""
+  if x != x or not a > 0 or x < 0:
+    return nan
+  if not x:
+    return 0.
+  if x == inf:
+    return 1.
+  if x < a + 1:
+    return _gammaSeries(a, x)
+  return 1 - _gammaFraction(a, x)
+
+
+@njit
+def gammaincc(a: float, x: float) -> float:
+  """gammaincc returns the regularized upper incomplete gamma function
+  Q(a, x) = 1 - P(a, x) for a > 0 and x >= 0."""
+  if x != x or not a > 0 or x < 0:
+    return nan
+  if not x:
+    return 1.
+  if x == inf:
+    return 0.
+  if x < a + 1:
+    return 1 - _gammaSeries(a, x)
+  return _gammaFraction(a, x)
+
+
+@njit
+def _lentzStep(an: float, c: float, d: float) -> tuple[float, float]:
+  """Returns the next c and d of the modified Lentz method for the
+  continued fraction 1 + an / (1 + ...)."""
+  d = 1 + an * d
+  d = tiny if abs(d) < tiny else d
+  c = 1 + an / c
+  c = tiny if abs(c) < tiny else c
+  return c, 1 / d
+
+
+@njit
+def _betaFraction(a: float, b: float, x: float) -> float:
+  """Continued fraction of the incomplete beta function evaluated by the
+  modified Lentz method. It converges quickly for
+  x < (a + 1) / (a + b + 2)."""
+  c = 1.
+  _, d = _lentzStep(-(a + b) * x / (a + 1), c, 1.)
+  out = d
+  for i in range(1, maxIter):
+    m2 = 2 * i
+    an = i * (b - i) * x / ((a + m2 - 1) * (a + m2))
+    c, d = _lentzStep(an, c, d)
+    out *= d * c
+    an = -(a + i) * (a + b + i) * x / ((a + m2) * (a + m2 + 1))
+    c, d = _lentzStep(an, c, d)
+    out *= d * c
+    if abs(d * c - 1) < eps:
+      break
+  return out
+
+
+@njit
+def betainc(a: float, b: float, x: float) -> float:
+  """betainc returns the regularized incomplete beta function I_x(a, b)
+  for positive a and b and x in [0, 1]."""
+  if x != x or not (a > 0 and b > 0) or x < 0 or x > 1:
+    return nan
+  if not x:
+    return 0.
+  if x == 1:
+    return 1.
+  front = math.exp(lgamma(a + b) - lgamma(a) - lgamma(b)
+                   + a * math.log(x) + b * math.log1p(-x))
+  if x < (a + 1) / (a + b + 2):
+    return front * _betaFraction(a, b, x) / a
+  return 1 - front * _betaFraction(b, a, 1 - x) / b
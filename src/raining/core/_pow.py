@@ -0,0 +1,63 @@
+"""The 'pow' function raises real numbers to real powers."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+
+from numba import njit
+
+from raining.core._exp import expReduced, log
+
+#  Binary exponentiation squares the rounding error of each product into
+#  the following ones, so its relative error grows like n * eps. Beyond
+#  this exponent, 'pow' takes the exponential of the logarithm instead.
+maxExponent = 64
+
+
+@njit
+def ipow(x: float, n: int) -> float:
+  """ipow returns x raised to the integer n by binary exponentiation,
+  which takes about 2 log2(n) multiplications and loses about n * eps of
+  relative accuracy. Negative powers of zero are infinite, as for
+  'pow'."""
+  if n < 0:
+    if not x:
+      return float('inf')
+    x, n = 1 / x, -n
+  out = 1.
+  while n:
+    if n & 1:
+      out *= x
+    x *= x
+    n >>= 1
+  return out
+
+
+@njit
+def pow(x: float, y: float) -> float:
+  """pow returns x raised to the power y. Integer powers up to
+  'maxExponent' in magnitude use 'ipow' and others are exp(y * log(|x|))
+  by 'expReduced', which applies the power of two in the result exactly.
+  Negative bases take the sign of odd integer powers and have no real
+  power otherwise. As in C, 1 to any power and any number to the power 0
+  are 1, even for nan and infinite arguments."""
+  if x == 1 or y == 0:
+    return 1.
+  if x != x or y != y:
+    return float('nan')
+  integral = y == math.floor(y)
+  if integral and abs(y) <= maxExponent:
+    return ipow(x, int(y))
+  sign = 1.
+  if x < 0:
+    if not integral:
+      return float('nan')
+    if y % 2 == 1:
+      sign = -1.
+    x = -x
+    if x == 1:
+      return sign
+  if not x:
+    return sign * 0. if y > 0 else sign * float('inf')
+  return sign * expReduced(y * log(x))
@@ -109,3 +109,33 @@ def cot(x: float) -> float:
   if s ** 2 < eps ** 0.5:
     return float('inf')
   return c / s
+
+
+@njit
+def sincos(x: float) -> tuple[float, float]:
+  """sincos returns the sine and the cosine of x together. The argument
+  is reduced once to [-pi/4, pi/4] and its quadrant, and both series are
+  summed in the same loop, sharing the powers and factorials."""
+  x = _clamp(x)
+  k = round(x / (pi / 2))
+  r = x - k * (pi / 2)
+  s, c = 0., 0.
+  term = 1.
+  for i in range(63):
+    if i % 2:
+      s += term
+    else:
+      c += term
+    term *= r / (i + 1)
+    if i % 2:
+      term = -term
+    if abs(term) < eps * eps:
+      break
+  q = k % 4
+  if q == 0:
+    return s, c
+  if q == 1:
+    return c, -s
+  if q == 2:
+    return -s, -c
+  return -c, s
@@ -0,0 +1,135 @@
+"""The float32 variants of sin, cos and tan. The argument is reduced to
+[-pi/4, pi/4] together with its quadrant, where short fixed polynomials
+reach float32 precision."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from math import floor
+
+import numpy as np
+from numba import njit
+
+from raining.core._exp32 import sig, eps32, half, one, inf32, nan32
+
+twoOverPi = np.float32(0.6366197723675814)
+halfPiHigh = np.float32(1.5703125)
+halfPiMid = np.float32(4.837512969970703125e-04)
+halfPiLow = np.float32(7.54978995489188216e-08)
+sinCoefficients = [np.float32(c) for c in [
+  -1 / 6, 1 / 120, -1 / 5040, 1 / 362880]]
+cosCoefficients = [np.float32(c) for c in [
+  -1 / 2, 1 / 24, -1 / 720, 1 / 40320, -1 / 3628800]]
+s3, s5, s7, s9 = sinCoefficients
+c2, c4, c6, c8, c10 = cosCoefficients
+
+
+@njit
+def _reduce32(x: float) -> tuple[float, int]:
+  """Returns r and k such that x = r + k * pi / 2 with |r| <= pi / 4.
+  The multiple of pi / 2 is subtracted in three parts, each exact for
+  moderate k, to keep the bits of r that a single float32 subtraction
+  would lose."""
+  k = floor(x * twoOverPi + half)
+  kf = np.float32(k)
+  return ((x - kf * halfPiHigh) - kf * halfPiMid) - kf * halfPiLow, k
+
+
+@njit
+def _sinPoly32(r: float) -> float:
+  """Sine polynomial on [-pi/4, pi/4]"""
+  r2 = r * r
+  return r + r * r2 * (s3 + r2 * (s5 + r2 * (s7 + r2 * s9)))
+
+
+@njit
+def _cosPoly32(r: float) -> float:
+  """Cosine polynomial on [-pi/4, pi/4]"""
+  r2 = r * r
+  return one + r2 * (c2 + r2 * (c4 + r2 * (c6 + r2 * (c8 + r2 * c10))))
+
+
+@njit(sig)
+def sin32(x: float) -> float:
+  """Sine function in float32"""
+  if x != x or abs(x) == inf32:
+    return nan32
+  r, k = _reduce32(x)
+  q = k & 3
+  if q == 0:
+    return _sinPoly32(r)
+  if q == 1:
+    return _cosPoly32(r)
+  if q == 2:
+    return -_sinPoly32(r)
+  return -_cosPoly32(r)
+
+
+@njit(sig)
+def cos32(x: float) -> float:
+  """Cos function in float32"""
+  if x != x or abs(x) == inf32:
+    return nan32
+  r, k = _reduce32(x)
+  q = k & 3
+  if q == 0:
+    return _cosPoly32(r)
+  if q == 1:
+    return -_sinPoly32(r)
+  if q == 2:
+    return -_cosPoly32(r)
+  return _sinPoly32(r)
+
+
+@njit(sig)
+def tan32(x: float) -> float:
+  """Tan function in float32"""
+  s, c = sin32(x), cos32(x)
+  if abs(c) < eps32:
+    return inf32
+  return s / c
+
+
+@njit(sig)
+def csc32(x: float) -> float:
+  """Csc function in float32"""
+  s = sin32(x)
+  if abs(s) < eps32:
+    return inf32
+  return one / s
+
+
+@njit(sig)
+def sec32(x: float) -> float:
+  """Sec function in float32"""
+  c = cos32(x)
+  if abs(c) < eps32:
+    return inf32
+  return one / c
+
+
+@njit(sig)
+def cot32(x: float) -> float:
+  """Cot function in float32"""
+  s, c = sin32(x), cos32(x)
+  if abs(s) < eps32:
+    return inf32
+  return c / s
+
+
+@njit
+def sincos32(x: float) -> tuple[float, float]:
+  """sincos32 returns the sine and the cosine of x in float32 from a
+  single argument reduction."""
+  if x != x or abs(x) == inf32:
+    return nan32, nan32
+  r, k = _reduce32(x)
+  s, c = _sinPoly32(r), _cosPoly32(r)
+  q = k & 3
+  if q == 0:
+    return s, c
+  if q == 1:
+    return c, -s
+  if q == 2:
+    return -s, -c
+  return -c, s
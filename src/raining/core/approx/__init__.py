@@ -0,0 +1,11 @@
+"""The 'raining.core.approx' package fits polynomial approximations of
+functions on intervals and generates jitted kernels evaluating them. The
+coefficients are fixed when the kernel is generated, so the kernel does
+no work beyond a fixed number of multiply-adds."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from ._approximation import Approximation
+from ._chebyshev import chebyshev
+from ._remez import minimax, remez
@@ -0,0 +1,180 @@
+"""Approximation holds a fitted polynomial and generates jitted kernels
+evaluating it."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import sys
+from typing import Any, Callable
+
+import numpy as np
+from numba import njit
+from numpy.polynomial import chebyshev as cheb
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+from worktoy.text import monoSpace
+
+eps = sys.float_info.epsilon
+schemes = ['clenshaw', 'horner', 'estrin']
+
+
+def _horner(names: list[str], t: str) -> str:
+  """Returns the Horner expression of the named coefficients in t."""
+  out = names[-1]
+  for name in reversed(names[:-1]):
+    out = '%s + %s * (%s)' % (name, t, out)
+  return out
+
+
+def _clenshaw(names: list[str], t: str) -> list[str]:
+  """Returns the statements of the Clenshaw recurrence summing the
+  Chebyshev series of the named coefficients in t."""
+  if len(names) == 1:
+    return ['return %s' % names[0]]
+  lines = ['t2 = 2 * %s' % t, 'b0 = %s' % names[-1], 'b1 = 0.0']
+  for name in reversed(names[1:-1]):
+    lines.append('b0, b1 = %s + t2 * b0 - b1, b0' % name)
+  lines.append('return %s + %s * b0 - b1' % (names[0], t))
+  return lines
+
+
+def _estrin(names: list[str], t: str) -> list[str]:
+  """Returns the statements of the Estrin scheme. Pairs of coefficients
+  are combined with t, then pairs of pairs with t ** 2 and so on, so that
+  the independent products can run in parallel."""
+  lines = []
+  level, power = 0, t
+  while len(names) > 1:
+    if level:
+      lines.append('p%d = p%d * p%d' % (level, level - 1, level - 1))
+      power = 'p%d' % level
+    else:
+      lines.append('p0 = %s' % t)
+    grouped = []
+    for i in range(0, len(names), 2):
+      name = 'q%d_%d' % (level, i // 2)
+      if i + 1 < len(names):
+        lines.append('%s = %s + %s * %s' % (name, names[i], power,
+                                             names[i + 1]))
+      else:
+        lines.append('%s = %s' % (name, names[i]))
+      grouped.append(name)
+    names = grouped
+    level += 1
+  lines.append('return %s' % names[0])
+  return lines
+
+
+class Approximation(FastObject):
+  """Approximation holds the Chebyshev series of a polynomial
+  approximating a function on the interval [lo, hi]. The series is in the
+  variable t = (2 * x - lo - hi) / (hi - lo), which maps the interval to
+  [-1, 1], and is summed by the Clenshaw recurrence, whose rounding error
+  stays near eps times the sum of the absolute coefficients.
+
+  The monomial coefficients of the same polynomial grow quickly with the
+  degree, and their cancellation loses accuracy. The Horner and Estrin
+  schemes evaluate the monomial form and are therefore only available
+  while its rounding error stays below the error of the fit.
+
+  The 'source' method renders the kernel as Python source with the
+  coefficients as literal constants. Pasting the source into a module
+  stores the fitted table, and 'kernel' compiles the same source with
+  numba."""
+
+  coefficients = AttriBox[np.ndarray](0)
+  lo = AttriBox[float](-1.)
+  hi = AttriBox[float](1.)
+  maxError = AttriBox[float](float('inf'))
+  method = AttriBox[str]()
+  kernels = AttriBox[dict]()
+
+  def __init__(self,
+               coefficients: np.ndarray,
+               lo: float,
+               hi: float,
+               maxError: float,
+               method: str) -> None:
+    FastObject.__init__(self)
+    if not lo < hi:
+      e = """The interval must satisfy lo < hi, but received [%s, %s]!"""
+      raise ValueError(monoSpace(e % (lo, hi)))
+    self.coefficients = np.asarray(coefficients, dtype=float)
+    self.lo, self.hi = float(lo), float(hi)
+    self.maxError, self.method = float(maxError), method
+
+  def __str__(self) -> str:
+    e = """%s approximation of degree %d on [%s, %s] with maximum error
+    %.3e"""
+    return monoSpace(e % (self.method, self.degree(), self.lo, self.hi,
+                          self.maxError))
+
+  def degree(self) -> int:
+    """degree returns the degree of the polynomial."""
+    return self.coefficients.size - 1
+
+  def _scaled(self, x: Any) -> Any:
+    """Returns the polynomial variable at x."""
+    return (x - (self.lo + self.hi) / 2) * (2 / (self.hi - self.lo))
+
+  def __call__(self, x: Any) -> Any:
+    """Evaluates the polynomial at x using numpy."""
+    t = self._scaled(np.asarray(x, dtype=float))
+    out = cheb.chebval(t, self.coefficients)
+    return out if np.ndim(out) else float(out)
+
+  def monomials(self) -> np.ndarray:
+    """monomials returns the coefficients of the polynomial in powers of
+    t. Evaluating them loses about degree * eps times the sum of their
+    absolute values, which 'roundingError' reports."""
+    return cheb.cheb2poly(self.coefficients)
+
+  def roundingError(self) -> float:
+    """roundingError returns the bound on the rounding error of
+    evaluating the monomial form on the interval."""
+    return eps * max(self.degree(), 1) * float(np.sum(np.abs(
+      self.monomials())))
+
+  def source(self, name: str = None, scheme: str = None) -> str:
+    """source returns the Python source of a function evaluating the
+    polynomial by the given scheme: 'clenshaw' (default), 'horner' or
+    'estrin'. Clenshaw sums the Chebyshev series directly. Horner and
+    Estrin evaluate the monomial form, with Horner using the fewest
+    operations and Estrin shortening the chain of dependent
+    multiplications. They raise ValueError if the monomial form would
+    lose more accuracy than the error of the fit."""
+    name = 'kernel' if name is None else name
+    scheme = 'clenshaw' if scheme is None else scheme
+    if scheme not in schemes:
+      e = """Unknown scheme '%s', expected one of %s!"""
+      raise ValueError(monoSpace(e % (scheme, schemes)))
+    coefficients = self.coefficients
+    if scheme != 'clenshaw':
+      if self.roundingError() > self.maxError:
+        e = """The monomial form of %s rounds to errors up to %.3e, which
+        exceeds the error of the fit. Use the 'clenshaw' scheme!"""
+        raise ValueError(monoSpace(e % (self, self.roundingError())))
+      coefficients = self.monomials()
+    names = [repr(float(c)) for c in coefficients]
+    center = repr((self.lo + self.hi) / 2)
+    scale = repr(2 / (self.hi - self.lo))
+    lines = ['def %s(x: float) -> float:' % name,
+             '  """%s"""' % self,
+             '  t = (x - %s) * %s' % (center, scale)]
+    if scheme == 'horner':
+      lines.append('  return %s' % _horner(names, 't'))
+    elif scheme == 'estrin':
+      lines.extend(['  %s' % line for line in _estrin(names, 't')])
+    else:
+      lines.extend(['  %s' % line for line in _clenshaw(names, 't')])
+    return '\n'.join(lines) + '\n'
+
+  def kernel(self, scheme: str = None) -> Callable:
+    """kernel returns the jitted function evaluating the polynomial by
+    the given scheme. Kernels are compiled once per scheme."""
+    scheme = 'clenshaw' if scheme is None else scheme
+    if scheme not in self.kernels:
+      namespace = {}
+      exec(self.source('kernel', scheme), namespace)
+      self.kernels[scheme] = njit(namespace['kernel'])
+    return self.kernels[scheme]
@@ -0,0 +1,66 @@
+"""The 'chebyshev' function fits truncated Chebyshev series."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import sys
+from typing import Callable
+
+import numpy as np
+
+from raining.core._array_function import arrayFunction
+from raining.core.approx._approximation import Approximation
+
+eps = sys.float_info.epsilon
+checkPoints = 4096
+
+
+def chebyshevCoefficients(func: Callable,
+                          lo: float,
+                          hi: float,
+                          n: int) -> np.ndarray:
+  """Returns the coefficients of the Chebyshev series interpolating func
+  on [lo, hi] at the n Chebyshev nodes of the first kind. Coefficients
+  below the rounding noise of the sums are set to zero."""
+  theta = np.pi * (np.arange(n) + 0.5) / n
+  x = (lo + hi) / 2 + (hi - lo) / 2 * np.cos(theta)
+  values = arrayFunction(func)(x)
+  out = 2 / n * np.cos(np.outer(np.arange(n), theta)) @ values
+  out[0] /= 2
+  noise = eps * n ** 0.5 * np.max(np.abs(values))
+  return np.where(np.abs(out) < noise, 0., out)
+
+
+def maxError(func: Callable,
+             approximation: Approximation,
+             n: int = None) -> float:
+  """Returns the largest absolute error of the approximation on a grid
+  of n points including the ends."""
+  x = np.linspace(approximation.lo, approximation.hi, n or checkPoints)
+  return float(np.max(np.abs(approximation(x) - arrayFunction(func)(x))))
+
+
+def chebyshev(func: Callable,
+              lo: float,
+              hi: float,
+              tol: float = None,
+              maxDegree: int = None) -> Approximation:
+  """chebyshev returns the truncated Chebyshev series of func on
+  [lo, hi]. The series is computed to 'maxDegree' (default 32) and
+  truncated at the lowest degree where the sum of the dropped
+  coefficients is below 'tol' (default 1e-14), which bounds the
+  truncation error. The result is close to the minimax polynomial of the
+  same degree and is a good starting point for 'minimax'."""
+  tol = 1e-14 if tol is None else tol
+  maxDegree = 32 if maxDegree is None else maxDegree
+  series = chebyshevCoefficients(func, lo, hi, maxDegree + 1)
+  tails = np.cumsum(np.abs(series[::-1]))[::-1]
+  degree = maxDegree
+  for (i, tail) in enumerate(tails[1:]):
+    if tail < tol:
+      degree = i
+      break
+  out = Approximation(series[:degree + 1], lo, hi,
+                      float('inf'), 'Chebyshev')
+  out.maxError = maxError(func, out)
+  return out
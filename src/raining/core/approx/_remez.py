@@ -0,0 +1,95 @@
+"""The 'minimax' function fits minimax polynomials by the Remez exchange
+algorithm."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+from numpy.polynomial import chebyshev as cheb
+
+from raining.core._array_function import arrayFunction
+from raining.core.approx._approximation import Approximation
+from raining.core.approx._chebyshev import chebyshev, maxError
+
+gridPoints = 8192
+
+
+def _alternatingExtrema(error: np.ndarray, count: int) -> np.ndarray:
+  """Returns the indices of the largest error in each run of equal sign,
+  dropping the smaller of the two ends until at most 'count' remain."""
+  sign = np.where(error < 0, -1, 1)
+  runs = np.split(np.arange(error.size), np.flatnonzero(np.diff(sign)) + 1)
+  out = [run[np.argmax(np.abs(error[run]))] for run in runs]
+  while len(out) > count:
+    if abs(error[out[0]]) < abs(error[out[-1]]):
+      out.pop(0)
+    else:
+      out.pop()
+  return np.array(out)
+
+
+def remez(func: Callable,
+          lo: float,
+          hi: float,
+          degree: int,
+          maxIter: int = None) -> Approximation:
+  """remez returns the minimax polynomial of the given degree for func on
+  [lo, hi]. Each iteration solves for the polynomial whose error
+  alternates with equal size on degree + 2 reference points, then moves
+  the references to the extrema of the error on a grid clustered towards
+  the ends. It stops when the largest error is within 0.1 % of the
+  levelled error. Near the rounding noise of float64 the exchange can
+  stall or diverge, so the most accurate iterate is returned."""
+  maxIter = 32 if maxIter is None else maxIter
+  f = arrayFunction(func)
+  n = degree + 2
+  center, radius = (lo + hi) / 2, (hi - lo) / 2
+  grid = -np.cos(np.pi * np.linspace(0, 1, gridPoints))
+  gridValues = f(center + radius * grid)
+  nodes = -np.cos(np.pi * np.arange(n) / (n - 1))
+  alternation = (-1.) ** np.arange(n)
+  best, bestError = np.zeros(degree + 1), float('inf')
+  for _ in range(maxIter):
+    system = np.column_stack([cheb.chebvander(nodes, degree), alternation])
+    solution = np.linalg.solve(system, f(center + radius * nodes))
+    coefficients, levelled = solution[:-1], abs(solution[-1])
+    error = cheb.chebval(grid, coefficients) - gridValues
+    worst = np.max(np.abs(error))
+    if worst < bestError:
+      best, bestError = coefficients, worst
+    index = _alternatingExtrema(error, n)
+    if worst <= levelled * 1.001 or index.size < n:
+      break
+    if worst > 2 * bestError:
+      break
+    nodes = grid[index]
+  out = Approximation(best, lo, hi, float('inf'), 'Minimax')
+  out.maxError = max(maxError(func, out), float(bestError))
+  return out
+
+
+def minimax(func: Callable,
+            lo: float,
+            hi: float,
+            tol: float = None,
+            degree: int = None) -> Approximation:
+  """minimax returns the minimax polynomial for func on [lo, hi]. With
+  'degree' given, it has that degree. Otherwise, the degree is the
+  lowest reaching the absolute error 'tol' (default 1e-14), searched
+  downwards from the degree of the Chebyshev series reaching 'tol'. If
+  even that degree misses 'tol', the more accurate of the two fits is
+  returned."""
+  if degree is not None:
+    return remez(func, lo, hi, degree)
+  tol = 1e-14 if tol is None else tol
+  start = chebyshev(func, lo, hi, tol)
+  best = start
+  for d in range(start.degree(), -1, -1):
+    fit = remez(func, lo, hi, d)
+    if fit.maxError < best.maxError or fit.maxError <= tol:
+      best = fit
+    if fit.maxError > tol:
+      break
+  return best
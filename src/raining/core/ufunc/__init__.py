@@ -0,0 +1,32 @@
+"""The 'raining.core.ufunc' package provides the 'raining.core' functions
+as numpy universal functions. Each ufunc selects its kernel by the dtype
+of the input array, so float32 arrays run the float32 kernels. Compiling
+every loop up front takes a while, so each ufunc is created the first time
+it is accessed."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Callable
+
+from ._elementary import elementaryNames, createUfunc
+from ._special import specialNames, createSpecialUfunc
+
+__all__ = [*elementaryNames, *specialNames, ]
+
+
+def __getattr__(name: str) -> Callable:
+  """Creates and caches the named ufunc on first access."""
+  if name in elementaryNames:
+    globals()[name] = createUfunc(name)
+    return globals()[name]
+  if name in specialNames:
+    globals()[name] = createSpecialUfunc(name)
+    return globals()[name]
+  e = """module '%s' has no attribute '%s'""" % (__name__, name)
+  raise AttributeError(e)
+
+
+def __dir__() -> list[str]:
+  """Lists the ufuncs along with the module attributes."""
+  return sorted({*globals(), *__all__})
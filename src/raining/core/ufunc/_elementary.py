@@ -0,0 +1,104 @@
+"""The elementary functions of 'raining.core' as ufuncs with a float32
+and a float64 loop. The functions in 'complexNames' also have complex64
+and complex128 loops."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Callable
+
+from numba import njit, types, vectorize
+from numba.extending import overload
+
+from raining import core
+from raining.core import expReduced, sinhcosh
+
+floatSignatures = ['float32(float32)', 'float64(float64)']
+complexSignatures = ['complex64(complex64)', 'complex128(complex128)']
+elementaryNames = [
+  'exp', 'log', 'sinh', 'cosh', 'tanh', 'coth', 'sech', 'csch',
+  'arcsinh', 'arccosh', 'arctanh', 'arccoth', 'arcsech', 'arccsch',
+  'sin', 'cos', 'tan', 'cot', 'sec', 'csc',
+  'erf', 'erfc', 'erfinv', 'erfcinv', ]
+complexNames = ['exp', 'log', 'sin', 'cos', 'sinh', 'cosh', ]
+
+
+@njit
+def _sinh(x: float) -> float:
+  """Sinh function over the whole float64 range"""
+  return sinhcosh(x)[0]
+
+
+@njit
+def _cosh(x: float) -> float:
+  """Cosh function over the whole float64 range"""
+  return sinhcosh(x)[1]
+
+
+@njit
+def _sech(x: float) -> float:
+  """Sech function over the whole float64 range"""
+  return 1 / sinhcosh(x)[1]
+
+
+@njit
+def _csch(x: float) -> float:
+  """Csch function over the whole float64 range"""
+  s = sinhcosh(x)[0]
+  if s:
+    return 1 / s
+  return float('inf')
+
+
+#  The float64 kernels of 'raining.core' built on 'exp' overflow above 32,
+#  so their loops use these full range kernels instead, which agree with
+#  the float32 and complex loops.
+float64Kernels = {'exp': expReduced, 'sinh': _sinh, 'cosh': _cosh,
+                  'sech': _sech, 'csch': _csch, }
+
+
+def _dtypeDispatch(kernel64: Callable,
+                   kernel32: Callable,
+                   complex128: Callable = None,
+                   complex64: Callable = None) -> Callable:
+  """Returns a function which numba resolves at compile time to
+  'kernel32' for float32 arguments, to 'complex64' and 'complex128' for
+  complex arguments and to 'kernel64' otherwise."""
+
+  def dispatch(x: float) -> float:
+    """Placeholder resolved by the overload below."""
+
+  @overload(dispatch)
+  def _dispatchImpl(x):
+    """Selects the kernel matching the type of x."""
+    if isinstance(x, types.Complex):
+      if x.bitwidth == 64:
+        return lambda x: complex64(x)
+      return lambda x: complex128(x)
+    if isinstance(x, types.Float) and x.bitwidth == 32:
+      return lambda x: kernel32(x)
+    return lambda x: kernel64(x)
+
+  return dispatch
+
+
+def createUfunc(name: str) -> Callable:
+  """Creates the ufunc of the named 'raining.core' function from its
+  float64 kernel 'name', or its entry in 'float64Kernels', and its float32
+  kernel 'name32'. Float32 arrays run the float32 kernel and all other
+  real arrays the float64 kernel. Functions in 'complexNames' add loops
+  running the complex kernels 'cname' and 'cname32'."""
+  kernel64 = float64Kernels.get(name, getattr(core, name))
+  kernels = [kernel64, getattr(core, name + '32')]
+  signatures = floatSignatures
+  if name in complexNames:
+    kernels += [getattr(core, 'c' + name), getattr(core, 'c' + name + '32')]
+    signatures = floatSignatures + complexSignatures
+  dispatch = _dtypeDispatch(*kernels)
+
+  def kernel(x: float) -> float:
+    """Evaluates the kernel matching the dtype."""
+    return dispatch(x)
+
+  kernel.__name__ = kernel.__qualname__ = name
+  return vectorize(signatures)(kernel)
@@ -0,0 +1,53 @@
+"""The gamma family and the powers of 'raining.core' as ufuncs. These
+have no float32 kernels, so their float32 loops evaluate the float64
+kernel and round the result, which keeps the dtype of float32 arrays. The
+exponent of 'ipow' is an integer array."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Callable
+
+from numba import vectorize
+
+from raining import core
+
+specialArity = dict(gamma=1, lgamma=1, digamma=1, beta=2, gammainc=2,
+                    gammaincc=2, betainc=3, pow=2, ipow=2, )
+specialNames = [*specialArity, ]
+integerExponent = ['ipow', ]
+
+
+def _signatures(arity: int) -> list[str]:
+  """Returns the float32 and float64 signatures of the given arity."""
+  return ['%s(%s)' % (t, ', '.join([t] * arity))
+          for t in ['float32', 'float64']]
+
+
+def _integerSignatures() -> list[str]:
+  """Returns the signatures of a float base and an int64 exponent."""
+  return ['%s(%s, int64)' % (t, t) for t in ['float32', 'float64']]
+
+
+def _wrap(kernel64: Callable, arity: int) -> Callable:
+  """Returns a kernel of the given arity which evaluates 'kernel64' on
+  its arguments converted to float64."""
+  if arity == 1:
+    return lambda x: kernel64(float(x))
+  if arity == 2:
+    return lambda a, x: kernel64(float(a), float(x))
+  return lambda a, b, x: kernel64(float(a), float(b), float(x))
+
+
+def createSpecialUfunc(name: str) -> Callable:
+  """Creates the ufunc of the named gamma family or power function."""
+  arity = specialArity[name]
+  if name in integerExponent:
+    kernel64 = getattr(core, name)
+    kernel = lambda x, n: kernel64(float(x), n)
+    signatures = _integerSignatures()
+  else:
+    kernel = _wrap(getattr(core, name), arity)
+    signatures = _signatures(arity)
+  kernel.__name__ = kernel.__qualname__ = name
+  return vectorize(signatures)(kernel)
@@ -0,0 +1,7 @@
+"""The 'raining.serve' package provides asynchronous evaluation of the
+'raining' kernels for services handling many concurrent requests."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from ._batch_service import BatchMetrics, BatchService
@@ -0,0 +1,267 @@
+"""BatchService collects concurrent requests on an asyncio event loop into
+micro-batches and evaluates each batch in a single vectorized call on an
+executor, so that requests neither block the loop nor each other."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+from worktoy.meta import CallMeMaybe
+from worktoy.text import monoSpace
+
+from raining.core import ufunc
+
+Request = tuple[asyncio.Future, list, int, bool, float]
+
+
+def _evaluateBatch(function: Any, columns: list) -> tuple[tuple, float]:
+  """Evaluates the function on the concatenated columns of a batch and
+  returns its outputs as a tuple of arrays of the column length, with
+  scalar outputs broadcast, together with the seconds spent. A function
+  given by name is looked up in 'raining.core.ufunc' only here, so that a
+  process pool receives the name rather than the compiled ufunc."""
+  tic = time.perf_counter()
+  if isinstance(function, str):
+    function = getattr(ufunc, function)
+  out = function(*columns)
+  if not isinstance(out, tuple):
+    out = (out,)
+  size = columns[0].size if columns else 1
+  out = tuple(np.broadcast_to(np.asarray(item), (size,)) for item in out)
+  return out, time.perf_counter() - tic
+
+
+class BatchMetrics(FastObject):
+  """BatchMetrics describes one evaluated batch. The queue depth is the
+  number of requests left waiting when the batch was dispatched. The
+  wait is the time from the arrival of the oldest request to dispatch,
+  and the latency is the time from that arrival to the resolution of the
+  batch."""
+
+  requests = AttriBox[int](0)
+  size = AttriBox[int](0)
+  queueDepth = AttriBox[int](0)
+  waitSeconds = AttriBox[float](0.)
+  computeSeconds = AttriBox[float](0.)
+  latency = AttriBox[float](0.)
+  failed = AttriBox[bool](False)
+
+  def __str__(self) -> str:
+    """String representation"""
+    msg = """Batch of %d requests (%d values) with %d queued, waited %.3g
+    ms, computed in %.3g ms, resolved after %.3g ms"""
+    return monoSpace(msg) % (self.requests, self.size, self.queueDepth,
+                             1e3 * self.waitSeconds,
+                             1e3 * self.computeSeconds,
+                             1e3 * self.latency)
+
+
+class BatchService(FastObject):
+  """BatchService evaluates a vectorized function for many concurrent
+  callers. Each caller awaits 'evaluate' with numbers or 1-D arrays, one
+  per argument of the function. Requests arriving within 'maxDelay'
+  seconds of the oldest waiting request are concatenated into one batch
+  of at most 'maxBatch' values, which is evaluated on the executor while
+  the event loop keeps collecting the next batch. Each caller receives
+  its own slice of the outputs, or a tuple of slices if the function
+  returns a tuple of arrays, such as pairs of expected values and
+  standard deviations.
+
+  The function is a callable or the name of a ufunc in
+  'raining.core.ufunc'. With a process pool, a callable must be
+  picklable, while names always are.
+
+  Keyword-only arguments:
+    maxDelay: Latency budget in seconds for collecting a batch, defaults
+      to 0.001.
+    maxBatch: Largest number of values in a batch, defaults to 4096. A
+      single larger request is evaluated as its own batch.
+    executor: Executor evaluating the batches. It remains owned by the
+      caller. Defaults to a thread pool owned by the service.
+    workers: Number of threads of the owned pool, defaults to 1.
+    history: Number of BatchMetrics retained, defaults to 1024."""
+
+  name = AttriBox[str]()
+  function = AttriBox[CallMeMaybe]()
+  executor = AttriBox[Executor]()
+  ownsExecutor = AttriBox[bool](False)
+  workers = AttriBox[int](1)
+  shutDown = AttriBox[bool](False)
+  maxDelay = AttriBox[float](0.001)
+  maxBatch = AttriBox[int](4096)
+  arity = AttriBox[int](-1)
+  queue = AttriBox[asyncio.Queue]()
+  collector = AttriBox[list]()
+  pending = AttriBox[set]()
+  metrics = AttriBox[list]()
+  history = AttriBox[int](1024)
+  batches = AttriBox[int](0)
+  requests = AttriBox[int](0)
+
+  def __init__(self,
+               function: Any,
+               *,
+               maxDelay: float = 0.001,
+               maxBatch: int = 4096,
+               executor: Executor = None,
+               workers: int = 1,
+               history: int = 1024) -> None:
+    FastObject.__init__(self)
+    if isinstance(function, str):
+      if function not in ufunc.__all__:
+        e = """No ufunc named '%s' in 'raining.core.ufunc'!""" % function
+        raise ValueError(monoSpace(e))
+      self.name = function
+    elif callable(function):
+      self.function = function
+    else:
+      e = """Expected a callable or the name of a ufunc, but received
+      '%s'!""" % type(function).__name__
+      raise TypeError(monoSpace(e))
+    self.maxDelay = float(maxDelay)
+    self.maxBatch = int(maxBatch)
+    self.history = int(history)
+    self.workers = int(workers)
+    if executor is None:
+      executor = ThreadPoolExecutor(max_workers=self.workers)
+      self.ownsExecutor = True
+    self.executor = executor
+
+  def _target(self) -> Any:
+    """Returns the function or its name as sent to the executor."""
+    return self.name or self.function
+
+  def running(self) -> bool:
+    """running returns True while the collecting task is active."""
+    return bool(self.collector) and not self.collector[0].done()
+
+  def queueDepth(self) -> int:
+    """queueDepth returns the number of requests waiting for a batch."""
+    return self.queue.qsize() if self.running() else 0
+
+  async def start(self) -> None:
+    """Starts collecting requests on the running event loop. An owned
+    executor shut down by 'stop' is replaced by a new pool."""
+    if self.running():
+      return
+    if self.shutDown:
+      self.executor = ThreadPoolExecutor(max_workers=self.workers)
+      self.shutDown = False
+    self.queue = asyncio.Queue()
+    self.collector = [asyncio.create_task(self._collect())]
+
+  async def stop(self) -> None:
+    """Evaluates the requests already queued, waits for all batches to
+    resolve and shuts down the owned executor. The service may be
+    started again afterwards."""
+    if self.running():
+      await self.queue.put(None)
+      await self.collector[0]
+    if self.pending:
+      await asyncio.gather(*self.pending)
+    self.collector = []
+    if self.ownsExecutor and not self.shutDown:
+      self.executor.shutdown(wait=True)
+      self.shutDown = True
+
+  async def __aenter__(self) -> BatchService:
+    """Starts the service."""
+    await self.start()
+    return self
+
+  async def __aexit__(self, *_) -> None:
+    """Stops the service."""
+    await self.stop()
+
+  async def evaluate(self, *args) -> Any:
+    """Evaluates the function at the arguments as part of a batch. Each
+    argument is a number or a 1-D array, and arrays of one request are
+    broadcast against each other. The service starts if not running."""
+    if self.arity < 0:
+      self.arity = len(args)
+    if len(args) != self.arity:
+      e = """Expected %d arguments, but received %d!""" % (self.arity,
+                                                          len(args))
+      raise TypeError(monoSpace(e))
+    scalar = all(np.ndim(arg) == 0 for arg in args)
+    columns = np.broadcast_arrays(*[np.atleast_1d(arg) for arg in args])
+    if any(column.ndim != 1 for column in columns):
+      e = """Expected numbers or 1-D arrays!"""
+      raise ValueError(e)
+    size = columns[0].size if columns else 1
+    await self.start()
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    await self.queue.put((future, columns, size, scalar, loop.time()))
+    self.requests += 1
+    return await future
+
+  async def _collect(self) -> None:
+    """Collects the queued requests into batches until stopped."""
+    loop = asyncio.get_running_loop()
+    queue = self.queue
+    stopping = False
+    while not stopping:
+      first = await queue.get()
+      if first is None:
+        break
+      batch, size = [first], first[2]
+      deadline = first[4] + self.maxDelay
+      while size < self.maxBatch:
+        if queue.empty():
+          timeout = deadline - loop.time()
+          if timeout <= 0:
+            break
+          try:
+            item = await asyncio.wait_for(queue.get(), timeout)
+          except asyncio.TimeoutError:
+            break
+        else:
+          item = queue.get_nowait()
+        if item is None:
+          stopping = True
+          break
+        batch.append(item)
+        size += item[2]
+      task = asyncio.create_task(self._run(batch, size, queue.qsize()))
+      self.pending.add(task)
+      task.add_done_callback(self.pending.discard)
+
+  async def _run(self, batch: list[Request], size: int, depth: int) -> None:
+    """Evaluates the batch on the executor and resolves its futures."""
+    loop = asyncio.get_running_loop()
+    metrics = BatchMetrics()
+    metrics.requests, metrics.size = len(batch), size
+    metrics.queueDepth = depth
+    oldest = min(item[4] for item in batch)
+    metrics.waitSeconds = loop.time() - oldest
+    columns = [np.concatenate([item[1][j] for item in batch])
+               for j in range(self.arity)]
+    try:
+      out, metrics.computeSeconds = await loop.run_in_executor(
+        self.executor, _evaluateBatch, self._target(), columns)
+    except Exception as exception:
+      metrics.failed = True
+      for item in batch:
+        if not item[0].done():
+          item[0].set_exception(exception)
+    else:
+      start = 0
+      for (future, _, n, scalar, _) in batch:
+        parts = [part[start:start + n] for part in out]
+        start += n
+        if scalar:
+          parts = [part[0] for part in parts]
+        if not future.done():
+          future.set_result(parts[0] if len(parts) == 1 else tuple(parts))
+    metrics.latency = loop.time() - oldest
+    self.batches += 1
+    self.metrics.append(metrics)
+    del self.metrics[:-self.history or None]
@@ -0,0 +1,8 @@
+"""The 'raining.sim' package provides drivers running user models on
+uncertain inputs."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from ._monte_carlo import MonteCarloResult, monteCarlo, scalingEfficiency
+from ._sobol import SobolResult, sobol
@@ -0,0 +1,55 @@
+"""The inputs module turns RealNumber and distribution inputs into batches
+of samples."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from worktoy.text import monoSpace
+
+from raining.stat import AbstractDistribution, MultivariateNormal
+
+
+def inputSpec(item: Any) -> Any:
+  """Returns a picklable description of the input. Distributions are kept
+  as they are, while RealNumber inputs and anything else exposing 'expVal'
+  and 'stdDev' become an (expVal, stdDev) tuple describing a normal
+  distribution. Plain numbers become constant inputs. A
+  MultivariateNormal stands for as many model arguments as it has
+  dimensions."""
+  if isinstance(item, (AbstractDistribution, MultivariateNormal)):
+    return item
+  if hasattr(item, 'expVal') and hasattr(item, 'stdDev'):
+    return float(item.expVal), float(item.stdDev)
+  if isinstance(item, (int, float)):
+    return float(item), 0.
+  e = """Expected a RealNumber, an AbstractDistribution or a
+  MultivariateNormal, but received '%s' of type '%s'!"""
+  e = e % (item, type(item).__name__)
+  raise TypeError(monoSpace(e))
+
+
+def drawInput(spec: Any, rng: np.random.Generator, size: int) -> np.ndarray:
+  """Draws 'size' samples of the input described by 'spec'.
+  Distributions are sampled by the inverse transform of their icdf."""
+  if isinstance(spec, AbstractDistribution):
+    return np.asarray(spec.icdf(rng.random(size)), dtype=float)
+  expVal, stdDev = spec
+  return expVal + stdDev * rng.standard_normal(size)
+
+
+def drawInputs(specs: list,
+               rng: np.random.Generator,
+               size: int) -> list[np.ndarray]:
+  """Draws 'size' samples of each input from the same generator. A
+  MultivariateNormal input contributes one array per dimension, drawn
+  together by a single matrix product."""
+  out = []
+  for spec in specs:
+    if isinstance(spec, MultivariateNormal):
+      out.extend(spec.sample(size, rng).T)
+    else:
+      out.append(drawInput(spec, rng, size))
+  return out
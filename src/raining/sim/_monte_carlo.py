@@ -0,0 +1,228 @@
+"""The Monte Carlo driver evaluates a vectorized model on batches of
+samples of its uncertain inputs across a process pool until the output
+statistics have converged."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+import numpy as np
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+from worktoy.text import monoSpace
+
+from raining.sim._inputs import inputSpec, drawInputs
+from raining.stat import TDigest
+
+Moments = tuple[int, float, float, float, float]
+
+
+def _batchMoments(x: np.ndarray) -> Moments:
+  """Returns the count, the mean and the central sums of the second,
+  third and fourth powers of 'x'."""
+  mean = float(x.mean())
+  d = x - mean
+  d2 = d * d
+  m2, m3, m4 = float(d2.sum()), float((d2 * d).sum()), float((d2 * d2).sum())
+  return x.size, mean, m2, m3, m4
+
+
+def _mergeMoments(a: Moments, b: Moments) -> Moments:
+  """Combines the moments of two batches by the pairwise update
+  formulas."""
+  na, ma, m2a, m3a, m4a = a
+  nb, mb, m2b, m3b, m4b = b
+  if not na:
+    return b
+  n = na + nb
+  delta = mb - ma
+  mean = ma + delta * nb / n
+  m2 = m2a + m2b + delta ** 2 * na * nb / n
+  m3 = (m3a + m3b + delta ** 3 * na * nb * (na - nb) / n ** 2
+        + 3 * delta * (na * m2b - nb * m2a) / n)
+  m4 = (m4a + m4b
+        + delta ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / n ** 3
+        + 6 * delta ** 2 * (na ** 2 * m2b + nb ** 2 * m2a) / n ** 2
+        + 4 * delta * (na * m3b - nb * m3a) / n)
+  return n, mean, m2, m3, m4
+
+
+def _standardErrors(moments: Moments) -> tuple[float, float, float, float]:
+  """Returns the mean, the standard deviation and their standard errors.
+  The error of the standard deviation uses the fourth central moment so
+  that it holds for outputs that are not normally distributed."""
+  n, mean, m2, _, m4 = moments
+  if n < 2:
+    return mean, 0., float('inf'), float('inf')
+  var = m2 / (n - 1)
+  stdDev = var ** 0.5
+  meanError = (var / n) ** 0.5
+  if not stdDev:
+    return mean, stdDev, meanError, 0.
+  varOfVar = max(m4 / n - (m2 / n) ** 2, 0.) / n
+  return mean, stdDev, meanError, varOfVar ** 0.5 / (2 * stdDev)
+
+
+def _runBatch(model: Callable,
+              specs: list,
+              seed: np.random.SeedSequence,
+              size: int,
+              compression: float) -> tuple[Moments, TDigest]:
+  """Draws 'size' samples of every input from the generator seeded by
+  'seed' and evaluates the model on them in one call. Returns the moments
+  of the outputs and a TDigest of them with the given compression, so
+  that only these summaries leave the worker process, not the
+  samples."""
+  rng = np.random.default_rng(seed)
+  out = np.asarray(model(*drawInputs(specs, rng, size)), dtype=float)
+  out = np.broadcast_to(out, (size,)).ravel()
+  digest = TDigest(compression)
+  digest.update(out)
+  return _batchMoments(out), digest
+
+
+class MonteCarloResult(FastObject):
+  """MonteCarloResult holds the output statistics of a Monte Carlo run
+  together with its throughput. The 'digest' holds a quantile sketch of
+  every output value."""
+
+  mean = AttriBox[float](0.)
+  stdDev = AttriBox[float](0.)
+  meanError = AttriBox[float](0.)
+  stdDevError = AttriBox[float](0.)
+  samples = AttriBox[int](0)
+  batches = AttriBox[int](0)
+  workers = AttriBox[int](1)
+  seconds = AttriBox[float](0.)
+  converged = AttriBox[bool](False)
+  digest = AttriBox[TDigest]()
+
+  def samplesPerSecond(self) -> float:
+    """samplesPerSecond returns the throughput of the run."""
+    return self.samples / self.seconds if self.seconds else float('inf')
+
+  def quantile(self, q: float) -> float:
+    """quantile returns the estimated output quantile at q."""
+    return self.digest.quantile(q)
+
+  def __str__(self) -> str:
+    """String representation"""
+    msg = """MonteCarlo: %.6g +/- %.2g (stdDev: %.6g +/- %.2g) from %d
+    samples on %d workers at %.4g samples per second"""
+    return monoSpace(msg) % (self.mean, self.meanError,
+                             self.stdDev, self.stdDevError,
+                             self.samples, self.workers,
+                             self.samplesPerSecond())
+
+
+def monteCarlo(model: Callable,
+               inputs: list,
+               tolerance: float = None,
+               *,
+               workers: int = None,
+               batchSize: int = 65536,
+               maxSamples: int = 2 ** 26,
+               seed: Any = None,
+               compression: float = 100.) -> MonteCarloResult:
+  """Runs 'model' on samples of 'inputs' until the standard errors of
+  both the output mean and standard deviation are below 'tolerance'.
+
+  The inputs are RealNumber instances (treated as normal distributions)
+  or AbstractDistribution instances. The model receives one array of
+  samples per input and must return the array of outputs.
+
+  Keyword-only arguments:
+    workers: Number of worker processes, defaults to the number of cores.
+      With 1 worker, batches run in the calling process and the model
+      need not be picklable.
+    batchSize: Samples per batch, defaults to 65536.
+    maxSamples: Upper limit on the number of samples, rounded up to whole
+      batches, defaults to 2**26.
+    seed: Seed of the root stream. Batch k always uses the k'th child
+      stream, so results are reproducible for any number of workers.
+    compression: Compression of the output quantile sketch, defaults to
+      100.
+
+  Batches are merged in order and convergence is checked after each, so
+  the number of samples used is also reproducible."""
+  workers = workers or os.cpu_count() or 1
+  batchSize, maxSamples = int(batchSize), int(maxSamples)
+  compression = float(compression)
+  root = np.random.SeedSequence(seed)
+  tolerance = 0. if tolerance is None else float(tolerance)
+  specs = [inputSpec(item) for item in inputs]
+  maxBatches = max(1, -(-maxSamples // batchSize))
+  result = MonteCarloResult()
+  result.workers = workers
+  result.digest = TDigest(compression)
+  moments = (0, 0., 0., 0., 0.)
+  tic = time.perf_counter()
+
+  def accept(batch: tuple[Moments, TDigest]) -> bool:
+    """Merges the batch and returns True when the run has converged."""
+    nonlocal moments
+    moments = _mergeMoments(moments, batch[0])
+    result.digest.merge(batch[1])
+    result.batches += 1
+    errors = _standardErrors(moments)
+    return max(errors[2], errors[3]) <= tolerance
+
+  seeds = iter(root.spawn(maxBatches))
+  if workers == 1:
+    for seed in seeds:
+      if accept(_runBatch(model, specs, seed, batchSize, compression)):
+        result.converged = True
+        break
+  else:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      pending = deque()
+      for seed in seeds:
+        pending.append(pool.submit(_runBatch, model, specs, seed,
+                                   batchSize, compression))
+        if len(pending) < 2 * workers:
+          continue
+        if accept(pending.popleft().result()):
+          result.converged = True
+          break
+      while pending and not result.converged:
+        if accept(pending.popleft().result()):
+          result.converged = True
+      for future in pending:
+        future.cancel()
+  result.seconds = time.perf_counter() - tic
+  errors = _standardErrors(moments)
+  result.samples = moments[0]
+  result.mean, result.stdDev = errors[0], errors[1]
+  result.meanError, result.stdDevError = errors[2], errors[3]
+  return result
+
+
+def scalingEfficiency(model: Callable,
+                      inputs: list,
+                      workerCounts: list[int] = None,
+                      samples: int = None,
+                      **kwargs) -> list[tuple[int, float, float]]:
+  """Runs the same fixed number of samples with each number of workers
+  and returns tuples of (workers, samples per second, efficiency), where
+  the efficiency is the throughput relative to perfect linear scaling of
+  the throughput of the first entry. Remaining keyword arguments are
+  passed on to 'monteCarlo'."""
+  if workerCounts is None:
+    cores = os.cpu_count() or 1
+    workerCounts = [1 << i for i in range(cores.bit_length())]
+  samples = 2 ** 22 if samples is None else int(samples)
+  kwargs = {**kwargs, 'maxSamples': samples}
+  out = []
+  base = None
+  for workers in workerCounts:
+    result = monteCarlo(model, inputs, 0., workers=workers, **kwargs)
+    rate = result.samplesPerSecond()
+    if base is None:
+      base = rate / workers
+    out.append((workers, rate, rate / (workers * base)))
+  return out
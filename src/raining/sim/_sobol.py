@@ -0,0 +1,165 @@
+"""The Sobol driver estimates first order and total sensitivity indices of
+a vectorized model with respect to each of its uncertain inputs."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable
+
+import numpy as np
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+from worktoy.text import monoSpace
+
+from raining.sim._inputs import inputSpec, drawInputs
+from raining.stat import MultivariateNormal
+
+Outputs = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _evaluate(model: Callable, columns: list, size: int) -> np.ndarray:
+  """Evaluates the model on the columns and returns 'size' outputs."""
+  out = np.asarray(model(*columns), dtype=float)
+  return np.broadcast_to(out, (size,)).ravel()
+
+
+def _runBatch(model: Callable,
+              specs: list,
+              seed: np.random.SeedSequence,
+              size: int) -> Outputs:
+  """Evaluates the model on one batch of the Saltelli design drawn from
+  the stream given by 'seed'. The rows of A and B are independent draws
+  of all inputs, and row i of the returned matrix holds the outputs at A
+  with the i'th input taken from B. The k mixed matrices are stacked
+  into a single model call, so each batch costs three calls however many
+  inputs there are."""
+  rng = np.random.default_rng(seed)
+  a, b = drawInputs(specs, rng, size), drawInputs(specs, rng, size)
+  k = len(specs)
+  mixed = [np.concatenate([b[j] if i == j else a[j] for i in range(k)])
+           for j in range(k)]
+  outA, outB = _evaluate(model, a, size), _evaluate(model, b, size)
+  outMixed = _evaluate(model, mixed, size * k).reshape(k, size)
+  return outA, outB, outMixed
+
+
+def _indices(outA: np.ndarray,
+             outB: np.ndarray,
+             outMixed: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+  """Returns the first order indices by the estimator of Saltelli (2010)
+  and the total indices by the estimator of Jansen (1999)."""
+  variance = np.var(np.concatenate([outA, outB]))
+  first = np.mean(outB * (outMixed - outA), axis=1) / variance
+  total = 0.5 * np.mean((outA - outMixed) ** 2, axis=1) / variance
+  return first, total
+
+
+class SobolResult(FastObject):
+  """SobolResult holds the first order and total Sobol indices of each
+  input in the order given, with bootstrap confidence intervals of shape
+  (inputs, 2). The first order index is the share of the output variance
+  explained by the input alone, and the total index includes all its
+  interactions with other inputs."""
+
+  firstOrder = AttriBox[np.ndarray](0)
+  total = AttriBox[np.ndarray](0)
+  firstOrderInterval = AttriBox[np.ndarray](0)
+  totalInterval = AttriBox[np.ndarray](0)
+  confidence = AttriBox[float](0.95)
+  variance = AttriBox[float](0.)
+  samples = AttriBox[int](0)
+  evaluations = AttriBox[int](0)
+  workers = AttriBox[int](1)
+  seconds = AttriBox[float](0.)
+
+  def __str__(self) -> str:
+    """String representation"""
+    msg = """Sobol indices from %d model evaluations, %.0f %% confidence
+    intervals in brackets:""" % (self.evaluations, 100 * self.confidence)
+    lines = [monoSpace(msg)]
+    for i in range(self.firstOrder.size):
+      lines.append('  input %d: first %.3f [%.3f, %.3f], total %.3f '
+                   '[%.3f, %.3f]' % (i, self.firstOrder[i],
+                                     *self.firstOrderInterval[i],
+                                     self.total[i],
+                                     *self.totalInterval[i]))
+    return '\n'.join(lines)
+
+
+def sobol(model: Callable,
+          inputs: list,
+          samples: int = None,
+          *,
+          workers: int = None,
+          batchSize: int = 65536,
+          seed: Any = None,
+          bootstrap: int = 100,
+          confidence: float = 0.95) -> SobolResult:
+  """Estimates the Sobol indices of 'model' with respect to 'inputs' from
+  'samples' base samples (default 2**16), costing samples * (k + 2)
+  model evaluations for k inputs.
+
+  The inputs are RealNumber instances (treated as normal distributions),
+  AbstractDistribution instances or constants, and the model receives
+  one array of samples per input as for 'monteCarlo'.
+
+  Keyword-only arguments:
+    workers: Number of worker processes, defaults to the number of cores.
+      With 1 worker, batches run in the calling process and the model
+      need not be picklable.
+    batchSize: Base samples per batch, defaults to 65536.
+    seed: Seed of the root stream. Batch k always uses the k'th child
+      stream, so results are reproducible for any number of workers.
+    bootstrap: Number of bootstrap resamples, defaults to 100.
+    confidence: Level of the percentile intervals, defaults to 0.95."""
+  workers = workers or os.cpu_count() or 1
+  batchSize, bootstrap = int(batchSize), int(bootstrap)
+  confidence = float(confidence)
+  root = np.random.SeedSequence(seed)
+  samples = 2 ** 16 if samples is None else int(samples)
+  specs = [inputSpec(item) for item in inputs]
+  if any(isinstance(spec, MultivariateNormal) for spec in specs):
+    e = """The Sobol indices assume independent inputs, but received a
+    MultivariateNormal!"""
+    raise TypeError(monoSpace(e))
+  sizes = [min(batchSize, samples - start)
+           for start in range(0, samples, batchSize)]
+  seeds = root.spawn(len(sizes) + 1)
+  tic = time.perf_counter()
+  if workers == 1:
+    batches = list(map(_runBatch, repeat(model), repeat(specs), seeds,
+                       sizes))
+  else:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      batches = list(pool.map(_runBatch, repeat(model), repeat(specs),
+                              seeds, sizes))
+  outA = np.concatenate([batch[0] for batch in batches])
+  outB = np.concatenate([batch[1] for batch in batches])
+  outMixed = np.concatenate([batch[2] for batch in batches], axis=1)
+  result = SobolResult()
+  result.variance = float(np.var(np.concatenate([outA, outB])))
+  if not result.variance > 0:
+    e = """The model output has no variance over the inputs, so the
+    Sobol indices are undefined!"""
+    raise ValueError(monoSpace(e))
+  result.firstOrder, result.total = _indices(outA, outB, outMixed)
+  rng = np.random.default_rng(seeds[-1])
+  firsts, totals = [], []
+  for _ in range(bootstrap):
+    index = rng.integers(0, samples, samples)
+    first, total = _indices(outA[index], outB[index], outMixed[:, index])
+    firsts.append(first)
+    totals.append(total)
+  q = [(1 - confidence) / 2, (1 + confidence) / 2]
+  result.firstOrderInterval = np.quantile(firsts, q, axis=0).T
+  result.totalInterval = np.quantile(totals, q, axis=0).T
+  result.confidence = confidence
+  result.samples = samples
+  result.evaluations = samples * (len(specs) + 2)
+  result.workers = workers
+  result.seconds = time.perf_counter() - tic
+  return result
@@ -3,3 +3,8 @@ and probability analysis. """
 #  AGPL-3.0 license
 #  Copyright (c) 2024 Asger Jon Vistisen
 from __future__ import annotations
+
+from ._abstract_distribution import AbstractDistribution
+from ._empirical_distribution import EmpiricalDistribution
+from ._t_digest import TDigest
+from ._multivariate_normal import MultivariateNormal
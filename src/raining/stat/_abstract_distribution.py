@@ -4,27 +4,89 @@ distributions."""
 #  Copyright (c) 2024 Asger Jon Vistisen
 from __future__ import annotations
 
+from typing import Any, Callable
+
+import numpy as np
 from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+
+from raining.core._array_function import arrayFunction
+from raining.stat._quadrature import tailIntegral
+from raining.stat._root_solver import bracket, solve
 
 
 class AbstractDistribution(FastObject):
   """AbstractDistribution provides an abstract baseclass for probability
-  distributions."""
+  distributions. Subclasses must implement 'pdf'. If 'cdf' or 'icdf' are
+  not implemented, numerical fallbacks are used: the 'cdf' integrates the
+  'pdf' with adaptive Gauss-Kronrod quadrature and the 'icdf' inverts the
+  'cdf' with a bracketed Newton solver. Both accept floats or arrays.
+
+  Constants derived from the parameters are computed once through 'memo'.
+  Subclasses whose parameters change after construction must call
+  'forget' when they do."""
+
+  constants = AttriBox[dict]()
 
   def __init__(self):
     super().__init__()
 
+  def memo(self, name: str, compute: Callable) -> Any:
+    """memo returns the named constant, calling 'compute' only the first
+    time it is requested."""
+    if name not in self.constants:
+      self.constants[name] = compute()
+    return self.constants[name]
+
+  def forget(self) -> None:
+    """forget clears the memoized constants."""
+    self.constants.clear()
+
+  def location(self) -> float:
+    """location returns a point near the bulk of the distribution. The
+    numerical fallbacks measure from this point, so subclasses relying on
+    them should override it when the mass is far from 0."""
+    return 0.0
+
+  def scale(self) -> float:
+    """scale returns the typical width of the distribution. The numerical
+    fallbacks use this as their unit of length."""
+    return 1.0
+
   def pdf(self, x: float) -> float:
     """pdf returns the probability density function at x."""
     raise NotImplementedError
 
   def cdf(self, x: float) -> float:
-    """cdf returns the cumulative distribution function at x."""
-    raise NotImplementedError
+    """cdf returns the cumulative distribution function at x. Unless
+    overridden, the left tail is integrated for x below 'location' and the
+    right tail is subtracted from 1 above it."""
+    values = np.asarray(x, dtype=float)
+    pdf = arrayFunction(self.pdf)
+    center, scale = self.location(), self.scale()
+    left = values <= center
+    out = np.empty(values.shape)
+    out[left] = tailIntegral(pdf, values[left], scale, -1)
+    out[~left] = 1 - tailIntegral(pdf, values[~left], scale, 1)
+    out = np.clip(out, 0, 1)
+    return float(out) if np.ndim(x) == 0 else out
 
   def icdf(self, p: float) -> float:
-    """icdf returns the inverse cumulative distribution function at p."""
-    raise NotImplementedError
+    """icdf returns the inverse cumulative distribution function at p.
+    Unless overridden, every entry of p is solved together by a bracketed
+    Newton iteration on 'cdf' using 'pdf' as its derivative."""
+    target = np.asarray(p, dtype=float).ravel()
+    out = np.full(target.shape, float('nan'))
+    out[target == 0] = -float('inf')
+    out[target == 1] = float('inf')
+    inner = np.flatnonzero((target > 0) & (target < 1))
+    if inner.size:
+      cdf, pdf = arrayFunction(self.cdf), arrayFunction(self.pdf)
+      center, scale = self.location(), self.scale()
+      lo, hi = bracket(cdf, target[inner], center, scale)
+      out[inner] = solve(cdf, pdf, target[inner], lo, hi)
+    out = out.reshape(np.shape(p))
+    return float(out) if np.ndim(p) == 0 else out
 
   def sample(self, ) -> float:
     """sample returns a random sample from the distribution."""
@@ -0,0 +1,114 @@
+"""EmpiricalDistribution provides the distribution described by a sample
+array, for example Monte Carlo output."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from random import randrange
+
+import numpy as np
+from worktoy.desc import AttriBox
+
+from raining.stat import AbstractDistribution
+
+
+class EmpiricalDistribution(AbstractDistribution):
+  """EmpiricalDistribution provides the distribution described by a sample
+  array. The cdf and icdf are exact lookups in the sorted samples. The pdf
+  is a Gaussian kernel density estimate, which is computed once on a
+  regular grid by binning the samples and convolving the bins with the
+  kernel through the FFT. Later calls interpolate on the grid. """
+
+  samples = AttriBox[np.ndarray](0)
+  bandwidth = AttriBox[float](0.)
+  gridSize = AttriBox[int](4096)
+  gridPoints = AttriBox[np.ndarray](0)
+  gridDensity = AttriBox[np.ndarray](0)
+
+  def __init__(self, samples: np.ndarray, bandwidth: float = None) -> None:
+    AbstractDistribution.__init__(self)
+    samples = np.sort(np.asarray(samples, dtype=float).ravel())
+    if not samples.size:
+      e = """EmpiricalDistribution requires at least one sample!"""
+      raise ValueError(e)
+    self.samples = samples
+    if bandwidth is None:
+      bandwidth = self._silvermanBandwidth()
+    self.bandwidth = float(bandwidth)
+
+  def _silvermanBandwidth(self) -> float:
+    """Returns the bandwidth from Silverman's rule of thumb."""
+    n = self.samples.size
+    q1, q3 = np.quantile(self.samples, [0.25, 0.75])
+    spread = min(float(np.std(self.samples)), (q3 - q1) / 1.34)
+    if spread <= 0:
+      spread = float(np.std(self.samples)) or 1.
+    return 0.9 * spread * n ** -0.2
+
+  def _buildGrid(self) -> None:
+    """Computes the kernel density estimate on a regular grid. The samples
+    are linearly binned onto the grid and the bins are convolved with the
+    Gaussian kernel by a zero padded FFT, which is O(n + M log M) for n
+    samples on M grid points."""
+    h = self.bandwidth
+    a, b = self.samples[0] - 4 * h, self.samples[-1] + 4 * h
+    m = max(self.gridSize, int((b - a) / h * 8))
+    m = 1 << min(int(m - 1).bit_length(), 22)
+    points = np.linspace(a, b, m)
+    dx = points[1] - points[0]
+    position = (self.samples - a) / dx
+    index = np.minimum(position.astype(np.int64), m - 2)
+    weight = position - index
+    bins = np.bincount(index, 1 - weight, m)
+    bins += np.bincount(index + 1, weight, m)
+    offsets = np.arange(-m + 1, m) * dx
+    kernel = np.exp(-(offsets / h) ** 2 / 2) / (h * (2 * np.pi) ** 0.5)
+    size = 1 << int(3 * m - 2).bit_length()
+    conv = np.fft.irfft(np.fft.rfft(bins, size) * np.fft.rfft(kernel, size),
+                        size)
+    density = conv[m - 1:2 * m - 1] / self.samples.size
+    self.gridPoints = points
+    self.gridDensity = np.maximum(density, 0)
+
+  def forget(self) -> None:
+    """forget clears the memoized constants and the density grid, which
+    must follow any change to 'samples' or 'bandwidth'."""
+    AbstractDistribution.forget(self)
+    self.gridPoints = np.empty(0)
+    self.gridDensity = np.empty(0)
+
+  def location(self) -> float:
+    """location returns the sample median."""
+    return float(self.samples[self.samples.size // 2])
+
+  def scale(self) -> float:
+    """scale returns the sample standard deviation."""
+    return float(np.std(self.samples)) or 1.
+
+  def pdf(self, x: float) -> float:
+    """pdf returns the kernel density estimate at x."""
+    if not self.gridPoints.size:
+      self._buildGrid()
+    out = np.interp(x, self.gridPoints, self.gridDensity, left=0, right=0)
+    return float(out) if np.ndim(x) == 0 else out
+
+  def cdf(self, x: float) -> float:
+    """cdf returns the fraction of samples less than or equal to x."""
+    out = np.searchsorted(self.samples, x, side='right') / self.samples.size
+    return float(out) if np.ndim(x) == 0 else out
+
+  def icdf(self, p: float) -> float:
+    """icdf returns the smallest sample at which the cdf reaches p. The
+    levels of the cdf are computed as in 'cdf' and searched directly, so
+    that icdf(cdf(x)) returns x for every sample x. The levels are
+    memoized, as they take as much memory as the samples."""
+    n = self.samples.size
+    p = np.asarray(p, dtype=float)
+    levels = self.memo('levels', lambda: np.arange(1, n + 1) / n)
+    index = np.minimum(np.searchsorted(levels, p, side='left'), n - 1)
+    out = np.where((p >= 0) & (p <= 1), self.samples[index], float('nan'))
+    return float(out) if np.ndim(out) == 0 else out
+
+  def sample(self, ) -> float:
+    """sample returns one of the samples chosen uniformly."""
+    return float(self.samples[randrange(self.samples.size)])
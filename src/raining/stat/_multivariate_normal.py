@@ -0,0 +1,167 @@
+"""MultivariateNormal provides the normal distribution of correlated
+inputs."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+from worktoy.text import monoSpace
+
+logTwoPi = 1.8378770664093453
+
+
+def _cholesky(matrix: np.ndarray) -> np.ndarray:
+  """Returns the lower Cholesky factor or raises an error if the matrix is
+  not positive definite."""
+  try:
+    return np.linalg.cholesky(matrix)
+  except np.linalg.LinAlgError:
+    e = """The covariance matrix must be positive definite!"""
+    raise ValueError(e)
+
+
+class MultivariateNormal(FastObject):
+  """MultivariateNormal provides the normal distribution of a vector of
+  correlated values with the given mean and covariance. The Cholesky
+  factor L of the covariance and its inverse are computed once, so
+  sampling is a single matrix product of standard normal samples with L
+  and the log density is a single product with the inverse.
+
+  Changing the covariance of a contiguous group of values with
+  'updateBlock' keeps the part of the factor before the group and only
+  refactors the part from the group onwards. Values that change often
+  should therefore come last."""
+
+  mean = AttriBox[np.ndarray](0)
+  covariance = AttriBox[np.ndarray](0)
+  cholesky = AttriBox[np.ndarray](0)
+  inverseCholesky = AttriBox[np.ndarray](0)
+  logDeterminant = AttriBox[float](0.)
+  buffer = AttriBox[np.ndarray](0)
+
+  def __init__(self, mean: Any, covariance: Any) -> None:
+    FastObject.__init__(self)
+    mean = np.array(mean, dtype=float).ravel()
+    covariance = np.array(covariance, dtype=float)
+    if covariance.shape != (mean.size, mean.size):
+      e = """Expected a covariance matrix of shape %s for a mean of %d
+      values, but received shape %s!"""
+      e = e % ((mean.size, mean.size), mean.size, covariance.shape)
+      raise ValueError(monoSpace(e))
+    if not np.allclose(covariance, covariance.T):
+      e = """The covariance matrix must be symmetric!"""
+      raise ValueError(e)
+    self.mean, self.covariance = mean, covariance
+    self._factorize(0)
+
+  @staticmethod
+  def fromRealNumbers(values: Any,
+                      correlation: Any = None) -> MultivariateNormal:
+    """Returns the distribution with the expected values and standard
+    deviations of the RealNumbers and the given correlation matrix, which
+    defaults to the identity."""
+    values = list(values)
+    mean = np.array([value.expVal for value in values], dtype=float)
+    stdDev = np.array([value.stdDev for value in values], dtype=float)
+    if correlation is None:
+      correlation = np.eye(len(values))
+    covariance = np.asarray(correlation, dtype=float) * np.outer(stdDev,
+                                                                 stdDev)
+    return MultivariateNormal(mean, covariance)
+
+  def marginals(self) -> list[tuple[float, float]]:
+    """Returns the expected value and standard deviation of each marginal
+    distribution as a pair of floats. The pairs describe independent
+    values, so the correlations are lost."""
+    return [(float(m), float(s)) for (m, s) in zip(self.mean, self.stdDev())]
+
+  def _factorize(self, start: int) -> None:
+    """Factorizes the covariance from row 'start' onwards. Writing the
+    covariance in blocks split at 'start', the factor is
+    [[L11, 0], [L21, L22]], where L11 and L21 depend only on the
+    covariance before 'start' and the cross covariance, and
+    L22 is the factor of C22 - L21 L21^T."""
+    if not start:
+      self.cholesky = _cholesky(self.covariance)
+      self.inverseCholesky = np.linalg.inv(self.cholesky)
+    else:
+      l21 = self.cholesky[start:, :start]
+      schur = self.covariance[start:, start:] - l21 @ l21.T
+      l22 = _cholesky(schur)
+      inverse22 = np.linalg.inv(l22)
+      self.cholesky[start:, start:] = l22
+      self.inverseCholesky[start:, start:] = inverse22
+      self.inverseCholesky[start:, :start] = -inverse22 @ l21 @ (
+        self.inverseCholesky[:start, :start])
+    self.logDeterminant = 2 * float(np.sum(np.log(np.diag(self.cholesky))))
+
+  def updateBlock(self, start: int, block: Any) -> None:
+    """Replaces the covariance among the values from 'start' to
+    'start + len(block)' and updates the factorization at a cost cubic in
+    the number of values from 'start' onwards."""
+    block = np.asarray(block, dtype=float)
+    stop = start + block.shape[0]
+    if block.shape != (stop - start, stop - start) or stop > self.mean.size:
+      e = """Received a block of shape %s at %d for %d values!"""
+      raise ValueError(e % (block.shape, start, self.mean.size))
+    if not np.allclose(block, block.T):
+      e = """The covariance matrix must be symmetric!"""
+      raise ValueError(e)
+    previous = self.covariance[start:stop, start:stop].copy()
+    self.covariance[start:stop, start:stop] = block
+    try:
+      self._factorize(start)
+    except ValueError:
+      self.covariance[start:stop, start:stop] = previous
+      self._factorize(start)
+      raise
+
+  def dimension(self) -> int:
+    """dimension returns the number of values."""
+    return self.mean.size
+
+  def stdDev(self) -> np.ndarray:
+    """stdDev returns the standard deviations of the values."""
+    return np.sqrt(np.diag(self.covariance))
+
+  def correlation(self) -> np.ndarray:
+    """correlation returns the correlation matrix."""
+    stdDev = self.stdDev()
+    return self.covariance / np.outer(stdDev, stdDev)
+
+  def sample(self,
+             n: int = None,
+             rng: np.random.Generator = None,
+             out: np.ndarray = None) -> np.ndarray:
+    """sample returns n samples as an array of shape (n, dimension). When
+    'out' is given, the samples are written into it. The standard normal
+    samples are drawn into a buffer kept between calls, so repeated calls
+    with the same n allocate nothing."""
+    n = 1 if n is None else int(n)
+    rng = np.random.default_rng() if rng is None else rng
+    shape = (n, self.mean.size)
+    if out is None:
+      out = np.empty(shape)
+    if self.buffer.shape != shape:
+      self.buffer = np.empty(shape)
+    rng.standard_normal(out=self.buffer)
+    np.matmul(self.buffer, self.cholesky.T, out=out)
+    out += self.mean
+    return out
+
+  def logpdf(self, x: Any) -> Any:
+    """logpdf returns the log density at the rows of x."""
+    x = np.asarray(x, dtype=float)
+    whitened = (x - self.mean) @ self.inverseCholesky.T
+    quadratic = np.sum(whitened * whitened, axis=-1)
+    constant = self.mean.size * logTwoPi + self.logDeterminant
+    out = -0.5 * (constant + quadratic)
+    return float(out) if np.ndim(out) == 0 else out
+
+  def pdf(self, x: Any) -> Any:
+    """pdf returns the density at the rows of x."""
+    return np.exp(self.logpdf(x))
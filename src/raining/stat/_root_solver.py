@@ -0,0 +1,76 @@
+"""The root solver module inverts monotonic functions for whole arrays of
+targets at once using a bracketed Newton iteration."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import sys
+from typing import Callable
+
+import numpy as np
+
+eps = sys.float_info.epsilon
+
+
+def bracket(func: Callable,
+            target: np.ndarray,
+            center: float,
+            scale: float,
+            maxIter: int = None) -> tuple[np.ndarray, np.ndarray]:
+  """Returns arrays 'lo' and 'hi' such that func(lo) <= target <= func(hi)
+  for the increasing function 'func'. Both ends start one 'scale' from
+  'center' and any end failing the bound has its distance doubled."""
+  maxIter = 1024 if maxIter is None else maxIter
+  lo = np.full(target.shape, center - scale, dtype=float)
+  hi = np.full(target.shape, center + scale, dtype=float)
+  for (end, sign) in [(lo, -1), (hi, 1)]:
+    active = np.arange(target.size)
+    for _ in range(maxIter):
+      if not active.size:
+        break
+      value = np.asarray(func(end[active]), dtype=float)
+      if sign < 0:
+        bad = value > target[active]
+      else:
+        bad = value < target[active]
+      active = active[bad]
+      end[active] = center + 2 * (end[active] - center)
+  return lo, hi
+
+
+def solve(func: Callable,
+          deriv: Callable,
+          target: np.ndarray,
+          lo: np.ndarray,
+          hi: np.ndarray,
+          xtol: float = None,
+          maxIter: int = None) -> np.ndarray:
+  """Solves func(x) = target for each entry of 'target' where the root is
+  bracketed by the matching entries of 'lo' and 'hi'. Each iteration
+  makes one call to 'func' and one to 'deriv' covering every unresolved
+  entry. The Newton step is taken when it stays inside the bracket and
+  bisection is used otherwise, so convergence never leaves the bracket."""
+  xtol = eps ** 0.75 if xtol is None else xtol
+  maxIter = 128 if maxIter is None else maxIter
+  lo, hi = lo.astype(float), hi.astype(float)
+  x = (lo + hi) / 2
+  active = np.arange(target.size)
+  for _ in range(maxIter):
+    if not active.size:
+      break
+    xa, la, ha = x[active], lo[active], hi[active]
+    residual = np.asarray(func(xa), dtype=float) - target[active]
+    below = residual < 0
+    la = np.where(below, xa, la)
+    ha = np.where(below, ha, xa)
+    slope = np.asarray(deriv(xa), dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+      step = xa - residual / slope
+    inside = (slope > 0) & (step >= la) & (step <= ha)
+    newX = np.where(inside, step, (la + ha) / 2)
+    newX = np.where(residual == 0, xa, newX)
+    lo[active], hi[active], x[active] = la, ha, newX
+    tight = ha - la <= xtol * (1 + np.abs(newX))
+    moved = np.abs(newX - xa) <= xtol * (1 + np.abs(newX))
+    active = active[~((residual == 0) | tight | moved)]
+  return x
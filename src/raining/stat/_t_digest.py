@@ -0,0 +1,161 @@
+"""TDigest provides a mergeable streaming quantile sketch using bounded
+memory."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from math import asin, sin
+
+import numpy as np
+from numba import njit
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+
+from raining.core import pi
+
+
+@njit
+def _compress(means: np.ndarray,
+              weights: np.ndarray,
+              compression: float) -> tuple[np.ndarray, np.ndarray]:
+  """Merges the given centroids into at most about 'compression'
+  centroids. Neighbouring centroids are merged while the merged weight
+  stays within one unit of the arcsine scale function, which keeps the
+  centroids small near the tails and large near the median."""
+  order = np.argsort(means, kind='mergesort')
+  total = weights.sum()
+  outMeans = np.empty(means.size)
+  outWeights = np.empty(means.size)
+  n = 0
+  curMean, curWeight = means[order[0]], weights[order[0]]
+  soFar = 0.0
+  k = compression / (2 * pi) * asin(2 * soFar / total - 1)
+  limit = total * (sin(2 * pi * (k + 1) / compression) + 1) / 2
+  for j in range(1, order.size):
+    i = order[j]
+    if soFar + curWeight + weights[i] <= limit:
+      curWeight += weights[i]
+      curMean += (means[i] - curMean) * weights[i] / curWeight
+      continue
+    outMeans[n], outWeights[n] = curMean, curWeight
+    n += 1
+    soFar += curWeight
+    q = min(soFar / total, 1.0)
+    k = compression / (2 * pi) * asin(2 * q - 1)
+    if k + 1 < compression / 4:
+      limit = total * (sin(2 * pi * (k + 1) / compression) + 1) / 2
+    else:
+      limit = total
+    curMean, curWeight = means[i], weights[i]
+  outMeans[n], outWeights[n] = curMean, curWeight
+  n += 1
+  return outMeans[:n].copy(), outWeights[:n].copy()
+
+
+@njit
+def _quantile(means: np.ndarray,
+              weights: np.ndarray,
+              minValue: float,
+              maxValue: float,
+              q: np.ndarray) -> np.ndarray:
+  """Interpolates the quantiles at 'q' between the centroid means, each
+  centroid being placed at the middle of its cumulative weight."""
+  total = weights.sum()
+  centers = np.cumsum(weights) - weights / 2
+  out = np.empty(q.size)
+  for j in range(q.size):
+    if not 0 <= q[j] <= 1:
+      out[j] = np.nan
+      continue
+    target = q[j] * total
+    if target <= centers[0]:
+      t = target / centers[0] if centers[0] > 0 else 0.0
+      out[j] = minValue + (means[0] - minValue) * t
+      continue
+    if target >= centers[-1]:
+      rest = total - centers[-1]
+      t = (target - centers[-1]) / rest if rest > 0 else 0.0
+      out[j] = means[-1] + (maxValue - means[-1]) * t
+      continue
+    i = np.searchsorted(centers, target, side='right') - 1
+    t = (target - centers[i]) / (centers[i + 1] - centers[i])
+    out[j] = means[i] + (means[i + 1] - means[i]) * t
+  return out
+
+
+class TDigest(FastObject):
+  """TDigest provides a mergeable streaming quantile sketch. Values are
+  collected in a buffer which is merged into a fixed number of weighted
+  centroids whenever it fills up, so memory stays bounded regardless of
+  how many values are ingested. The rank error of the quantiles is of the
+  order 1 / compression near the median and much smaller in the tails.
+  Sketches filled separately, for example in different worker processes,
+  combine with 'merge'. """
+
+  compression = AttriBox[float](100.)
+  bufferSize = AttriBox[int](1024)
+  means = AttriBox[np.ndarray](0)
+  weights = AttriBox[np.ndarray](0)
+  pending = AttriBox[list]()
+  pendingCount = AttriBox[int](0)
+  minValue = AttriBox[float](float('inf'))
+  maxValue = AttriBox[float](-float('inf'))
+
+  def __init__(self, compression: float = None) -> None:
+    FastObject.__init__(self)
+    if compression is not None:
+      self.compression = float(compression)
+    self.bufferSize = max(1024, int(10 * self.compression))
+
+  def _flush(self) -> None:
+    """Merges the pending values into the centroids."""
+    if not self.pendingCount:
+      return
+    values = np.concatenate(self.pending)
+    means = np.concatenate((self.means, values))
+    weights = np.concatenate((self.weights, np.ones(values.size)))
+    self.means, self.weights = _compress(means, weights, self.compression)
+    self.pending = []
+    self.pendingCount = 0
+
+  def update(self, values: np.ndarray) -> None:
+    """Ingests a float or an array of values."""
+    values = np.asarray(values, dtype=float).ravel()
+    values = values[values == values]
+    if not values.size:
+      return
+    self.minValue = min(self.minValue, float(values.min()))
+    self.maxValue = max(self.maxValue, float(values.max()))
+    self.pending.append(values)
+    self.pendingCount += values.size
+    if self.pendingCount >= self.bufferSize:
+      self._flush()
+
+  def merge(self, other: TDigest) -> TDigest:
+    """Merges the other sketch into this one and returns this one."""
+    self._flush()
+    other._flush()
+    if not other.means.size:
+      return self
+    means = np.concatenate((self.means, other.means))
+    weights = np.concatenate((self.weights, other.weights))
+    self.means, self.weights = _compress(means, weights, self.compression)
+    self.minValue = min(self.minValue, other.minValue)
+    self.maxValue = max(self.maxValue, other.maxValue)
+    return self
+
+  def count(self) -> int:
+    """count returns the number of values ingested."""
+    return int(self.weights.sum()) + self.pendingCount
+
+  def quantile(self, q: float) -> float:
+    """quantile returns the estimated quantile at q for a float or an
+    array of probabilities."""
+    self._flush()
+    if not self.means.size:
+      e = """Unable to estimate quantiles of an empty TDigest!"""
+      raise ValueError(e)
+    levels = np.asarray(q, dtype=float)
+    out = _quantile(self.means, self.weights, self.minValue, self.maxValue,
+                    levels.ravel()).reshape(levels.shape)
+    return float(out) if np.ndim(q) == 0 else out
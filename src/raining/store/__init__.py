@@ -0,0 +1,7 @@
+"""The 'raining.store' package provides persistent storage of large
+collections of uncertain values."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from ._uncertain_store import UncertainStore
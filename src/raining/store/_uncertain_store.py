@@ -0,0 +1,174 @@
+"""UncertainStore persists (expVal, stdDev) columns on disk and maps them
+back into memory lazily."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import json
+import os
+from typing import Iterator, Any
+
+import numpy as np
+from worktoy.base import FastObject
+from worktoy.desc import AttriBox
+from worktoy.text import monoSpace
+
+formatVersion = 1
+dtype = np.dtype('<f8')
+
+
+class UncertainStore(FastObject):
+  """UncertainStore persists (expVal, stdDev) columns on disk. The store
+  is a directory holding one raw little endian float64 file per column
+  and a small 'meta.json' header. Optionally, the values are grouped in
+  consecutive blocks of 'blockSize' values, each with a full covariance
+  matrix kept in a third column file.
+
+  Appending writes to the end of each file and updates the header last,
+  so an interrupted append leaves the store readable with its previous
+  length. Reading memory-maps the files, which neither loads nor copies
+  the data, so stores larger than the available memory can be streamed
+  through the 'raining.core' kernels by 'chunks'."""
+
+  path = AttriBox[str]()
+  blockSize = AttriBox[int](0)
+  count = AttriBox[int](0)
+  mapped = AttriBox[dict]()
+
+  def __init__(self, path: str, blockSize: int = None) -> None:
+    """Opens the store at 'path' or creates it if it does not exist. The
+    'blockSize' applies only to new stores and 0 means no covariance."""
+    FastObject.__init__(self)
+    self.path = os.path.abspath(path)
+    if os.path.exists(self._metaPath()):
+      with open(self._metaPath(), 'r') as file:
+        meta = json.load(file)
+      if meta.get('version') != formatVersion:
+        e = """Unsupported store version: '%s'!""" % meta.get('version')
+        raise ValueError(e)
+      self.blockSize, self.count = meta['blockSize'], meta['count']
+      if blockSize is not None and blockSize != self.blockSize:
+        e = """The store at '%s' has block size %d, but %d was
+        requested!""" % (self.path, self.blockSize, blockSize)
+        raise ValueError(monoSpace(e))
+      return
+    os.makedirs(self.path, exist_ok=True)
+    self.blockSize = 0 if blockSize is None else int(blockSize)
+    for name in self._columns():
+      open(self._columnPath(name), 'wb').close()
+    self._writeMeta()
+
+  def _metaPath(self) -> str:
+    """Returns the path of the header file."""
+    return os.path.join(self.path, 'meta.json')
+
+  def _columnPath(self, name: str) -> str:
+    """Returns the path of the named column file."""
+    return os.path.join(self.path, '%s.f8' % name)
+
+  def _columns(self) -> list[str]:
+    """Returns the names of the column files."""
+    if self.blockSize:
+      return ['expVal', 'stdDev', 'covariance']
+    return ['expVal', 'stdDev']
+
+  def _writeMeta(self) -> None:
+    """Writes the header through a temporary file replacing the old."""
+    meta = dict(version=formatVersion, count=self.count,
+                blockSize=self.blockSize, dtype=dtype.str)
+    tempPath = self._metaPath() + '.tmp'
+    with open(tempPath, 'w') as file:
+      json.dump(meta, file)
+    os.replace(tempPath, self._metaPath())
+
+  def _map(self, name: str, shape: tuple) -> np.ndarray:
+    """Returns the read-only memory map of the named column."""
+    if name not in self.mapped:
+      if self.count:
+        self.mapped[name] = np.memmap(self._columnPath(name), dtype=dtype,
+                                      mode='r', shape=shape)
+      else:
+        self.mapped[name] = np.empty(shape, dtype=dtype)
+    return self.mapped[name]
+
+  def __len__(self) -> int:
+    """Returns the number of stored values."""
+    return self.count
+
+  def expVal(self) -> np.ndarray:
+    """expVal returns the memory mapped column of expected values."""
+    return self._map('expVal', (self.count,))
+
+  def stdDev(self) -> np.ndarray:
+    """stdDev returns the memory mapped column of standard deviations."""
+    return self._map('stdDev', (self.count,))
+
+  def covariance(self) -> np.ndarray:
+    """covariance returns the memory mapped covariance blocks with shape
+    (count / blockSize, blockSize, blockSize)."""
+    if not self.blockSize:
+      e = """This store was created without covariance blocks!"""
+      raise AttributeError(e)
+    b = self.blockSize
+    return self._map('covariance', (self.count // b, b, b))
+
+  def append(self,
+             expVal: np.ndarray,
+             stdDev: np.ndarray,
+             covariance: np.ndarray = None) -> None:
+    """Appends a chunk of values. Stores with covariance blocks require
+    whole blocks. When 'covariance' is omitted, the blocks are diagonal
+    with the variances given by 'stdDev'."""
+    expVal = np.ascontiguousarray(expVal, dtype=dtype).ravel()
+    stdDev = np.ascontiguousarray(stdDev, dtype=dtype).ravel()
+    if expVal.shape != stdDev.shape:
+      e = """Received %d expected values, but %d standard deviations!"""
+      raise ValueError(e % (expVal.size, stdDev.size))
+    if not expVal.size:
+      return
+    chunks = [expVal, stdDev]
+    if self.blockSize:
+      b = self.blockSize
+      if expVal.size % b:
+        e = """Appending %d values does not fill whole blocks of %d!"""
+        raise ValueError(e % (expVal.size, b))
+      if covariance is None:
+        covariance = np.zeros((expVal.size // b, b, b), dtype=dtype)
+        diagonal = stdDev.reshape(-1, b) ** 2
+        covariance[:, np.arange(b), np.arange(b)] = diagonal
+      covariance = np.ascontiguousarray(covariance, dtype=dtype)
+      if covariance.shape != (expVal.size // b, b, b):
+        e = """Expected covariance blocks of shape %s, but received %s!"""
+        raise ValueError(e % ((expVal.size // b, b, b), covariance.shape))
+      chunks.append(covariance)
+    elif covariance is not None:
+      e = """This store was created without covariance blocks!"""
+      raise ValueError(e)
+    self.mapped = {}
+    for (name, chunk) in zip(self._columns(), chunks):
+      with open(self._columnPath(name), 'r+b') as file:
+        file.seek(self.count * chunk.size // expVal.size * dtype.itemsize)
+        file.write(chunk.tobytes())
+        file.truncate()
+    self.count += expVal.size
+    self._writeMeta()
+
+  def appendRealNumbers(self, values: Any) -> None:
+    """Appends the expVal and stdDev of each RealNumber in 'values'."""
+    values = list(values)
+    self.append(np.fromiter((v.expVal for v in values), dtype, len(values)),
+                np.fromiter((v.stdDev for v in values), dtype, len(values)))
+
+  def value(self, index: int) -> tuple[float, float]:
+    """value returns the expVal and stdDev at 'index' as a pair of
+    floats."""
+    return float(self.expVal()[index]), float(self.stdDev()[index])
+
+  def chunks(self, size: int = None) -> Iterator[tuple[np.ndarray, ...]]:
+    """Yields consecutive (expVal, stdDev) views of 'size' values each.
+    The views are slices of the memory maps, so only the pages touched by
+    the consumer are read from disk."""
+    size = 1 << 20 if size is None else int(size)
+    expVal, stdDev = self.expVal(), self.stdDev()
+    for start in range(0, self.count, size):
+      yield expVal[start:start + size], stdDev[start:start + size]
@@ -0,0 +1,94 @@
+"""TestApprox tests the polynomial approximations and their kernels."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from unittest import TestCase
+
+import numpy as np
+from numba import njit
+
+from raining.core.approx import Approximation, chebyshev, minimax, remez
+
+
+class TestApprox(TestCase):
+  """TestApprox tests the polynomial approximations and their kernels."""
+
+  def setUp(self) -> None:
+    """Sets up the points"""
+    self.x = np.linspace(0., 1., 257)
+
+  def test_chebyshev(self) -> None:
+    """Testing that the Chebyshev series reaches the tolerance."""
+    fit = chebyshev(np.exp, 0., 1., 1e-12)
+    self.assertIsInstance(fit, Approximation)
+    self.assertLessEqual(fit.maxError, 1e-12)
+    self.assertLess(fit.degree(), 14)
+    error = np.abs(fit(self.x) - np.exp(self.x))
+    self.assertLessEqual(error.max(), 1e-12)
+    fit = chebyshev(math.exp, 0., 1., 1e-12)
+    self.assertLessEqual(fit.maxError, 1e-12)
+
+  def test_errors(self) -> None:
+    """Testing that errors of the function are not swallowed."""
+
+    def fails(x: np.ndarray) -> np.ndarray:
+      """Raises an error"""
+      raise ZeroDivisionError
+
+    with self.assertRaises(ZeroDivisionError):
+      chebyshev(fails, 0., 1.)
+
+  def test_remez(self) -> None:
+    """Testing that the minimax error is below the Chebyshev error of
+    the same degree."""
+    for degree in [3, 5, 7]:
+      fit = remez(np.exp, 0., 1., degree)
+      series = chebyshev(np.exp, 0., 1., 0., degree)
+      self.assertEqual(fit.degree(), degree)
+      self.assertLessEqual(fit.maxError, series.maxError)
+
+  def test_minimax(self) -> None:
+    """Testing the degree search for the tolerance."""
+    fit = minimax(math.erf, -2., 2., 1e-7)
+    self.assertLessEqual(fit.maxError, 1e-7)
+    lower = remez(math.erf, -2., 2., fit.degree() - 2)
+    self.assertGreater(lower.maxError, 1e-7)
+
+  def test_kernels(self) -> None:
+    """Testing the generated kernels inside compiled code."""
+    fit = minimax(np.sin, -1., 1., 1e-10)
+    for scheme in ['clenshaw', 'horner', 'estrin']:
+      kernel = fit.kernel(scheme)
+      total = njit(lambda x: sum([kernel(v) for v in x]))
+      x = 2 * self.x - 1
+      self.assertAlmostEqual(total(x), np.sin(x).sum(), delta=1e-8)
+      for value in x:
+        self.assertAlmostEqual(kernel(value), math.sin(value), delta=1e-10)
+    self.assertIs(fit.kernel(), fit.kernel('clenshaw'))
+    self.assertIn('def fastSin(x: float)', fit.source('fastSin'))
+    with self.assertRaises(ValueError):
+      fit.source(scheme='newton')
+
+  def test_conditioning(self) -> None:
+    """Testing that high degrees keep the accuracy of the Chebyshev series
+    and refuse the ill conditioned monomial form."""
+    cases = [(np.sin, 0., 20., 32, 1e-13),
+             (np.log, 0.05, 1., 62, 1e-12),
+             (lambda t: 1 / (1 + 25 * t * t), -1., 1., 64, 1e-05)]
+    for (func, lo, hi, degree, limit) in cases:
+      fit = chebyshev(func, lo, hi, 0., degree)
+      x = np.linspace(lo, hi, 1001)
+      self.assertLess(np.max(np.abs(fit(x) - func(x))), limit)
+      kernel = fit.kernel()
+      for value in x[::50]:
+        self.assertAlmostEqual(kernel(value), func(value), delta=limit)
+      with self.assertRaises(ValueError):
+        fit.kernel('horner')
+    self.assertEqual(len(fit.monomials()), fit.degree() + 1)
+
+  def test_interval(self) -> None:
+    """Testing that an empty interval is rejected."""
+    with self.assertRaises(ValueError):
+      chebyshev(np.exp, 1., 0.)
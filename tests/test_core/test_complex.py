@@ -0,0 +1,90 @@
+"""TestComplex tests the complex kernels and their ufunc loops."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import cmath
+import math
+from unittest import TestCase
+
+import numpy as np
+
+from raining.core import cexp, clog, csin, ccos, csinh, ccosh, cexp32
+from raining.core import sincos, sincos32, sinhcosh
+from raining.core import ufunc
+
+names = ['exp', 'log', 'sin', 'cos', 'sinh', 'cosh']
+
+
+class TestComplex(TestCase):
+  """TestComplex tests the complex kernels and their ufunc loops."""
+
+  def setUp(self) -> None:
+    """Sets up the values"""
+    rng = np.random.default_rng(9)
+    self.z = rng.uniform(-5, 5, 256) + 1j * rng.uniform(-5, 5, 256)
+
+  def _assertClose(self, left: complex, right: complex, lim: float) -> None:
+    """Asserts relative closeness"""
+    self.assertLessEqual(abs(left - right), lim * abs(right))
+
+  def test_shared(self) -> None:
+    """Testing the shared sine and cosine kernels."""
+    for x in np.linspace(-10., 10., 101):
+      s, c = sincos(x)
+      self.assertAlmostEqual(s, math.sin(x), delta=1e-15)
+      self.assertAlmostEqual(c, math.cos(x), delta=1e-15)
+      s, c = sincos32(np.float32(x))
+      self.assertAlmostEqual(s, math.sin(np.float32(x)), delta=1e-6)
+      self.assertAlmostEqual(c, math.cos(np.float32(x)), delta=1e-6)
+      s, c = sinhcosh(x / 4)
+      self._assertClose(s, math.sinh(x / 4), 1e-8)
+      self._assertClose(c, math.cosh(x / 4), 1e-8)
+
+  def test_kernels(self) -> None:
+    """Testing the complex kernels against cmath."""
+    kernels = [cexp, clog, csin, ccos, csinh, ccosh]
+    for z in self.z:
+      for (kernel, name) in zip(kernels, names):
+        self._assertClose(kernel(z), getattr(cmath, name)(z), 1e-7)
+      self._assertClose(cexp32(z), cmath.exp(z), 1e-6)
+    self.assertAlmostEqual(clog(-1 + 0j).imag, math.pi)
+
+  def test_range(self) -> None:
+    """Testing large arguments and moduli near 1."""
+    rng = np.random.default_rng(11)
+    z = rng.uniform(-40, 40, 256) + 1j * rng.uniform(-40, 40, 256)
+    kernels = [cexp, clog, csin, ccos, csinh, ccosh]
+    for value in z:
+      for (kernel, name) in zip(kernels, names):
+        self._assertClose(kernel(value), getattr(cmath, name)(value), 1e-8)
+    for value in [1.00005 + 0j, 0.6 + 0.8000001j, -0.99999 + 1e-3j,
+                  1j * (1 + 1e-12)]:
+      self._assertClose(clog(value).real, cmath.log(value).real, 1e-12)
+
+  def test_zeroParts(self) -> None:
+    """Testing that zero parts stay zero where the other part overflows."""
+    inf = float('inf')
+    cases = [(cexp, inf, 0.), (csinh, inf, -inf), (ccosh, inf, inf)]
+    for (kernel, right, left) in cases:
+      self.assertEqual(kernel(800 + 0j), complex(right, 0.))
+      self.assertEqual(kernel(-800 + 0j), complex(left, 0.))
+    for z in [800j, -800j]:
+      for kernel in [csin, ccos]:
+        out = kernel(z)
+        self.assertFalse(math.isnan(out.real) or math.isnan(out.imag))
+    out = ufunc.exp(np.array([800 + 0j, 800 + 0j], dtype=np.complex64))
+    self.assertTrue(np.all(out == complex(float('inf'), 0.)))
+
+  def test_ufunc(self) -> None:
+    """Testing the complex loops of the ufuncs."""
+    for name in names:
+      func, ref = getattr(ufunc, name), getattr(cmath, name)
+      exact = np.array([ref(z) for z in self.z])
+      out = func(self.z)
+      self.assertEqual(out.dtype, np.complex128)
+      self.assertTrue(np.all(np.abs(out - exact) <= 1e-7 * np.abs(exact)))
+      out = func(self.z.astype(np.complex64))
+      self.assertEqual(out.dtype, np.complex64)
+      self.assertTrue(np.all(np.abs(out - exact) <= 1e-5 * np.abs(exact)))
+    self.assertEqual(ufunc.exp(np.ones(3)).dtype, np.float64)
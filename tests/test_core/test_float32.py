@@ -0,0 +1,101 @@
+"""TestFloat32 tests the float32 kernels and their ufunc dispatch."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from random import random
+from unittest import TestCase
+
+import numpy as np
+
+from raining.core import exp32, log32, sin32, cos32, tanh32, arcsinh32
+from raining.core import erf32, erfinv32, expReduced, sin
+from raining.core import ufunc
+
+limit = 1e-06
+
+
+class TestFloat32(TestCase):
+  """TestFloat32 tests the float32 kernels and their ufunc dispatch."""
+
+  def setUp(self) -> None:
+    """Sets up the values"""
+    self.values = [np.float32(-10 + 20 * random()) for _ in range(64)]
+
+  def _assertClose(self, left: float, right: float) -> None:
+    """Asserts relative closeness at float32 accuracy."""
+    lim = limit * max(abs(right), 1e-30)
+    self.assertAlmostEqual(float(left), right, delta=lim)
+
+  def test_kernels(self) -> None:
+    """Testing the float32 kernels against the math module."""
+    for value in self.values:
+      x = float(value)
+      self.assertIsInstance(exp32(value), float)
+      self._assertClose(exp32(value), math.exp(x))
+      self._assertClose(log32(abs(value)), math.log(abs(x)))
+      self.assertAlmostEqual(sin32(value), math.sin(x), delta=limit)
+      self.assertAlmostEqual(cos32(value), math.cos(x), delta=limit)
+      self._assertClose(tanh32(value), math.tanh(x))
+      self._assertClose(arcsinh32(value), math.asinh(x))
+      self._assertClose(erf32(value / 4), math.erf(x / 4))
+      self._assertClose(erf32(erfinv32(value / 11)), x / 11)
+
+  def test_edges(self) -> None:
+    """Testing infinities and invalid arguments."""
+    f = np.float32
+    self.assertEqual(exp32(f(100)), float('inf'))
+    self.assertEqual(exp32(f(-100)), 0)
+    self.assertEqual(log32(f(0)), -float('inf'))
+    self.assertNotEqual(log32(f(-1)), log32(f(-1)))
+    self.assertEqual(erfinv32(f(1)), float('inf'))
+    self.assertEqual(erf32(f(5)), 1)
+
+  def test_ufunc(self) -> None:
+    """Testing that the ufuncs select the kernel by dtype."""
+    x64 = np.linspace(-3, 3, 101)
+    x32 = x64.astype(np.float32)
+    self.assertEqual(ufunc.exp(x32).dtype, np.float32)
+    self.assertEqual(ufunc.exp(x64).dtype, np.float64)
+    for (value, out) in zip(x32, ufunc.sin(x32)):
+      self.assertEqual(out, sin32(value))
+    for (value, out) in zip(x64, ufunc.sin(x64)):
+      self.assertEqual(out, sin(value))
+    self.assertEqual(ufunc.exp(x64)[7], expReduced(x64[7]))
+    with self.assertRaises(AttributeError):
+      getattr(ufunc, 'notAFunction')
+
+  def test_dtypes(self) -> None:
+    """Testing that the real and complex loops agree where the float64
+    kernels of 'raining.core' overflow."""
+    x = np.array([-40., 40.])
+    cases = [('exp', np.exp), ('sinh', np.sinh), ('cosh', np.cosh),
+             ('sech', lambda t: 1 / np.cosh(t)),
+             ('csch', lambda t: 1 / np.sinh(t))]
+    for (name, reference) in cases:
+      exact = reference(x)
+      out64 = getattr(ufunc, name)(x)
+      out32 = getattr(ufunc, name)(x.astype(np.float32))
+      self.assertLess(np.max(np.abs(out64 / exact - 1)), 1e-09, name)
+      self.assertLess(np.max(np.abs(out32 / exact - 1)), 1e-06, name)
+      if name in ['exp', 'sinh', 'cosh']:
+        outComplex = getattr(ufunc, name)(x.astype(complex))
+        self.assertLess(np.max(np.abs(outComplex / exact - 1)), 1e-09, name)
+    self.assertEqual(ufunc.csch(0.), float('inf'))
+
+  def test_ulp(self) -> None:
+    """Testing the inverse hyperbolic functions in units in the last
+    place, including arguments where their logarithm nears 1."""
+    cases = [('arcsinh', np.arcsinh, -100., 100.),
+             ('arccosh', np.arccosh, 1., 100.),
+             ('arccoth', lambda t: np.arctanh(1 / t), 1.001, 100.),
+             ('arcsech', lambda t: np.arccosh(1 / t), 0.001, 0.999)]
+    for (name, reference, lo, hi) in cases:
+      x = np.linspace(lo, hi, 20001).astype(np.float32)
+      exact = reference(x.astype(np.float64))
+      out = getattr(ufunc, name)(x).astype(np.float64)
+      ulp = np.spacing(np.abs(exact).astype(np.float32)).astype(np.float64)
+      self.assertLessEqual(np.max(np.abs(out - exact) / ulp), 8, name)
+    self.assertEqual(ufunc.arccoth(np.float32(1)), float('inf'))
+
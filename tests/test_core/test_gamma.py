@@ -0,0 +1,107 @@
+"""TestGamma tests the gamma family of special functions."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from unittest import TestCase
+
+import numpy as np
+
+from raining.core import gamma, lgamma, digamma, beta
+from raining.core import gammainc, gammaincc, betainc
+from raining.core import ufunc
+
+eulerGamma = 0.5772156649015329
+
+
+class TestGamma(TestCase):
+  """TestGamma tests the gamma family of special functions."""
+
+  def setUp(self) -> None:
+    """Sets up the values"""
+    self.values = [0.1 * i + 0.05 for i in range(-50, 1000)]
+
+  def test_gamma(self) -> None:
+    """Testing gamma and lgamma against the math module."""
+    for x in self.values:
+      self.assertAlmostEqual(gamma(x) / math.gamma(x), 1, delta=1e-13)
+      lim = 1e-14 * max(1., abs(math.lgamma(x)))
+      self.assertAlmostEqual(lgamma(x), math.lgamma(x), delta=lim)
+    self.assertTrue(math.isnan(gamma(-2.)))
+    self.assertEqual(lgamma(0.), math.inf)
+    self.assertEqual(gamma(200.), math.inf)
+
+  def test_digamma(self) -> None:
+    """Testing digamma at known values and by its recurrence."""
+    self.assertAlmostEqual(digamma(1.), -eulerGamma, delta=1e-15)
+    self.assertAlmostEqual(digamma(0.5), -eulerGamma - 2 * math.log(2),
+                           delta=1e-15)
+    for x in self.values:
+      if x > 0:
+        self.assertAlmostEqual(digamma(x + 1) - digamma(x), 1 / x,
+                               delta=1e-13 * max(1., 1 / x))
+      else:
+        reflected = digamma(1 - x) - math.pi / math.tan(math.pi * x)
+        self.assertAlmostEqual(digamma(x), reflected, delta=1e-12)
+
+  def test_beta(self) -> None:
+    """Testing beta against gamma."""
+    self.assertAlmostEqual(beta(2., 3.), 1 / 12, delta=1e-16)
+    for (a, b) in [(0.5, 0.5), (3.5, 7.25), (150., 40.)]:
+      expected = math.exp(math.lgamma(a) + math.lgamma(b)
+                          - math.lgamma(a + b))
+      self.assertAlmostEqual(beta(a, b) / expected, 1, delta=1e-12)
+    self.assertTrue(math.isnan(beta(-1., 2.)))
+
+  def test_gammainc(self) -> None:
+    """Testing the incomplete gamma functions at closed forms."""
+    for x in [0.01, 0.5, 1., 3., 10., 40.]:
+      self.assertAlmostEqual(gammainc(1., x), -math.expm1(-x), delta=1e-15)
+      self.assertAlmostEqual(gammaincc(1., x) / math.exp(-x), 1,
+                             delta=1e-13)
+      self.assertAlmostEqual(gammainc(0.5, x), math.erf(x ** 0.5),
+                             delta=1e-15)
+      self.assertAlmostEqual(gammaincc(0.5, x) / math.erfc(x ** 0.5), 1,
+                             delta=1e-12)
+    for a in [0.3, 2.5, 30., 1e4]:
+      for x in [0.1 * a, a, 2 * a]:
+        self.assertAlmostEqual(gammainc(a, x) + gammaincc(a, x), 1,
+                               delta=1e-14)
+    self.assertEqual(gammainc(2., 0.), 0.)
+    self.assertTrue(math.isnan(gammainc(-1., 2.)))
+
+  def test_betainc(self) -> None:
+    """Testing the incomplete beta function at closed forms and by its
+    symmetry."""
+    for x in [0.01, 0.3, 0.5, 0.8, 0.99]:
+      self.assertAlmostEqual(betainc(1., 1., x), x, delta=1e-15)
+      self.assertAlmostEqual(betainc(3., 1., x), x ** 3, delta=1e-15)
+      expected = 2 / math.pi * math.asin(x ** 0.5)
+      self.assertAlmostEqual(betainc(0.5, 0.5, x), expected, delta=1e-14)
+      for (a, b) in [(2., 5.), (0.7, 40.), (50., 60.)]:
+        self.assertAlmostEqual(betainc(a, b, x), 1 - betainc(b, a, 1 - x),
+                               delta=1e-13)
+    self.assertTrue(math.isnan(betainc(1., 1., 2.)))
+
+  def test_studentT(self) -> None:
+    """Testing the Student t CDF with two degrees of freedom as an
+    incomplete beta function."""
+    for t in [0.1, 1., 3., 20.]:
+      cdf = 1 - 0.5 * betainc(1., 0.5, 2 / (2 + t * t))
+      expected = 0.5 + t / (2 * (2 + t * t) ** 0.5)
+      self.assertAlmostEqual(cdf, expected, delta=1e-14)
+
+  def test_ufunc(self) -> None:
+    """Testing the ufunc forms of the gamma family."""
+    x = np.linspace(0.5, 20., 64)
+    self.assertTrue(np.allclose(ufunc.gamma(x),
+                                [math.gamma(v) for v in x], rtol=1e-13))
+    out32 = ufunc.lgamma(x.astype(np.float32))
+    self.assertEqual(out32.dtype, np.float32)
+    out = ufunc.betainc(2., 3., np.linspace(0., 1., 11))
+    self.assertEqual(out[0], 0.)
+    self.assertEqual(out[-1], 1.)
+    out = ufunc.gammainc(x[:, None], x[None, :])
+    self.assertEqual(out.shape, (64, 64))
+    self.assertIn('digamma', dir(ufunc))
@@ -27,3 +27,14 @@ class TestLog(TestCase):
       right = log(value)
       limit = 1e-03
       self.assertAlmostEqual(left, right, delta=limit)
+
+  def test_edges(self) -> None:
+    """Testing subnormal arguments and arguments near 1."""
+    for value in [5e-324, 1e-310, 2.2e-308, 1.7e308]:
+      self.assertAlmostEqual(log(value), math.log(value),
+                             delta=1e-14 * abs(math.log(value)))
+    for delta in [1e-12, -1e-9, 5e-5, -1.2e-4, 1e-3]:
+      left, right = log(1 + delta), math.log(1 + delta)
+      self.assertAlmostEqual(left, right, delta=1e-14 * abs(right))
+    self.assertEqual(log(1.), 0.)
+    self.assertTrue(math.isnan(log(float('nan'))))
@@ -0,0 +1,77 @@
+"""TestPow tests the pow and ipow kernels and their ufuncs."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from decimal import Decimal, localcontext
+from unittest import TestCase
+
+import numpy as np
+
+from raining.core import pow, ipow
+from raining.core import ufunc
+
+
+class TestPow(TestCase):
+  """TestPow tests the pow and ipow kernels and their ufuncs."""
+
+  def test_ipow(self) -> None:
+    """Testing integer powers"""
+    for x in [0.5, 1.5, -2., 3.]:
+      for n in range(-8, 9):
+        self.assertAlmostEqual(ipow(x, n), x ** n, delta=1e-12 * abs(x ** n))
+    self.assertEqual(ipow(2., 10), 1024.)
+    self.assertEqual(ipow(0., 0), 1.)
+
+  def test_pow(self) -> None:
+    """Testing real powers"""
+    for x in np.linspace(0.01, 50., 41):
+      for y in np.linspace(-7.3, 7.3, 23):
+        self.assertLessEqual(abs(pow(x, y) - x ** y), 1e-8 * x ** y)
+    self.assertEqual(pow(-3., 3.), -27.)
+    self.assertTrue(math.isnan(pow(-3., 0.5)))
+    self.assertTrue(math.isnan(pow(float('nan'), 2.)))
+    self.assertEqual(pow(0., 0.5), 0.)
+    self.assertEqual(pow(0., -0.5), float('inf'))
+    self.assertEqual(pow(10., 400.5), float('inf'))
+    self.assertEqual(pow(10., -400.5), 0.)
+    self.assertEqual(pow(0., -2.), float('inf'))
+    self.assertEqual(ipow(0., -3), float('inf'))
+    self.assertEqual(pow(1., float('inf')), 1.)
+    self.assertEqual(pow(float('nan'), 0.), 1.)
+
+  def test_edges(self) -> None:
+    """Testing bases near 1 and subnormal bases"""
+    for (x, y) in [(1.0001, 1000.5), (1.00005, 0.5), (0.99999, -2e4 - .5)]:
+      self.assertLessEqual(abs(pow(x, y) - x ** y), 1e-8 * x ** y)
+    self.assertLessEqual(abs(pow(1e-310, 0.5) - 1e-155), 1e-8 * 1e-155)
+    out = ufunc.pow(np.array([0., 1., 1e-310]), np.array([-2., 3., 0.5]))
+    self.assertEqual(out[0], float('inf'))
+    self.assertEqual(out[1], 1.)
+
+  def test_largeIntegers(self) -> None:
+    """Testing integer exponents too large for binary exponentiation"""
+    cases = [(1 + 1e-15, 1e15), (1.0000001, 1e9), (1.5, 1000.),
+             (0.999, -1e5), (3., 65.)]
+    with localcontext() as context:
+      context.prec = 40
+      for (x, y) in cases:
+        exact = float(Decimal(x) ** Decimal(y))
+        self.assertLessEqual(abs(pow(x, y) - exact), 1e-9 * exact)
+    self.assertAlmostEqual(pow(-2., 101.), -2. ** 101, delta=1e-9 * 2. ** 101)
+    self.assertAlmostEqual(pow(-2., 100.), 2. ** 100, delta=1e-9 * 2. ** 100)
+    self.assertTrue(math.isnan(pow(-2., 100.5)))
+    self.assertEqual(pow(-1., 1e20), 1.)
+    self.assertEqual(pow(-2., float('inf')), float('inf'))
+
+  def test_ufunc(self) -> None:
+    """Testing the array forms"""
+    x = np.linspace(0.1, 10., 64)
+    out = ufunc.pow(x, 2.5)
+    self.assertEqual(out.dtype, np.float64)
+    self.assertTrue(np.allclose(out, x ** 2.5, rtol=1e-8))
+    out = ufunc.pow(x.astype(np.float32), np.float32(2.5))
+    self.assertEqual(out.dtype, np.float32)
+    n = np.arange(-4, 4)
+    self.assertTrue(np.allclose(ufunc.ipow(2., n), 2. ** n.astype(float)))
@@ -0,0 +1,116 @@
+"""TestAggregate tests the compensated aggregation kernels."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from fractions import Fraction
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+
+from raining._aggregate import _columns, _fsumKernel, _weightedMeanKernel
+from raining._aggregate import _dotKernel, _prodKernel, weightedMean, dot
+from raining._aggregate import fsum, mean, prod
+
+
+class TestAggregate(TestCase):
+  """TestAggregate tests the compensated aggregation kernels."""
+
+  def setUp(self) -> None:
+    """Sets up ill conditioned values"""
+    rng = np.random.default_rng(6)
+    self.x = rng.standard_normal(10000) * 10.0 ** rng.integers(-8, 9, 10000)
+    self.y = rng.standard_normal(10000)
+    self.stdDev = rng.random(10000)
+
+  def test_columns(self) -> None:
+    """Testing the conversion of the supported inputs."""
+    values = [SimpleNamespace(expVal=1., stdDev=0.5), 2.]
+    expVal, stdDev = _columns(values)
+    self.assertEqual(list(expVal), [1., 2.])
+    self.assertEqual(list(stdDev), [0.5, 0.])
+    expVal, stdDev = _columns(np.ones(3), 0.1)
+    self.assertEqual(list(stdDev), [0.1] * 3)
+    self.assertFalse(np.any(_columns(np.ones(3))[1]))
+    expVal, stdDev = _columns(np.array([[1., .1], [2., .2]]))
+    self.assertEqual(list(expVal), [1., 2.])
+    self.assertEqual(list(stdDev), [.1, .2])
+    expVal, stdDev = _columns([(1., .1), 2., np.array([3., .3])])
+    self.assertEqual(list(expVal), [1., 2., 3.])
+    self.assertEqual(list(stdDev), [.1, 0., .3])
+    self.assertEqual(_columns([])[0].size, 0)
+    for bad in [np.ones((3, 3)), np.ones((2, 2, 2)), [(1., 2., 3.)]]:
+      with self.assertRaises(ValueError):
+        _columns(bad)
+
+  def test_fsum(self) -> None:
+    """Testing that the sum is as accurate as math.fsum."""
+    expVal, stdDev = _fsumKernel(self.x, self.stdDev)
+    self.assertEqual(expVal, math.fsum(self.x))
+    self.assertAlmostEqual(stdDev, math.fsum(self.stdDev ** 2) ** 0.5)
+    cancelling = np.array([1e16, 1., -1e16])
+    self.assertEqual(_fsumKernel(cancelling, np.zeros(3))[0], 1.)
+
+  def test_weightedMean(self) -> None:
+    """Testing the inverse variance weighted mean."""
+    expVal, stdDev = _weightedMeanKernel(np.array([1., 3.]),
+                                         np.array([1., 1.]))
+    self.assertAlmostEqual(expVal, 2.)
+    self.assertAlmostEqual(stdDev, 0.5 ** 0.5)
+    expVal, stdDev = _weightedMeanKernel(np.array([1., 3.]),
+                                         np.array([1., 2.]))
+    self.assertAlmostEqual(expVal, (1 + 3 / 4) / (1 + 1 / 4))
+    with self.assertRaises(ValueError):
+      weightedMean([1., 2.], [1., 0.])
+
+  def test_dot(self) -> None:
+    """Testing the dot product against exact rational arithmetic."""
+    exact = sum(Fraction(a) * Fraction(b) for (a, b) in zip(self.x, self.y))
+    zeros = np.zeros_like(self.x)
+    expVal, stdDev = _dotKernel(self.x, zeros, self.y, zeros)
+    self.assertEqual(expVal, float(exact))
+    self.assertEqual(stdDev, 0.)
+    _, stdDev = _dotKernel(np.array([2.]), np.array([0.1]),
+                           np.array([3.]), np.array([0.2]))
+    self.assertAlmostEqual(stdDev, (0.3 ** 2 + 0.4 ** 2) ** 0.5)
+    with self.assertRaises(ValueError):
+      dot([1., 2.], [1.])
+    with self.assertRaises(ValueError):
+      dot(np.ones(2), np.ones(3), 0.1, 0.2)
+
+  def test_prod(self) -> None:
+    """Testing the product and its propagated deviation."""
+    expVal, stdDev = _prodKernel(np.array([2., 3., 4.]),
+                                 np.array([0.2, 0., 0.4]))
+    self.assertEqual(expVal, 24.)
+    self.assertAlmostEqual(stdDev, 24 * (0.1 ** 2 + 0.1 ** 2) ** 0.5)
+    expVal, stdDev = _prodKernel(np.array([2., 0., 4.]),
+                                 np.array([0.2, 0.5, 0.4]))
+    self.assertEqual((expVal, stdDev), (0., 4.))
+    values = np.full(1000, 1 + 2 ** -30)
+    expVal, _ = _prodKernel(values, np.zeros(1000))
+    exact = Fraction(1 + 2 ** -30) ** 1000
+    self.assertEqual(expVal, float(exact))
+
+  def test_public(self) -> None:
+    """Testing that the public functions return (expVal, stdDev) pairs."""
+    values = [SimpleNamespace(expVal=2., stdDev=0.3), (4., 0.4)]
+    self.assertEqual(fsum(values), (6., 0.5))
+    self.assertEqual(mean(values), (3., 0.25))
+    self.assertEqual(fsum(np.array([1e16, 1., -1e16]), 0.), (1., 0.))
+    expVal, stdDev = weightedMean(np.array([1., 3.]), np.array([1., 1.]))
+    self.assertAlmostEqual(expVal, 2.)
+    self.assertAlmostEqual(stdDev, 0.5 ** 0.5)
+    expVal, stdDev = dot([(2., 0.1)], [(3., 0.2)])
+    self.assertEqual(expVal, 6.)
+    self.assertAlmostEqual(stdDev, 0.5)
+    expVal, stdDev = prod(np.array([[2., 0.2], [3., 0.3]]))
+    self.assertEqual(expVal, 6.)
+    self.assertAlmostEqual(stdDev, 6 * 0.02 ** 0.5)
+    for result in [fsum(values), mean(values), prod(values)]:
+      self.assertIsInstance(result, tuple)
+      self.assertTrue(all(type(part) is float for part in result))
+    with self.assertRaises(ValueError):
+      mean([])
@@ -0,0 +1,115 @@
+"""TestCache tests the memoizing evaluation cache."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from unittest import TestCase
+
+import numpy as np
+
+from raining._cache import EvaluationCache, memoize
+from raining.stat import EmpiricalDistribution
+
+
+class _Counter:
+  """Vectorized function counting its calls and values"""
+
+  def __init__(self) -> None:
+    self.calls, self.values = 0, 0
+
+  def __call__(self, x: np.ndarray, y: np.ndarray = None) -> np.ndarray:
+    self.calls += 1
+    self.values += np.size(x)
+    return np.sqrt(x) if y is None else np.hypot(x, y)
+
+
+class TestCache(TestCase):
+  """TestCache tests the memoizing evaluation cache."""
+
+  def test_get(self) -> None:
+    """Testing single values and the counters"""
+    cache = EvaluationCache()
+    counter = _Counter()
+    self.assertEqual(cache.get(counter, 4.), 2.)
+    self.assertEqual(cache.get(counter, 4), 2.)
+    self.assertEqual((cache.hits, cache.misses, counter.calls), (1, 1, 1))
+    self.assertEqual(cache.get(counter, 3., 4.), 5.)
+    self.assertAlmostEqual(cache.hitRate(), 1 / 3)
+
+  def test_lookup(self) -> None:
+    """Testing that bulk lookups compute only the misses"""
+    cache = EvaluationCache()
+    counter = _Counter()
+    grid = np.tile(np.linspace(0., 4., 5), (3, 2))
+    out = cache.lookup(counter, grid)
+    self.assertEqual(out.shape, grid.shape)
+    self.assertTrue(np.allclose(out, np.sqrt(grid)))
+    self.assertEqual((counter.calls, counter.values), (1, 5))
+    out = cache.lookup(counter, np.linspace(0., 8., 9))
+    self.assertTrue(np.allclose(out, np.sqrt(np.linspace(0., 8., 9))))
+    self.assertEqual((counter.calls, counter.values), (2, 9))
+    self.assertEqual((cache.hits, cache.misses), (5, 9))
+    x, y = np.array([3., 6.]), np.array([[4.], [8.]])
+    self.assertTrue(np.allclose(cache.lookup(counter, x, y), np.hypot(x, y)))
+
+  def test_keys(self) -> None:
+    """Testing that nan and signed zeros are keyed exactly"""
+    cache = EvaluationCache()
+    nan = float('nan')
+    for _ in range(5):
+      cache.lookup(np.copysign, np.array([nan, 1., -nan]), 1.)
+      cache.get(np.copysign, nan, 1.)
+    self.assertEqual(len(cache), 2)
+    self.assertEqual(cache.misses, 2)
+    out = cache.lookup(np.copysign, np.array([0., -0.]), -1.)
+    self.assertTrue(np.array_equal(np.signbit(out), [True, True]))
+    self.assertEqual(cache.get(np.copysign, 1., -0.), -1.)
+    self.assertEqual(cache.get(np.copysign, 1., 0.), 1.)
+
+  def test_eviction(self) -> None:
+    """Testing the least recently used eviction"""
+    cache = EvaluationCache(3)
+    counter = _Counter()
+    for x in [1., 2., 3., 1., 4.]:
+      cache.get(counter, x)
+    self.assertEqual(len(cache), 3)
+    self.assertEqual(cache.evictions, 1)
+    cache.get(counter, 1.)
+    self.assertEqual(counter.calls, 4)
+    cache.get(counter, 2.)
+    self.assertEqual(counter.calls, 5)
+    cache.clear()
+    self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+    with self.assertRaises(ValueError):
+      EvaluationCache(0)
+
+  def test_memoize(self) -> None:
+    """Testing memoized ufuncs and distribution functions"""
+    log = memoize('log')
+    x = np.repeat([0.5, 2., 8.], 4)
+    self.assertTrue(np.allclose(log(x), np.log(x)))
+    self.assertAlmostEqual(log(2.), math.log(2.))
+    self.assertEqual((log.cache.hits, log.cache.misses), (1, 3))
+    distribution = EmpiricalDistribution(np.arange(100.))
+    cdf = memoize(distribution.cdf, log.cache)
+    levels = np.linspace(0., 99., 12)
+    self.assertTrue(np.allclose(cdf(levels), distribution.cdf(levels)))
+    self.assertEqual(len(log.cache), 15)
+    with self.assertRaises(ValueError):
+      memoize('notAUfunc')
+
+  def test_constants(self) -> None:
+    """Testing the memoized distribution constants"""
+    distribution = EmpiricalDistribution(np.arange(100.))
+    p = np.linspace(0., 1., 11)
+    right = distribution.icdf(p)
+    levels = distribution.constants['levels']
+    self.assertTrue(np.array_equal(distribution.icdf(p), right))
+    self.assertIs(distribution.constants['levels'], levels)
+    distribution.pdf(50.)
+    self.assertTrue(distribution.gridPoints.size)
+    distribution.forget()
+    self.assertFalse(distribution.constants)
+    self.assertFalse(distribution.gridPoints.size)
+    self.assertGreater(distribution.pdf(50.), 0.)
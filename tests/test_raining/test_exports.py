@@ -0,0 +1,21 @@
+"""TestExports tests the public namespace of 'raining'."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from unittest import TestCase
+
+import raining
+from raining._cache import memoize
+from raining._interval import Interval
+
+
+class TestExports(TestCase):
+  """TestExports tests the public namespace of 'raining'."""
+
+  def test_exports(self) -> None:
+    """Testing that the public names are exported."""
+    for name in raining.__all__:
+      self.assertTrue(hasattr(raining, name), name)
+    self.assertIs(raining.Interval, Interval)
+    self.assertIs(raining.memoize, memoize)
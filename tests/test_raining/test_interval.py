@@ -0,0 +1,105 @@
+"""TestInterval tests the outward rounded interval arithmetic."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+
+from raining._interval import Interval, IntervalArray
+
+
+class TestInterval(TestCase):
+  """TestInterval tests the outward rounded interval arithmetic."""
+
+  def setUp(self) -> None:
+    """Sets up random intervals and points inside them"""
+    rng = np.random.default_rng(5)
+    lo = rng.uniform(-10, 10, (2, 2000))
+    hi = lo + rng.exponential(1, (2, 2000))
+    self.a = IntervalArray(lo[0], hi[0])
+    self.b = IntervalArray(lo[1], hi[1])
+    t = rng.random((2, 16, 1))
+    self.x = lo[0] + t[0] * (hi[0] - lo[0])
+    self.y = lo[1] + t[1] * (hi[1] - lo[1])
+
+  def assertEncloses(self, out: IntervalArray, values: np.ndarray) -> None:
+    """Asserts that every row of values lies in the intervals."""
+    for row in values:
+      self.assertTrue(np.all(out.contains(row)))
+
+  def test_validation(self) -> None:
+    """Testing that reversed bounds are rejected."""
+    with self.assertRaises(ValueError):
+      Interval(2., 1.)
+    with self.assertRaises(ValueError):
+      IntervalArray([0., 2.], [1., 1.])
+
+  def test_arithmetic(self) -> None:
+    """Testing that the operators enclose all pointwise results."""
+    self.assertEncloses(self.a + self.b, self.x + self.y)
+    self.assertEncloses(self.a - self.b, self.x - self.y)
+    self.assertEncloses(self.a * self.b, self.x * self.y)
+    self.assertEncloses(self.a / self.b, self.x / self.y)
+    self.assertEncloses(2 - self.a, 2 - self.x)
+    self.assertEncloses(-self.a, -self.x)
+
+  def test_outward(self) -> None:
+    """Testing that inexact results are rounded outward."""
+    out = Interval(0.1) + Interval(0.2)
+    self.assertLess(out.lo, 0.1 + 0.2)
+    self.assertGreater(out.hi, 0.1 + 0.2)
+    self.assertIn(0.3, out)
+    self.assertLessEqual(out.width(), 4 * math.ulp(0.3))
+
+  def test_division(self) -> None:
+    """Testing division by intervals containing zero."""
+    out = Interval(1., 2.) / Interval(-1., 1.)
+    self.assertEqual(out.lo, -math.inf)
+    self.assertEqual(out.hi, math.inf)
+    out = Interval(1., 2.) / Interval(2., 4.)
+    self.assertIn(0.25, out)
+    self.assertIn(1., out)
+
+  def test_functions(self) -> None:
+    """Testing that the function enclosures contain all values."""
+    self.assertEncloses(self.a.exp(), np.exp(self.x))
+    self.assertEncloses(self.a.sin(), np.sin(self.x))
+    self.assertEncloses(self.a.cos(), np.cos(self.x))
+    erf = np.vectorize(math.erf)
+    self.assertEncloses(self.a.erf(), erf(self.x))
+    positive = self.a * self.a + 1e-3
+    self.assertEncloses(positive.log(), np.log(self.x * self.x + 1e-3))
+
+  def test_periodic(self) -> None:
+    """Testing the segment awareness of sin and cos."""
+    out = Interval(0., 3.).sin()
+    self.assertEqual(out.hi, 1.)
+    self.assertGreater(out.lo, -1e-300)
+    out = Interval(1., 2.).cos()
+    self.assertLessEqual(out.lo, math.cos(2.))
+    self.assertGreaterEqual(out.hi, math.cos(1.))
+    self.assertLess(out.hi, 1.)
+    out = Interval(0., 7.).cos()
+    self.assertEqual((out.lo, out.hi), (-1., 1.))
+
+  def test_log(self) -> None:
+    """Testing log at and below zero."""
+    out = Interval(0., 1.).log()
+    self.assertEqual(out.lo, -math.inf)
+    out = Interval(-2., -1.).log()
+    self.assertTrue(math.isnan(out.lo))
+
+  def test_fromRealNumber(self) -> None:
+    """Testing the intervals around RealNumbers."""
+    number = SimpleNamespace(expVal=1., stdDev=0.1)
+    out = Interval.fromRealNumber(number, 2.)
+    self.assertIn(0.8, out)
+    self.assertIn(1.2, out)
+    out = IntervalArray.fromRealNumbers([1., 2.], [0.1, 0.2])
+    self.assertIsInstance(out[1], Interval)
+    self.assertIn(2.6, out[1])
+    self.assertEqual(len(out), 2)
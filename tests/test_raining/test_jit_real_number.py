@@ -0,0 +1,97 @@
+"""TestJitRealNumber tests the numba counterpart of RealNumber."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+from numba import njit
+
+from raining._jit_real_number import JitRealNumber, toJit, fromJit
+
+
+@njit
+def _model(a: JitRealNumber, b: JitRealNumber) -> JitRealNumber:
+  """Compiled model mixing numbers and JitRealNumbers"""
+  c = 2. * a + b - 1
+  return -(c / b * a).exp() + 1. / c
+
+
+@njit
+def _rolls(a: JitRealNumber, n: int) -> np.ndarray:
+  """Compiled sampling loop"""
+  out = np.empty(n)
+  for i in range(n):
+    out[i] = a.roll()
+  return out
+
+
+@njit
+def _divide(a: JitRealNumber, b: float) -> JitRealNumber:
+  """Compiled division"""
+  return a / b
+
+
+class TestJitRealNumber(TestCase):
+  """TestJitRealNumber tests the numba counterpart of RealNumber."""
+
+  def setUp(self) -> None:
+    """Sets up the values"""
+    self.a = JitRealNumber(1., 0.1)
+    self.b = JitRealNumber(2., 0.2)
+
+  def test_model(self) -> None:
+    """Testing arithmetic inside compiled code."""
+    out = _model(self.a, self.b)
+    self.assertAlmostEqual(out.expVal, -math.exp(1.5) + 1 / 3, delta=1e-6)
+    self.assertGreater(out.stdDev, 0)
+
+  def test_propagation(self) -> None:
+    """Testing the propagation rules of the operators."""
+    out = njit(lambda a, b: a * b)(self.a, self.b)
+    self.assertAlmostEqual(out.expVal, 2.)
+    self.assertAlmostEqual(out.stdDev, (0.2 ** 2 + 0.2 ** 2) ** 0.5)
+    out = njit(lambda a, b: a + b)(self.a, self.b)
+    self.assertAlmostEqual(out.stdDev, (0.1 ** 2 + 0.2 ** 2) ** 0.5)
+    out = njit(lambda a: 3 - a)(self.a)
+    self.assertEqual((out.expVal, out.stdDev), (2., 0.1))
+    zero = JitRealNumber(0., 0.1)
+    out = njit(lambda a, b: a * b)(zero, self.b)
+    self.assertAlmostEqual(out.stdDev, 0.2)
+
+  def test_functions(self) -> None:
+    """Testing the first order propagation through the functions."""
+    x = JitRealNumber(0.3, 0.01)
+    self.assertAlmostEqual(x.exp().stdDev, 0.01 * math.exp(0.3), delta=1e-6)
+    self.assertAlmostEqual(x.log().stdDev, 0.01 / 0.3, delta=1e-6)
+    self.assertAlmostEqual(x.sin().stdDev, 0.01 * math.cos(0.3), delta=1e-6)
+    self.assertAlmostEqual(x.erf().expVal, math.erf(0.3), delta=1e-6)
+    self.assertAlmostEqual(x.tanh().expVal, math.tanh(0.3), delta=1e-6)
+    out = JitRealNumber(40., 0.1).exp()
+    self.assertAlmostEqual(out.expVal / math.exp(40), 1, delta=1e-9)
+    self.assertAlmostEqual(out.stdDev / math.exp(40), 0.1, delta=1e-9)
+    out = JitRealNumber(6., 0.1).erf()
+    derivative = 2 / math.pi ** 0.5 * math.exp(-36)
+    self.assertAlmostEqual(out.stdDev / derivative, 0.1, delta=1e-9)
+
+  def test_sampling(self) -> None:
+    """Testing sampling inside compiled code."""
+    values = _rolls(self.b, 20000)
+    self.assertAlmostEqual(values.mean(), 2., delta=0.01)
+    self.assertAlmostEqual(values.std(), 0.2, delta=0.01)
+    self.assertEqual(self.b.sample(7).shape, (7,))
+
+  def test_division(self) -> None:
+    """Testing that division by zero raises."""
+    with self.assertRaises(ZeroDivisionError):
+      _divide(self.a, 0.)
+
+  def test_conversion(self) -> None:
+    """Testing conversion from objects with expVal and stdDev."""
+    out = toJit(SimpleNamespace(expVal=3., stdDev=0.5))
+    self.assertIsInstance(out, JitRealNumber)
+    self.assertEqual((out.expVal, out.stdDev), (3., 0.5))
+    self.assertEqual(fromJit(out), (3., 0.5))
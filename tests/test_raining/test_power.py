@@ -0,0 +1,73 @@
+"""TestPower tests the propagation of uncertainty through powers."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+from numba import njit
+
+from raining._jit_real_number import JitRealNumber, powerKernel
+from raining._power import power
+
+
+@njit
+def _square(a: JitRealNumber) -> JitRealNumber:
+  """Squares in compiled code"""
+  return a ** 2
+
+
+class TestPower(TestCase):
+  """TestPower tests the propagation of uncertainty through powers."""
+
+  def test_kernel(self) -> None:
+    """Testing the power kernel"""
+    expVal, stdDev = powerKernel(3., 0.1, 2., 0.)
+    self.assertAlmostEqual(expVal, 9.)
+    self.assertAlmostEqual(stdDev, 2 * 3. * 0.1)
+    expVal, stdDev = powerKernel(2., 0., 3., 0.1)
+    self.assertAlmostEqual(stdDev, 8. * math.log(2.) * 0.1, delta=1e-8)
+    expVal, stdDev = powerKernel(1.0001, 0., 2.5, 0.1)
+    right = 1.0001 ** 2.5 * math.log(1.0001) * 0.1
+    self.assertAlmostEqual(stdDev, right, delta=1e-8 * right)
+    expVal, stdDev = powerKernel(-2., 0.1, 3., 0.)
+    self.assertAlmostEqual(expVal, -8.)
+    self.assertAlmostEqual(stdDev, 3 * 4. * 0.1)
+
+  def test_jit(self) -> None:
+    """Testing ** on JitRealNumbers"""
+    out = _square(JitRealNumber(3., 0.1))
+    self.assertAlmostEqual(out.expVal, 9.)
+    self.assertAlmostEqual(out.stdDev, 0.6)
+
+  def test_batch(self) -> None:
+    """Testing the batch form"""
+    x = np.array([1., 2., 3.])
+    expVal, stdDev = power(x, 2, baseStdDev=0.1)
+    self.assertTrue(np.allclose(expVal, x ** 2))
+    self.assertTrue(np.allclose(stdDev, 2 * x * 0.1))
+    expVal, stdDev = power(2., x, exponentStdDev=x / 10)
+    self.assertTrue(np.allclose(stdDev, 2 ** x * math.log(2.) * x / 10))
+    base = [SimpleNamespace(expVal=3., stdDev=.1)]
+    expVal, stdDev = power(base, SimpleNamespace(expVal=2., stdDev=0.))
+    self.assertAlmostEqual(expVal[0], 9.)
+    self.assertAlmostEqual(stdDev[0], 0.6)
+    with self.assertRaises(ValueError):
+      power(x, np.ones(2))
+
+  def test_keywords(self) -> None:
+    """Testing that the standard deviations are keyword-only and checked"""
+    x = np.array([1., 2., 3.])
+    with self.assertRaises(TypeError):
+      power(x, 2, basestddev=0.1)
+    with self.assertRaises(TypeError):
+      power(x, 2, 0.1)
+    expVal, stdDev = power([(3., 0.1)], 2.)
+    self.assertAlmostEqual(stdDev[0], 0.6)
+    with self.assertRaises(ValueError):
+      power([(3., 0.1)], 2., baseStdDev=0.2)
+    expVal, stdDev = power(3., 2., baseStdDev=0.1)
+    self.assertAlmostEqual(stdDev[0], 0.6)
@@ -0,0 +1,130 @@
+"""TestBatchService tests the collection of concurrent requests into
+batches."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+import numpy as np
+
+from raining.serve import BatchService
+
+
+def _sumProduct(a: np.ndarray, b: np.ndarray) -> tuple:
+  """Returns the sums and the products"""
+  return a + b, a * b
+
+
+def _fail(x: np.ndarray) -> np.ndarray:
+  """Raises an error"""
+  raise ValueError('Failed on %d values' % x.size)
+
+
+class TestBatchService(TestCase):
+  """TestBatchService tests the collection of concurrent requests into
+  batches."""
+
+  def test_batching(self) -> None:
+    """Testing that concurrent requests share batches"""
+    x = np.linspace(-3., 3., 50)
+
+    async def run() -> tuple:
+      """Runs the requests"""
+      async with BatchService(np.exp, maxDelay=0.05) as service:
+        out = await asyncio.gather(*[service.evaluate(v) for v in x])
+      return service, out
+
+    service, out = asyncio.run(run())
+    self.assertTrue(np.allclose(out, np.exp(x)))
+    self.assertEqual(service.requests, 50)
+    self.assertLess(service.batches, 50)
+    self.assertEqual(sum(m.size for m in service.metrics), 50)
+    for metrics in service.metrics:
+      self.assertGreaterEqual(metrics.latency, metrics.waitSeconds)
+
+  def test_arrays(self) -> None:
+    """Testing array requests and tuple outputs"""
+
+    async def run() -> list:
+      """Runs the requests"""
+      async with BatchService(_sumProduct) as service:
+        return await asyncio.gather(service.evaluate(np.arange(3.), 2.),
+                                    service.evaluate(1., 5.),
+                                    service.evaluate(np.ones(2), [3., 4.]))
+
+    (a, b), (c, d), (e, f) = asyncio.run(run())
+    self.assertTrue(np.array_equal(a, [2., 3., 4.]))
+    self.assertTrue(np.array_equal(b, [0., 2., 4.]))
+    self.assertEqual((c, d), (6., 5.))
+    self.assertTrue(np.array_equal(f, [3., 4.]))
+
+  def test_maxBatch(self) -> None:
+    """Testing the limit on the batch size"""
+
+    async def run() -> BatchService:
+      """Runs the requests"""
+      async with BatchService(np.sqrt, maxBatch=10) as service:
+        await asyncio.gather(*[service.evaluate(float(i))
+                               for i in range(35)])
+      return service
+
+    service = asyncio.run(run())
+    sizes = [metrics.size for metrics in service.metrics]
+    self.assertEqual(sum(sizes), 35)
+    self.assertLessEqual(max(sizes), 10)
+    self.assertGreater(max(m.queueDepth for m in service.metrics), 0)
+
+  def test_errors(self) -> None:
+    """Testing that errors reach every caller of the batch"""
+
+    async def run() -> tuple:
+      """Runs the requests"""
+      async with BatchService(_fail, maxDelay=0.05) as service:
+        out = await asyncio.gather(*[service.evaluate(1.) for _ in range(4)],
+                                   return_exceptions=True)
+        with self.assertRaises(TypeError):
+          await service.evaluate(1., 2.)
+      return service, out
+
+    service, out = asyncio.run(run())
+    for item in out:
+      self.assertIsInstance(item, ValueError)
+    self.assertTrue(all(metrics.failed for metrics in service.metrics))
+    with self.assertRaises(ValueError):
+      BatchService('notAUfunc')
+
+  def test_processPool(self) -> None:
+    """Testing a ufunc by name on a process pool"""
+    x = np.linspace(0.1, 2., 8)
+
+    async def run() -> list:
+      """Runs the requests"""
+      with ProcessPoolExecutor(max_workers=1) as pool:
+        async with BatchService('exp', executor=pool) as service:
+          return await asyncio.gather(service.evaluate(x[:4]),
+                                      service.evaluate(x[4:]))
+
+    out = asyncio.run(run())
+    self.assertTrue(np.allclose(np.concatenate(out), np.exp(x)))
+
+  def test_restart(self) -> None:
+    """Testing that a stopped service can be used again"""
+
+    async def run() -> tuple:
+      """Runs the requests"""
+      service = BatchService(np.exp)
+      async with service:
+        first = await service.evaluate(0.)
+      second = await service.evaluate(1.)
+      await service.stop()
+      async with service:
+        third = await service.evaluate(2.)
+      return first, second, third
+
+    self.assertTrue(np.allclose(asyncio.run(run()), np.exp([0., 1., 2.])))
+    with self.assertRaises(TypeError):
+      BatchService(np.exp, maxdelay=0.1)
+
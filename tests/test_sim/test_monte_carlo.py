@@ -0,0 +1,65 @@
+"""TestMonteCarlo tests the Monte Carlo driver."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+
+from raining.sim import monteCarlo, scalingEfficiency
+from raining.stat import EmpiricalDistribution
+
+
+def _model(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+  """Sum of the inputs"""
+  return x + y
+
+
+class TestMonteCarlo(TestCase):
+  """TestMonteCarlo tests the Monte Carlo driver."""
+
+  def setUp(self) -> None:
+    """Sets up the inputs"""
+    self.x = SimpleNamespace(expVal=1., stdDev=0.5)
+    rng = np.random.default_rng(2)
+    self.y = EmpiricalDistribution(2 + 1.2 * rng.standard_normal(100000))
+
+  def test_convergence(self) -> None:
+    """Testing that the run stops once the standard errors are small."""
+    result = monteCarlo(_model, [self.x, self.y], 1e-03, workers=1,
+                        batchSize=50000, seed=7)
+    self.assertTrue(result.converged)
+    self.assertLessEqual(result.meanError, 1e-03)
+    self.assertLessEqual(result.stdDevError, 1e-03)
+    self.assertAlmostEqual(result.mean, 3, delta=1e-02)
+    self.assertAlmostEqual(result.stdDev, 1.3, delta=1e-02)
+    self.assertAlmostEqual(result.quantile(0.5), 3, delta=2e-02)
+    self.assertGreater(result.samplesPerSecond(), 0)
+    self.assertIn('+/-', str(result))
+
+  def test_reproducible(self) -> None:
+    """Testing that the seed fixes the result for any number of
+    workers."""
+    kwargs = dict(batchSize=20000, seed=3, maxSamples=120000)
+    single = monteCarlo(_model, [self.x, 2.], 0., workers=1, **kwargs)
+    pooled = monteCarlo(_model, [self.x, 2.], 0., workers=2, **kwargs)
+    self.assertEqual(single.samples, 120000)
+    self.assertEqual(single.samples, pooled.samples)
+    self.assertAlmostEqual(single.mean, pooled.mean, delta=1e-12)
+    self.assertAlmostEqual(single.stdDev, pooled.stdDev, delta=1e-12)
+
+  def test_scaling(self) -> None:
+    """Testing the scaling report."""
+    report = scalingEfficiency(_model, [self.x, 2.], [1, 2], 40000,
+                               batchSize=10000)
+    self.assertEqual([entry[0] for entry in report], [1, 2])
+    self.assertAlmostEqual(report[0][2], 1.)
+
+  def test_badInput(self) -> None:
+    """Testing that unsupported inputs are rejected."""
+    with self.assertRaises(TypeError):
+      monteCarlo(_model, [self.x, 'y'], workers=1)
+    with self.assertRaises(TypeError):
+      monteCarlo(_model, [self.x, 2.], 0., workers=1, maxsamples=10)
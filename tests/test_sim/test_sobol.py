@@ -0,0 +1,72 @@
+"""TestSobol tests the Sobol sensitivity driver."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+
+from raining.sim import SobolResult, sobol
+from raining.stat import EmpiricalDistribution
+
+
+def _linear(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+  """Linear model without interactions"""
+  return x + y + z
+
+
+def _product(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+  """Model where the first two inputs act only through their product"""
+  return x * y + z
+
+
+class TestSobol(TestCase):
+  """TestSobol tests the Sobol sensitivity driver."""
+
+  def setUp(self) -> None:
+    """Sets up the inputs"""
+    rng = np.random.default_rng(4)
+    self.inputs = [SimpleNamespace(expVal=0., stdDev=1.),
+                   EmpiricalDistribution(2 * rng.standard_normal(200000)),
+                   SimpleNamespace(expVal=1., stdDev=1.)]
+
+  def test_linear(self) -> None:
+    """Testing that the indices of a linear model are the variance
+    shares of the inputs."""
+    result = sobol(_linear, self.inputs, 2 ** 15, workers=1, seed=3)
+    self.assertIsInstance(result, SobolResult)
+    expected = np.array([1., 4., 1.]) / 6
+    for estimate in [result.firstOrder, result.total]:
+      self.assertTrue(np.allclose(estimate, expected, atol=0.03))
+    for interval in [result.firstOrderInterval, result.totalInterval]:
+      self.assertEqual(interval.shape, (3, 2))
+      self.assertTrue(np.all(interval[:, 0] <= interval[:, 1]))
+    self.assertEqual(result.evaluations, 5 * 2 ** 15)
+
+  def test_interaction(self) -> None:
+    """Testing that interactions show in the total indices only."""
+    result = sobol(_product, self.inputs, 2 ** 15, workers=2, seed=3,
+                   batchSize=10000)
+    self.assertTrue(np.allclose(result.firstOrder, [0., 0., 0.2],
+                                atol=0.03))
+    self.assertTrue(np.allclose(result.total, [0.8, 0.8, 0.2], atol=0.03))
+    self.assertIn('input 2', str(result))
+
+  def test_reproducible(self) -> None:
+    """Testing that the seed fixes the result for any number of
+    workers."""
+    kwargs = dict(seed=5, batchSize=3000, bootstrap=10)
+    single = sobol(_product, self.inputs, 9000, workers=1, **kwargs)
+    pooled = sobol(_product, self.inputs, 9000, workers=2, **kwargs)
+    self.assertTrue(np.array_equal(single.total, pooled.total))
+    self.assertTrue(np.array_equal(single.totalInterval,
+                                   pooled.totalInterval))
+
+  def test_constant(self) -> None:
+    """Testing that a constant output is rejected."""
+    with self.assertRaises(ValueError):
+      sobol(_linear, [1., 2., 3.], 1000, workers=1)
+    with self.assertRaises(TypeError):
+      sobol(_linear, self.inputs, 1000, workers=1, batchsize=100)
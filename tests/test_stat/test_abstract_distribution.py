@@ -0,0 +1,124 @@
+"""TestAbstractDistribution tests the numerical cdf and icdf fallbacks."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from unittest import TestCase
+
+import numpy as np
+from worktoy.desc import AttriBox
+
+from raining.stat import AbstractDistribution
+
+
+class _Normal(AbstractDistribution):
+  """Normal distribution implementing only the pdf."""
+
+  mu = AttriBox[float](0.)
+  sigma = AttriBox[float](1.)
+
+  def pdf(self, x: float) -> float:
+    """Array friendly normal density."""
+    z = (x - self.mu) / self.sigma
+    return np.exp(-z ** 2 / 2) / (self.sigma * (2 * math.pi) ** 0.5)
+
+
+class _Laplace(AbstractDistribution):
+  """Laplace distribution with a pdf accepting floats only."""
+
+  def pdf(self, x: float) -> float:
+    """Float only Laplace density."""
+    return math.exp(-abs(x)) / 2
+
+
+class _Exponential(AbstractDistribution):
+  """Exponential distribution located away from its jump at 0."""
+
+  def pdf(self, x: float) -> float:
+    """Array friendly exponential density."""
+    x = np.asarray(x, dtype=float)
+    return np.where(x >= 0, np.exp(-np.maximum(x, 0)), 0.)
+
+  def location(self) -> float:
+    """Mean of the distribution."""
+    return 1.
+
+
+class _Uniform(AbstractDistribution):
+  """Uniform distribution on [0, 1] with a pdf accepting floats only."""
+
+  def pdf(self, x: float) -> float:
+    """Float only uniform density."""
+    return 1. if 0 <= x <= 1 else 0.
+
+  def location(self) -> float:
+    """Midpoint of the support."""
+    return 0.5
+
+  def scale(self) -> float:
+    """Width of the support."""
+    return 1.
+
+
+class TestAbstractDistribution(TestCase):
+  """TestAbstractDistribution tests the numerical cdf and icdf
+  fallbacks."""
+
+  def setUp(self) -> None:
+    """Sets up the distributions"""
+    self.normal = _Normal()
+    self.normal.mu = 3.
+    self.normal.sigma = 2.
+    self.laplace = _Laplace()
+    self.values = np.linspace(-5, 11, 33)
+
+  def test_cdf(self) -> None:
+    """Testing the cdf against the closed form normal cdf."""
+    left = self.normal.cdf(self.values)
+    for (value, cdf) in zip(self.values, left):
+      right = 0.5 * (1 + math.erf((value - 3) / (2 * 2 ** 0.5)))
+      self.assertAlmostEqual(cdf, right, delta=1e-09)
+    self.assertIsInstance(self.normal.cdf(3.), float)
+    self.assertAlmostEqual(self.normal.cdf(3.), 0.5, delta=1e-09)
+
+  def test_scalarPdf(self) -> None:
+    """Testing that a pdf accepting only floats is supported."""
+    for value in [-4., -0.5, 0.25, 3.]:
+      left = self.laplace.cdf(value)
+      right = math.exp(value) / 2 if value < 0 else 1 - math.exp(-value) / 2
+      self.assertAlmostEqual(left, right, delta=1e-09)
+
+  def test_icdf(self) -> None:
+    """Testing that icdf inverts cdf for whole arrays."""
+    p = np.linspace(0.001, 0.999, 57)
+    x = self.normal.icdf(p)
+    self.assertEqual(x.shape, p.shape)
+    for (left, right) in zip(self.normal.cdf(x), p):
+      self.assertAlmostEqual(left, right, delta=1e-09)
+    self.assertAlmostEqual(self.laplace.icdf(0.5), 0, delta=1e-09)
+
+  def test_jump(self) -> None:
+    """Testing the fallbacks for densities with jumps, which the nodes of
+    an interval may straddle."""
+    exponential, uniform = _Exponential(), _Uniform()
+    x = np.concatenate((np.linspace(-1, 6, 2001), [0.998195, 0.999]))
+    cdf = exponential.cdf(x)
+    expected = np.where(x >= 0, -np.expm1(-np.maximum(x, 0)), 0)
+    self.assertLess(np.abs(cdf - expected).max(), 1e-09)
+    self.assertTrue(np.all(np.diff(cdf[:-2]) >= 0))
+    x = np.linspace(-1, 2, 301)
+    cdf = uniform.cdf(x)
+    self.assertLess(np.abs(cdf - np.clip(x, 0, 1)).max(), 1e-09)
+    p = np.linspace(0.001, 0.999, 57)
+    x = exponential.icdf(p)
+    self.assertLess(np.abs(x + np.log1p(-p)).max(), 1e-09)
+    self.assertLess(np.abs(uniform.icdf(p) - p).max(), 1e-09)
+
+  def test_icdfEdges(self) -> None:
+    """Testing the icdf at and beyond the unit interval."""
+    x = self.normal.icdf(np.array([0., 1., -0.5, 1.5]))
+    self.assertEqual(x[0], -float('inf'))
+    self.assertEqual(x[1], float('inf'))
+    self.assertNotEqual(x[2], x[2])
+    self.assertNotEqual(x[3], x[3])
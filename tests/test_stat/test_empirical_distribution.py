@@ -0,0 +1,58 @@
+"""TestEmpiricalDistribution tests the sample based distribution."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from unittest import TestCase
+
+import numpy as np
+
+from raining.stat import EmpiricalDistribution
+
+
+class TestEmpiricalDistribution(TestCase):
+  """TestEmpiricalDistribution tests the sample based distribution."""
+
+  def setUp(self) -> None:
+    """Sets up the distributions"""
+    self.small = EmpiricalDistribution([3., 1., 2., 2.])
+    rng = np.random.default_rng(0)
+    self.normal = EmpiricalDistribution(rng.standard_normal(200000))
+
+  def test_cdf(self) -> None:
+    """Testing the cdf against the counted fractions."""
+    left = self.small.cdf(np.array([0., 1., 1.5, 2., 3., 4.]))
+    right = [0, 0.25, 0.25, 0.75, 1, 1]
+    for (a, b) in zip(left, right):
+      self.assertAlmostEqual(a, b)
+    self.assertIsInstance(self.small.cdf(2.), float)
+
+  def test_icdf(self) -> None:
+    """Testing that icdf returns the smallest sample reaching p."""
+    left = self.small.icdf(np.array([0.1, 0.25, 0.26, 0.75, 0.9, 1.]))
+    right = [1, 1, 2, 2, 3, 3]
+    for (a, b) in zip(left, right):
+      self.assertAlmostEqual(a, b)
+    self.assertNotEqual(self.small.icdf(1.5), self.small.icdf(1.5))
+
+  def test_roundTrip(self) -> None:
+    """Testing that icdf inverts cdf at every sample."""
+    for n in range(1, 200):
+      distribution = EmpiricalDistribution(np.arange(float(n)))
+      x = distribution.samples
+      self.assertTrue(np.array_equal(distribution.icdf(distribution.cdf(x)),
+                                     x))
+    distribution = EmpiricalDistribution(np.arange(25.))
+    self.assertEqual(distribution.icdf(distribution.cdf(6.)), 6.)
+
+  def test_pdf(self) -> None:
+    """Testing the kernel density estimate against the normal density."""
+    x = np.linspace(-3, 3, 61)
+    left = self.normal.pdf(x)
+    right = np.exp(-x ** 2 / 2) / (2 * math.pi) ** 0.5
+    self.assertLess(np.max(np.abs(left - right)), 1e-02)
+    grid = self.normal.gridPoints
+    total = np.sum(self.normal.gridDensity) * (grid[1] - grid[0])
+    self.assertAlmostEqual(total, 1, delta=1e-06)
+    self.assertEqual(self.normal.pdf(100.), 0)
@@ -0,0 +1,97 @@
+"""TestMultivariateNormal tests the correlated normal distribution."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import math
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+
+from raining.sim import monteCarlo, sobol
+from raining.stat import MultivariateNormal
+
+
+def _sum(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+  """Sum of the inputs"""
+  return x + y
+
+
+class TestMultivariateNormal(TestCase):
+  """TestMultivariateNormal tests the correlated normal distribution."""
+
+  def setUp(self) -> None:
+    """Sets up a random covariance matrix"""
+    self.rng = np.random.default_rng(8)
+    a = self.rng.standard_normal((5, 5))
+    self.covariance = a @ a.T + 5 * np.eye(5)
+    self.mean = np.arange(5.)
+    self.normal = MultivariateNormal(self.mean, self.covariance)
+
+  def test_validation(self) -> None:
+    """Testing that invalid covariance matrices are rejected."""
+    with self.assertRaises(ValueError):
+      MultivariateNormal([0., 0.], np.eye(3))
+    with self.assertRaises(ValueError):
+      MultivariateNormal([0., 0.], [[1., 0.5], [0., 1.]])
+    with self.assertRaises(ValueError):
+      MultivariateNormal([0., 0.], [[1., 2.], [2., 1.]])
+
+  def test_sample(self) -> None:
+    """Testing the moments of the samples and the output buffer."""
+    samples = self.normal.sample(200000, self.rng)
+    self.assertEqual(samples.shape, (200000, 5))
+    self.assertTrue(np.allclose(samples.mean(axis=0), self.mean, atol=0.05))
+    self.assertTrue(np.allclose(np.cov(samples.T), self.covariance,
+                                atol=0.2))
+    out = np.empty((100, 5))
+    self.assertIs(self.normal.sample(100, self.rng, out), out)
+
+  def test_logpdf(self) -> None:
+    """Testing the log density against the direct formula."""
+    x = self.rng.standard_normal((7, 5))
+    d = x - self.mean
+    quadratic = np.einsum('ij,jk,ik->i', d, np.linalg.inv(self.covariance), d)
+    expected = -0.5 * (5 * math.log(2 * math.pi) + quadratic
+                       + np.linalg.slogdet(self.covariance)[1])
+    self.assertTrue(np.allclose(self.normal.logpdf(x), expected))
+    self.assertIsInstance(self.normal.logpdf(x[0]), float)
+    self.assertAlmostEqual(self.normal.pdf(x[0]), math.exp(expected[0]))
+
+  def test_updateBlock(self) -> None:
+    """Testing that the block update matches a full factorization."""
+    a = self.rng.standard_normal((2, 2))
+    block = a @ a.T + 2 * np.eye(2)
+    self.normal.updateBlock(2, block)
+    expected = self.covariance.copy()
+    expected[2:4, 2:4] = block
+    full = MultivariateNormal(self.mean, expected)
+    self.assertTrue(np.allclose(self.normal.cholesky, full.cholesky))
+    self.assertTrue(np.allclose(self.normal.inverseCholesky,
+                                full.inverseCholesky))
+    self.assertAlmostEqual(self.normal.logDeterminant, full.logDeterminant)
+    with self.assertRaises(ValueError):
+      self.normal.updateBlock(3, -np.eye(2))
+    self.assertTrue(np.allclose(self.normal.covariance, expected))
+
+  def test_realNumbers(self) -> None:
+    """Testing the construction from RealNumbers."""
+    values = [SimpleNamespace(expVal=1., stdDev=2.),
+              SimpleNamespace(expVal=-1., stdDev=0.5)]
+    normal = MultivariateNormal.fromRealNumbers(values,
+                                                [[1., -0.5], [-0.5, 1.]])
+    self.assertTrue(np.allclose(normal.stdDev(), [2., 0.5]))
+    self.assertAlmostEqual(normal.correlation()[0, 1], -0.5)
+    self.assertAlmostEqual(normal.covariance[0, 1], -0.5)
+    self.assertEqual(normal.marginals(), [(1., 2.), (-1., 0.5)])
+
+  def test_monteCarlo(self) -> None:
+    """Testing correlated inputs in the Monte Carlo driver."""
+    normal = MultivariateNormal([1., 2.], [[1., -0.5], [-0.5, 1.]])
+    result = monteCarlo(_sum, [normal], 0., workers=1, seed=2,
+                        maxSamples=200000)
+    self.assertAlmostEqual(result.mean, 3., delta=0.01)
+    self.assertAlmostEqual(result.stdDev, 1., delta=0.01)
+    with self.assertRaises(TypeError):
+      sobol(_sum, [normal], 1000, workers=1)
@@ -0,0 +1,62 @@
+"""TestTDigest tests the streaming quantile sketch."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import pickle
+from unittest import TestCase
+
+import numpy as np
+
+from raining.stat import TDigest
+
+
+class TestTDigest(TestCase):
+  """TestTDigest tests the streaming quantile sketch."""
+
+  def setUp(self) -> None:
+    """Sets up the sample values"""
+    rng = np.random.default_rng(1)
+    self.values = rng.standard_normal(200000)
+    self.levels = np.array([0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+    self.tolerances = np.array([5e-4, 7.5e-4, 1e-3, 1e-3, 1e-3, 1e-3, 1e-3,
+                                1e-3])
+
+  def _assertRankError(self, digest: TDigest) -> None:
+    """Asserts that the estimated quantiles are within the tolerances of
+    the requested levels when measured in rank. The tolerances tighten in
+    the tails, where the sketch keeps its smallest centroids."""
+    estimates = digest.quantile(self.levels)
+    ranks = np.searchsorted(np.sort(self.values), estimates)
+    ranks = ranks / self.values.size
+    for (rank, level, delta) in zip(ranks, self.levels, self.tolerances):
+      self.assertAlmostEqual(rank, level, delta=delta)
+
+  def test_quantile(self) -> None:
+    """Testing quantiles of values ingested in small batches."""
+    digest = TDigest(100)
+    for chunk in np.array_split(self.values, 400):
+      digest.update(chunk)
+    self.assertEqual(digest.count(), self.values.size)
+    self.assertLess(digest.means.size, 200)
+    self._assertRankError(digest)
+    self.assertEqual(digest.quantile(0.), self.values.min())
+    self.assertEqual(digest.quantile(1.), self.values.max())
+
+  def test_merge(self) -> None:
+    """Testing that sketches filled separately combine into one."""
+    parts = []
+    for chunk in np.array_split(self.values, 4):
+      digest = TDigest(100)
+      digest.update(chunk)
+      parts.append(pickle.loads(pickle.dumps(digest)))
+    merged = parts[0]
+    for part in parts[1:]:
+      merged.merge(part)
+    self.assertEqual(merged.count(), self.values.size)
+    self._assertRankError(merged)
+
+  def test_empty(self) -> None:
+    """Testing that an empty sketch refuses to estimate quantiles."""
+    with self.assertRaises(ValueError):
+      TDigest().quantile(0.5)
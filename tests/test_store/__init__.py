@@ -0,0 +1,2 @@
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
@@ -0,0 +1,73 @@
+"""TestUncertainStore tests the memory mapped store."""
+#  AGPL-3.0 license
+#  Copyright (c) 2024 Asger Jon Vistisen
+from __future__ import annotations
+
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+import numpy as np
+
+from raining.store import UncertainStore
+
+
+class TestUncertainStore(TestCase):
+  """TestUncertainStore tests the memory mapped store."""
+
+  def setUp(self) -> None:
+    """Sets up a temporary directory and some values"""
+    self.tempDir = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.tempDir.name, 'store')
+    rng = np.random.default_rng(3)
+    self.expVal = rng.standard_normal(1000)
+    self.stdDev = rng.random(1000)
+
+  def tearDown(self) -> None:
+    """Removes the temporary directory"""
+    self.tempDir.cleanup()
+
+  def test_roundTrip(self) -> None:
+    """Testing that appended chunks are read back by a new instance."""
+    store = UncertainStore(self.path)
+    self.assertEqual(len(store), 0)
+    self.assertEqual(store.expVal().size, 0)
+    for i in range(0, 1000, 300):
+      store.append(self.expVal[i:i + 300], self.stdDev[i:i + 300])
+    loaded = UncertainStore(self.path)
+    self.assertEqual(len(loaded), 1000)
+    self.assertIsInstance(loaded.expVal(), np.memmap)
+    self.assertTrue(np.array_equal(loaded.expVal(), self.expVal))
+    self.assertTrue(np.array_equal(loaded.stdDev(), self.stdDev))
+    total = sum(float(chunk[0].sum()) for chunk in loaded.chunks(128))
+    self.assertAlmostEqual(total, float(self.expVal.sum()), delta=1e-09)
+
+  def test_covariance(self) -> None:
+    """Testing covariance blocks, given explicitly and by default."""
+    store = UncertainStore(self.path, 2)
+    cov = np.array([[[1., 0.5], [0.5, 2.]]])
+    store.append([1., 2.], [1., 2. ** 0.5], cov)
+    store.append([3., 4.], [3., 4.])
+    loaded = UncertainStore(self.path)
+    self.assertEqual(loaded.blockSize, 2)
+    self.assertTrue(np.array_equal(loaded.covariance()[0], cov[0]))
+    self.assertTrue(np.array_equal(loaded.covariance()[1],
+                                   np.diag([9., 16.])))
+    with self.assertRaises(ValueError):
+      loaded.append([1., 2., 3.], [1., 1., 1.])
+    with self.assertRaises(ValueError):
+      UncertainStore(self.path, 3)
+
+  def test_realNumbers(self) -> None:
+    """Testing that objects exposing expVal and stdDev are appended."""
+    store = UncertainStore(self.path)
+    values = [SimpleNamespace(expVal=float(i), stdDev=0.1 * i) for i in
+              range(5)]
+    store.appendRealNumbers(values)
+    self.assertEqual(list(store.expVal()), [0., 1., 2., 3., 4.])
+    self.assertEqual(store.value(3), (3., 0.1 * 3))
+    self.assertEqual(store.value(-1), (4., 0.1 * 4))
+    self.assertIs(type(store.value(0)[0]), float)
+    with self.assertRaises(AttributeError):
+      store.covariance()